@@ -1,4 +1,8 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import re
 
 from kryptone.signals import Signal
@@ -8,67 +12,197 @@ __all__ = [
 ]
 
 
-class Logger:
-    instance = None
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
 
-    def __init__(self, name: str = 'KRYPTONE'):
-        logger = logging.getLogger(name)
-        logger.setLevel(logging.DEBUG)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s: %(message)s'
 
-        handler = logging.StreamHandler()
-        logger.addHandler(handler)
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M'
 
-        log_format = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s: %(message)s',
-            datefmt='%Y-%m-%d %H:%M'
-        )
-        handler.setFormatter(log_format)
 
-        file_handler = logging.FileHandler('access.log')
+def remove_ansi(text):
+    # FIXME: Text could be an exception and that
+    # case we have to return the object directly
+    if not isinstance(text, str):
+        return text
+    return ANSI_ESCAPE.sub('', text)
+
 
-        # Since there might be colors in use for logging
-        # messages, ensure that ANSI string a removed from
-        # log files since they are not correctly parsed
+class NoAnsiFilter(logging.Filter):
+    """Since there might be colors in use for logging
+    messages, ensure that ANSI string a removed from
+    log files since they are not correctly parsed"""
 
-        def remove_ansi(text):
-            # FIXME: Text could be an exception and that
-            # case we have to return the object directly
-            if not isinstance(text, str):
-                return text
-            ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-            return ansi_escape.sub('', text)
+    def filter(self, record):
+        record.msg = remove_ansi(record.msg)
+        return True
 
-        class NoAnsiFilter(logging.Filter):
-            def filter(self, record):
-                record.msg = remove_ansi(record.msg)
-                return True
 
-        file_handler.addFilter(NoAnsiFilter())
+class JSONFormatter(logging.Formatter):
+    """Formats the log records as JSON lines which
+    can be ingested by log aggregation tools"""
 
-        logger.addHandler(file_handler)
-        file_handler.setFormatter(log_format)
+    def format(self, record):
+        data = {
+            'time': self.formatTime(record, LOG_DATE_FORMAT),
+            'name': record.name,
+            'level': record.levelname,
+            'message': remove_ansi(record.getMessage())
+        }
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class Logger:
+    """Logger used by Kryptone. By default the messages are
+    written to the console and to the "access.log" file. Calling
+    `configure` allows writing the messages from a background
+    thread, rotating the log file or using JSON lines
+
+    >>> logger.configure(use_queue=True, max_bytes=10_000_000, backup_count=3)
+
+    Messages can be passed as callables in which case they
+    are only built when the level is enabled
+
+    >>> logger.debug(lambda: f'Urls: {expensive_function()}')
+    """
+
+    instance = None
+
+    def __init__(self, name: str = 'KRYPTONE'):
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.DEBUG)
 
         self.instance = logger
+        self.listener = None
+        self.configuration = None
+        self.is_registered_at_exit = False
+        self.setup_handlers()
 
     @classmethod
     def create(cls, name: str = 'KRYPTONE'):
         instance = cls(name=name)
         return instance
 
+    def create_handlers(self, *, filename='access.log', json_format=False, max_bytes=0, backup_count=0):
+        handler = logging.StreamHandler()
+
+        if max_bytes > 0:
+            file_handler = logging.handlers.RotatingFileHandler(
+                filename,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding='utf-8'
+            )
+        else:
+            file_handler = logging.FileHandler(filename, encoding='utf-8')
+
+        log_format = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+        handler.setFormatter(log_format)
+
+        if json_format:
+            file_handler.setFormatter(JSONFormatter())
+        else:
+            file_handler.addFilter(NoAnsiFilter())
+            file_handler.setFormatter(log_format)
+        return [handler, file_handler]
+
+    def stop_listener(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def setup_handlers(self, *, use_queue=False, **kwargs):
+        self.stop_listener()
+
+        for handler in list(self.instance.handlers):
+            self.instance.removeHandler(handler)
+            handler.close()
+
+        handlers = self.create_handlers(**kwargs)
+
+        if use_queue:
+            # The records are pushed to a queue and written
+            # by a background thread which prevents the crawl
+            # from waiting on the console or on the disk
+            log_queue = queue.SimpleQueue()
+            self.instance.addHandler(logging.handlers.QueueHandler(log_queue))
+            self.listener = logging.handlers.QueueListener(
+                log_queue,
+                *handlers,
+                respect_handler_level=True
+            )
+            self.listener.start()
+
+            # The listener is stopped at exit whatever the
+            # number of times the logger was reconfigured
+            if not self.is_registered_at_exit:
+                atexit.register(self.stop_listener)
+                self.is_registered_at_exit = True
+        else:
+            for handler in handlers:
+                self.instance.addHandler(handler)
+
+    def configure(self, *, level=logging.DEBUG, filename='access.log', use_queue=False, json_format=False, max_bytes=0, backup_count=0):
+        """Reconfigures the handlers of the logger. Calling
+        this function multiple times with the same parameters
+        does not recreate the handlers"""
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+        self.instance.setLevel(level)
+
+        configuration = (filename, use_queue, json_format, max_bytes, backup_count)
+        if configuration == self.configuration:
+            return
+        self.configuration = configuration
+
+        self.setup_handlers(
+            filename=filename,
+            use_queue=use_queue,
+            json_format=json_format,
+            max_bytes=max_bytes,
+            backup_count=backup_count
+        )
+
+    def configure_from_settings(self):
+        from kryptone.conf import settings
+
+        self.configure(
+            level=settings.LOG_LEVEL,
+            filename=settings.LOG_FILE,
+            use_queue=settings.LOG_USE_QUEUE,
+            json_format=settings.LOG_JSON_FORMAT,
+            max_bytes=settings.LOG_MAX_BYTES,
+            backup_count=settings.LOG_BACKUP_COUNT
+        )
+
+    def is_enabled_for(self, level):
+        return self.instance.isEnabledFor(level)
+
+    def log(self, level, message, *args, **kwargs):
+        # Avoid building expensive messages
+        # when the level is not enabled
+        if not self.instance.isEnabledFor(level):
+            return
+
+        if callable(message):
+            message = message()
+        self.instance.log(level, message, *args, **kwargs)
+
     def warning(self, message, *args, **kwargs):
-        self.instance.warning(message, *args, **kwargs)
+        self.log(logging.WARNING, message, *args, **kwargs)
 
     def info(self, message, *args, **kwargs):
-        self.instance.info(message, *args, **kwargs)
+        self.log(logging.INFO, message, *args, **kwargs)
 
     def error(self, message, *args, **kwargs):
-        self.instance.error(message, *args, **kwargs)
+        self.log(logging.ERROR, message, *args, **kwargs)
 
     def debug(self, message, *args, **kwargs):
-        self.instance.debug(message, *args, **kwargs)
+        self.log(logging.DEBUG, message, *args, **kwargs)
 
     def critical(self, message, *args, **kwargs):
-        self.instance.critical(message, *args, **kwargs)
+        self.log(logging.CRITICAL, message, *args, **kwargs)
 
 
 logger = Logger()
@@ -79,4 +213,5 @@ def setup():
     of a Krytone project by populating the application
     with the spiders"""
     from kryptone.registry import registry
+    logger.configure_from_settings()
     registry.populate()
@@ -4,11 +4,12 @@ import dataclasses
 import datetime
 import inspect
 import io
+import itertools
 import os
 import pathlib
 import random
 import time
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any, Final, Optional, Sequence, Union
@@ -18,25 +19,42 @@ from uuid import uuid4
 import pytz
 import requests
 from asgiref.sync import async_to_sync
-from selenium.webdriver import Chrome, ChromeOptions, Edge, EdgeOptions
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.proxy import Proxy, ProxyType
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
 from kryptone import exceptions, logger, signal_constants
+from kryptone.browsers import (BrowserLifecycle, SessionStore,
+                               create_browser, get_browser_identity,
+                               get_browser_pool)
 from kryptone.conf import settings
 from kryptone.data_storages import BaseStorage, FileStorage
+from kryptone.governor import RateGovernor
+from kryptone.identities import get_identity_pool
 from kryptone.internal_types import PerformanceAuditProtocol
+from kryptone.network import NetworkCapture
+from kryptone.pipelines import ItemPipeline
+from kryptone.readiness import (DOMQuiescence, ReadinessPolicy,
+                                ReadinessResult, wait_for)
+from kryptone.resources import (ResourcePolicy, ResourceStatistics,
+                                set_blocked_urls)
+from kryptone.screenshots import ScreenshotService
+from kryptone.status import (NAVIGATION_STATUS_SCRIPT, StatusChecker,
+                              get_document_status)
+from kryptone.utils.canonicalization import URLCanonicalizer
 from kryptone.utils.date_functions import get_current_date
 from kryptone.utils.functions import create_filename, directory_from_url
 from kryptone.utils.module_loaders import import_from_module
-from kryptone.utils.randomizers import RANDOM_USER_AGENT
+from kryptone.utils.robots import RobotsCache, RobotsTxtTest
+from kryptone.utils.sitemaps import SitemapLoader
+from kryptone.utils.snapshots import (CrawlSnapshot, SnapshotError,
+                                      read_snapshot, write_snapshot)
 from kryptone.utils.text import color_text
-from kryptone.utils.urls import URL
+from kryptone.utils.urls import URL, LoadStartUrls, iter_start_urls
+
+# Number of start urls that are checked and pushed
+# at once to the urls to visit when the spider starts
+START_URLS_BATCH_SIZE: Final[int] = 1000
 
 DEFAULT_META_OPTIONS: Final[set[str]] = {
     'domains',
@@ -79,59 +97,40 @@ DEFAULT_META_OPTIONS: Final[set[str]] = {
     # the seen urls list either - this is useful for not
     # tracking certain types of urls at all (exclusion test)
     'url_gather_ignore_tests',
-    'database'
+    'database',
+    # URLCanonicalizer instance used to collapse
+    # equivalent urls (query order, tracking parameters,
+    # trailing slashes...) before they are deduplicated
+    'canonicalizer',
+    # ItemPipeline instance used to clean, validate
+    # and write the items saved by the spider in batches
+    'pipeline',
+    # ResourcePolicy instance used to block fonts, media,
+    # trackers... when loading the pages of the spider
+    'resource_policy',
+    # ReadinessPolicy instance that defines the conditions
+    # a page should fulfill before being used by the spider
+    'readiness',
+    # NetworkCapture instance used to capture the JSON
+    # responses received by the pages of the spider
+    'network_capture'
 }
 
 
-def get_selenium_browser_instance(browser_name: Optional[str] = None, headless: bool = False, load_images: bool = True, load_js: bool = True):
+def get_selenium_browser_instance(browser_name: Optional[str] = None, headless: bool = False, load_images: bool = True, load_js: bool = True, performance_logs: bool = True):
     """Creates a new selenium browser instance
 
     >>> browser = get_selenium_browser_instance()
     ... browser.get('...')
     ... browser.quit()
     """
-    browser_name = browser_name or settings.WEBDRIVER
-    browser = Chrome if browser_name == 'Chrome' else Edge
-    manager_instance = ChromeDriverManager if browser_name == 'Chrome' else EdgeChromiumDriverManager
-
-    options_klass = ChromeOptions if browser_name == 'Chrome' else EdgeOptions
-    options = options_klass()
-    options.add_argument('--remote-allow-origins=*')
-    options.add_argument(f'--user-agent={RANDOM_USER_AGENT()}')
-    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
-
-    # Allow Selenium to be launched
-    # in headless mode
-    if headless:
-        options.headless = True
-
-    # 0 = Default, 1 = Allow, 2 = Block
-    preferences = {
-        'profile.default_content_setting_values': {
-            'images': 0 if load_images else 2,
-            'javascript': 0 if load_js else 2,
-            'popups': 2,
-            'geolocation': 2,
-            'notifications': 2
-        }
-    }
-    options.add_experimental_option('prefs', preferences)
-
-    # Proxies
-    if settings.PROXY_IP_ADDRESS is not None:
-        proxy = Proxy()
-        proxy.proxy_type = ProxyType.MANUAL
-        proxy.http_proxy = settings.PROXY_IP_ADDRESS
-        options.add_argument(
-            f'--proxy-server=http://{settings.PROXY_IP_ADDRESS}'
-        )
-        options.add_argument('--disable-gpu')
-
-    try:
-        service = Service(manager_instance().install())
-    except Exception:
-        raise ConnectionError('And error occured. Are you offline?')
-    return browser(service=service, options=options)
+    return create_browser(
+        browser_name=browser_name,
+        headless=headless,
+        load_images=load_images,
+        load_js=load_js,
+        performance_logs=performance_logs
+    )
 
 
 class CrawlerOptions:
@@ -159,13 +158,18 @@ class CrawlerOptions:
         self.ignore_images = False
         self.url_gather_ignore_tests: list[str] = []
         self.url_rule_tests: list[str] = []
+        self.canonicalizer: Optional[URLCanonicalizer] = None
+        self.pipeline: Optional[ItemPipeline] = None
+        self.resource_policy: Optional[ResourcePolicy] = None
+        self.readiness: Optional[ReadinessPolicy] = None
+        self.network_capture: Optional[NetworkCapture] = None
 
     def __repr__(self):
         return f'<{self.__class__.__name__} for {self.verbose_name}>'
 
     @property
     def has_start_urls(self):
-        return len(self.start_urls) > 0
+        return bool(self.start_urls)
 
     def add_meta_options(self, options):
         for name, value in options:
@@ -178,22 +182,14 @@ class CrawlerOptions:
 
     def prepare(self):
         # The user can either use a list of generators or directly
-        # use a generator (URLGenerator, PagePaginationGenerator)
-        # or other types of generators launch the spider
-        if hasattr(self.start_urls, 'resolve_generator'):
+        # use a generator (URLGenerator, PagePaginationGenerator).
+        # The generators are not resolved here since this would
+        # be done when the class is created: the urls are streamed
+        # to the urls to visit when the spider starts
+        if isinstance(self.start_urls, (str, URL)):
+            self.start_urls = [self.start_urls]
+        elif isinstance(self.start_urls, tuple):
             self.start_urls = list(self.start_urls)
-        elif isinstance(self.start_urls, list):
-            start_urls = []
-            for item in self.start_urls:
-                if hasattr(item, 'resolve_generator'):
-                    start_urls.extend(list(item))
-                    continue
-
-                if isinstance(item, str):
-                    start_urls.extend([item])
-                    continue
-
-            self.start_urls = start_urls
 
 
 @dataclass
@@ -210,6 +206,21 @@ class Performance:
     duration: int = 0
     count_urls_to_visit: int = 0
     count_visited_urls: int = 0
+    # Delay, concurrency, latency and error
+    # rate of each host that was crawled
+    hosts: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Requests and bytes loaded or saved
+    # by the resource policies
+    resources: dict[str, int] = field(default_factory=dict)
+    # Time spent waiting for the pages to be ready
+    readiness: dict[str, Any] = field(default_factory=dict)
+    # Pages loaded, memory used and number
+    # of times the browser was recycled
+    browser: dict[str, Any] = field(default_factory=dict)
+    # Latency, errors and bans of each proxy
+    proxies: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Screenshots saved, deduplicated or dropped
+    screenshots: dict[str, int] = field(default_factory=dict)
 
     def __post_init__(self):
         # Since the end date is aware, we need to set
@@ -286,7 +297,7 @@ class Crawler(type):
 
 
 class BaseCrawler(metaclass=Crawler):
-    DATA_CONTAINER: list = []
+    DATA_CONTAINER: deque = deque()
     model = None
 
     urls_to_visit: set[URL] = set()
@@ -312,18 +323,77 @@ class BaseCrawler(metaclass=Crawler):
         self.url_distribution = defaultdict(list)
         self.spider_uuid = uuid4()
 
-        if not self._meta.debug_mode:
-            self.driver = get_selenium_browser_instance(
-                browser_name=browser_name or self.browser_name,
-                headless=settings.HEADLESS,
-                load_images=settings.LOAD_IMAGES,
-                load_js=settings.LOAD_JS
+        # When the pipeline writes the items to sinks, only
+        # the most recently saved items are kept in memory.
+        # Otherwise the container is the only copy of the
+        # items and is therefore not bounded
+        max_size = None
+        if self._meta.pipeline is not None and self._meta.pipeline.sinks:
+            max_size = settings.DATA_CONTAINER_MAX_SIZE
+        self.DATA_CONTAINER = deque(maxlen=max_size)
+
+        # User agents and proxies used by the
+        # browsers and the HTTP requests
+        self.identity_pool = get_identity_pool()
+
+        # When the pool is enabled, a browser that was
+        # launched in advance is leased instead of
+        # starting a new one for each spider
+        self.browser_pool = None
+        self.requested_browser_name = browser_name or self.browser_name
+        if not self._meta.debug_mode and settings.BROWSER_POOL_SIZE > 0:
+            self.browser_pool = get_browser_pool(
+                self.requested_browser_name,
+                performance_logs=self.requires_performance_logs
             )
 
+        if not self._meta.debug_mode:
+            self.driver = self.create_driver()
+
     def __repr__(self):
         klass_name = self.__class__.__name__
         return f'<{klass_name}: {self.spider_uuid}>'
 
+    def create_driver(self):
+        """Returns a new browser or a browser
+        leased from the browser pool"""
+        if self.browser_pool is not None:
+            return self.browser_pool.lease(
+                timeout=settings.BROWSER_POOL_LEASE_TIMEOUT
+            )
+
+        return get_selenium_browser_instance(
+            browser_name=self.requested_browser_name,
+            headless=settings.HEADLESS,
+            load_images=settings.LOAD_IMAGES,
+            load_js=settings.LOAD_JS,
+            performance_logs=self.requires_performance_logs
+        )
+
+    def close_driver(self, driver, destroy: bool = True):
+        """Quits the browser. A browser leased from the pool is
+        either destroyed or returned to the pool for reuse"""
+        if self.browser_pool is not None:
+            if destroy:
+                self.browser_pool.destroy(driver)
+            else:
+                self.browser_pool.release(driver)
+        else:
+            driver.quit()
+
+    def release_driver(self):
+        """Returns the browser to the pool or quits it. A
+        new browser is created if the spider is started again"""
+        driver = getattr(self, 'driver', None)
+        if driver is None:
+            return
+
+        self.driver = None
+        try:
+            self.close_driver(driver, destroy=False)
+        except Exception as e:
+            logger.warning(f'Could not close the browser: {e}')
+
     def __hash__(self):
         return hash((self.spider_uuid))
 
@@ -502,43 +572,93 @@ class BaseCrawler(metaclass=Crawler):
         self.url_distribution[self.driver.current_url].extend(found_urls)
         return found_urls
 
-    def save_object(self, data: Union[dict[str, Any], list[dict[str, Any]]], check_fields_null: list[str] = []):
-        """Saves a new object in the container"""
-        if self.model is None:
-            raise ValueError(
-                "You need to implement a dataclass model "
-                "on the spider when trying to use save"
+    @cached_property
+    def pipeline(self) -> ItemPipeline:
+        """Returns the pipeline defined in `Meta.pipeline`
+        or a default pipeline without any sinks"""
+        pipeline = self._meta.pipeline
+        if pipeline is None:
+            pipeline = ItemPipeline(
+                batch_size=settings.PIPELINE_BATCH_SIZE,
+                flush_interval=settings.PIPELINE_FLUSH_INTERVAL
             )
+        pipeline.connect(self.run_after_data_save)
+        return pipeline
 
-        if not dataclasses.is_dataclass(self.model):
-            raise ValueError(
-                "Your model should be an instance of "
-                "of a dataclass"
-            )
+    def run_after_data_save(self, batch: list[Any]):
+        if inspect.iscoroutinefunction(self.after_data_save):
+            async_to_sync(self.after_data_save)(batch)
+        else:
+            self.after_data_save(batch)
 
-        if isinstance(data, dict):
-            data = [data]
+    def save_object(self, data: Union[dict[str, Any], list[dict[str, Any]]], check_fields_null: list[str] = []):
+        """Saves new objects using the pipeline of the spider.
+        The objects for which one of the `check_fields_null`
+        is None are not saved"""
+        self.pipeline.bind(self.model)
+
+        instances = self.pipeline.process(
+            data,
+            required_fields=check_fields_null
+        )
+        for instance in instances:
+            logger.debug(lambda: f'Saving: {instance}')
+        self.DATA_CONTAINER.extend(instances)
+        return instances
+
+    def close_pipeline(self):
+        """Writes the items that are still
+        buffered in the pipeline"""
+        if 'pipeline' in self.__dict__:
+            self.pipeline.close()
+            # The pipeline of the Meta is shared by all the
+            # instances of the spider and should not keep
+            # a reference to this instance
+            self.pipeline.disconnect(self.run_after_data_save)
+            del self.pipeline
 
-        instance_fields = dataclasses.fields(self.model)
-        # TODO: Try catch to raise error detail when user
-        # is trying to save with non-model keys
-        instances = map(lambda x: self.model(**x), data)
+    @cached_property
+    def status_checker(self) -> StatusChecker:
+        return StatusChecker.from_settings()
 
-        for instance in instances:
-            for field in instance_fields:
-                func_name = f'clean_{field.name}'
-                if hasattr(instance, func_name):
-                    result = getattr(instance, func_name)(
-                        getattr(instance, field.name)
-                    )
-                    setattr(instance, field.name, result)
+    @cached_property
+    def screenshot_service(self) -> ScreenshotService:
+        return ScreenshotService.from_settings()
 
-            for check_field in check_fields_null:
-                if getattr(instance, check_field) is None:
-                    continue
+    def take_screenshot(self, name: Optional[str] = None, full_page: Optional[bool] = None) -> bool:
+        """Takes a screenshot of the current page. The screenshot
+        is compressed and saved in the background so that the
+        navigation is not blocked
+
+        >>> def current_page_actions(self, current_url, **kwargs):
+        ...     self.take_screenshot(name='product', full_page=True)
+        """
+        return self.screenshot_service.capture(
+            self.driver,
+            name=name,
+            page_url=self.driver.current_url,
+            full_page=full_page
+        )
 
-            logger.info(f'Saving: {instance}')
-            self.DATA_CONTAINER.append(instance)
+    def close_screenshot_service(self):
+        """Waits for the screenshots that are
+        still queued to be saved"""
+        if 'screenshot_service' in self.__dict__:
+            self.screenshot_service.close()
+
+    def finish_crawl(self):
+        """Writes the items still buffered in the pipeline, waits
+        for the queued screenshots and returns the browser to the
+        pool. Runs when the crawl ends, fails or is interrupted"""
+        try:
+            self.close_pipeline()
+        finally:
+            try:
+                self.close_screenshot_service()
+            finally:
+                # The browser is returned to the pool as soon as the
+                # crawl ends instead of when the spider is collected
+                self.release_driver()
 
     def backup_urls(self):
         if self.storage is None:
@@ -607,6 +727,66 @@ class BaseCrawler(metaclass=Crawler):
                 await aw
 
         asyncio.run(main())
+        self.save_snapshot()
+
+    @property
+    def snapshot_path(self) -> pathlib.Path:
+        return pathlib.Path(settings.MEDIA_FOLDER).joinpath(
+            settings.CRAWL_SNAPSHOT_FILE_NAME
+        )
+
+    def save_snapshot(self):
+        """Writes a compressed binary snapshot of the urls
+        which is used by `resume` instead of the cache file"""
+        if not settings.USE_CRAWL_SNAPSHOTS:
+            return None
+
+        metadata = {
+            'spider': self.__class__.__name__,
+            'spider_uuid': self.spider_uuid,
+            'timestamp': self.get_current_date.isoformat(),
+            'start_url': self.start_url
+        }
+
+        try:
+            return write_snapshot(
+                self.snapshot_path,
+                self.urls_to_visit,
+                self.visited_urls,
+                seen_urls=self.list_of_seen_urls,
+                metadata=metadata
+            )
+        except OSError as e:
+            logger.error(f'Could not write the crawl snapshot: {e}')
+            return None
+
+    def load_snapshot(self) -> Optional[CrawlSnapshot]:
+        """Returns the snapshot of the previous session or None
+        if the snapshot does not exist, is invalid or is older
+        than the cache of the storage"""
+        if not settings.USE_CRAWL_SNAPSHOTS or not self.snapshot_path.exists():
+            return None
+
+        if self.storage is not None:
+            # The cache could have been modified after the
+            # snapshot e.g. with "filter_cache" or "reorder"
+            cache_key = f'{settings.CACHE_FILE_NAME}.json'
+            modified_time = async_to_sync(self.storage.get_modified_time)(cache_key)
+            if modified_time is not None and modified_time > self.snapshot_path.stat().st_mtime:
+                logger.warning(
+                    'Ignoring the crawl snapshot which is '
+                    'older than the cache'
+                )
+                return None
+
+        try:
+            return read_snapshot(
+                self.snapshot_path,
+                spider=self.__class__.__name__
+            )
+        except SnapshotError as e:
+            logger.warning(f'Ignoring the crawl snapshot: {e}')
+            return None
 
     def urljoin(self, path):
         """Returns the domain of the current
@@ -615,17 +795,81 @@ class BaseCrawler(metaclass=Crawler):
         result = urljoin(str(self.get_origin), path)
         return URL(unquote(result))
 
+    @cached_property
+    def canonicalizer(self) -> URLCanonicalizer:
+        """Returns the canonicalizer defined in `Meta.canonicalizer`
+        or a default canonicalizer. Each spider uses its own copy
+        so that the cache and the aliases of a website are not
+        shared with the other spiders"""
+        canonicalizer = self._meta.canonicalizer
+        if canonicalizer is None:
+            return URLCanonicalizer(ignore_queries=self._meta.ignore_queries)
+
+        if self._meta.ignore_queries:
+            return canonicalizer.copy(ignore_queries=True)
+        return canonicalizer.copy()
+
+    def canonicalize_url(self, url: str | URL) -> URL:
+        """Returns the canonical version of an url using
+        the canonicalizer defined on the spider"""
+        if not isinstance(url, (str, URL)):
+            return URL(url)
+        return URL(self.canonicalizer(url, base=str(self.get_origin) or None))
+
+    @property
+    def get_page_canonical(self) -> Optional[str]:
+        script = """
+        const el = document.querySelector('link[rel="canonical"]')
+        return el && el.href
+        """
+        return self.driver.execute_script(script)
+
+    def register_canonical_url(self, current_url: URL) -> Optional[URL]:
+        """Reads the `<link rel="canonical">` of the current page and
+        marks the canonical url as visited so that the other urls of the
+        website that point to the same content are not crawled again"""
+        canonicalizer = self.canonicalizer
+        if not canonicalizer.use_canonical_links:
+            return None
+
+        try:
+            canonical = self.get_page_canonical
+        except Exception:
+            return None
+
+        if not isinstance(canonical, str) or canonical == '':
+            return None
+
+        canonical_url = URL(canonicalizer(canonical))
+        if not canonical_url.is_same_domain(self.start_url):
+            return None
+
+        canonicalizer.register_alias(current_url, canonical_url)
+        if canonical_url != current_url:
+            self.urls_to_visit.discard(canonical_url)
+            self.visited_urls.add(canonical_url)
+            self.list_of_seen_urls.add(canonical_url)
+        return canonical_url
+
     def run_url_filters(self, valid_urls: set[URL]):
         """Excludes urls in the list of collected
         urls based on the value of the functions in
         `url_filters`. All conditions should be true
         in order for the url be considered valid to
         be visited"""
-        if self._meta.url_ignore_tests:
+        url_ignore_tests = list(self._meta.url_ignore_tests)
+
+        # The robots.txt rules are applied as one
+        # more filter when ROBOTS_TXT_OBEY is set
+        robots_txt_test = getattr(self, 'robots_txt_test', None)
+        if robots_txt_test is not None:
+            url_ignore_tests.append(robots_txt_test)
+
+        if url_ignore_tests:
             results: dict[URL, list[bool]] = defaultdict(list)
             for url in valid_urls:
                 truth_array = results[url]
-                for instance in self._meta.url_ignore_tests:
+                for instance in url_ignore_tests:
                     truth_array.append(instance(url))
 
             urls_kept: set[URL] = set()
@@ -642,6 +886,13 @@ class BaseCrawler(metaclass=Crawler):
                     continue
                 urls_kept.add(url)
 
+            # Log one summary per filter for the
+            # page instead of one line per url
+            for instance in url_ignore_tests:
+                report_rejections = getattr(instance, 'report', None)
+                if report_rejections is not None:
+                    report_rejections()
+
             logger.info(
                 f"Filters completed. {len(urls_removed)} "
                 "url(s) removed"
@@ -650,12 +901,17 @@ class BaseCrawler(metaclass=Crawler):
         return valid_urls
 
     def check_urls(self, urls: Sequence[str | URL], refresh: bool = False):
-        raw_urls = set(urls)
+        # Duplicates are removed while keeping the
+        # order in which the links appear on the page
+        raw_urls = list(dict.fromkeys(urls))
 
         if self.performance_audit.iteration_count > 0:
             logger.info(f"Found {len(raw_urls)} url(s) in total on this page")
 
-        raw_urls_objs = list(map(lambda x: URL(x), raw_urls))
+        # Equivalent urls (e.g. different query order, tracking
+        # parameters, trailing slashes) are collapsed to a single
+        # canonical url before being deduplicated
+        raw_urls_objs = list(dict.fromkeys(map(self.canonicalize_url, raw_urls)))
 
         # rename to: ignore_page_tests
         if self._meta.url_gather_ignore_tests:
@@ -699,10 +955,6 @@ class BaseCrawler(metaclass=Crawler):
                 invalid_urls.add(url)
                 continue
 
-            if url.has_fragment:
-                invalid_urls.add(url)
-                continue
-
             is_home_page = [
                 url.url_object.path == '/',
                 self.start_url.url_object.path == '/',
@@ -787,6 +1039,13 @@ class BaseCrawler(metaclass=Crawler):
             logger.info(f'{percentage}% of total urls visited')
 
         async def main():
+            self.performance_audit.hosts = self.rate_governor.statistics()
+            self.performance_audit.resources = self.resource_statistics()
+            self.performance_audit.readiness = self.readiness_statistics()
+            self.performance_audit.browser = self.browser_lifecycle.statistics()
+            self.performance_audit.proxies = self.identity_pool.proxy_pool.statistics()
+            if 'screenshot_service' in self.__dict__:
+                self.performance_audit.screenshots = self.screenshot_service.statistics()
             data = self.performance_audit.json()
 
             await asyncio.create_task(log_urls_performance())
@@ -795,6 +1054,215 @@ class BaseCrawler(metaclass=Crawler):
 
         asyncio.run(main())
 
+    @cached_property
+    def default_resource_policy(self) -> Optional[ResourcePolicy]:
+        return self._meta.resource_policy or ResourcePolicy.from_settings()
+
+    def get_resource_policy(self, current_url: URL) -> Optional[ResourcePolicy]:
+        """Returns the resource policy of the route matching
+        the url or, by default, the policy of the spider"""
+        if self._meta.router is not None:
+            result = self._meta.router.match(current_url)
+            if result is not None and result.route.resource_policy is not None:
+                return result.route.resource_policy
+        return self.default_resource_policy
+
+    def apply_resource_policy(self, current_url: URL):
+        """Blocks the resources of the page that is about to be
+        loaded in the current tab. The DevTools Protocol is only
+        called when the blocked patterns of the tab change"""
+        policy = self.get_resource_policy(current_url)
+        patterns = [] if policy is None else policy.get_blocked_patterns()
+
+        try:
+            handle = self.driver.current_window_handle
+        except Exception:
+            return False
+
+        applied_patterns = self.applied_resource_patterns.get(handle, [])
+        if patterns == applied_patterns:
+            return False
+
+        if set_blocked_urls(self.driver, patterns):
+            self.applied_resource_patterns[handle] = patterns
+            return True
+        return False
+
+    @cached_property
+    def requires_performance_logs(self) -> bool:
+        """Whether the browser should record the network
+        events used by the resource policies or by
+        the network capture"""
+        if self._meta.network_capture is not None:
+            return True
+
+        if self.default_resource_policy is not None:
+            return True
+
+        if self._meta.router is not None:
+            return any(
+                route.resource_policy is not None
+                for route in self._meta.router.routes.values()
+            )
+        return False
+
+    @property
+    def network_capture(self) -> Optional[NetworkCapture]:
+        return self._meta.network_capture
+
+    def collect_resource_statistics(self, current_url: URL, entries: list[dict[str, Any]]) -> Optional[ResourceStatistics]:
+        """Computes the requests made by the browser for the
+        current page from the performance logs"""
+        policy = self.get_resource_policy(current_url)
+        if policy is None:
+            return None
+
+        statistics = policy.collect(entries, page_url=str(current_url))
+        if statistics.blocked_count > 0:
+            logger.info(
+                f'{statistics.blocked_count}/{statistics.requests_count} '
+                f'request(s) blocked on {current_url}'
+            )
+        return statistics
+
+    def process_network_logs(self, current_url: URL):
+        """Reads the performance logs of the browser once per
+        page and passes the network events to the resource
+        policy and the network capture"""
+        if not self.requires_performance_logs:
+            return None
+
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            return None
+
+        self.collect_resource_statistics(current_url, entries)
+
+        if self.network_capture is not None:
+            captured = self.network_capture.process(
+                self.driver,
+                entries,
+                page_url=str(current_url)
+            )
+            if captured:
+                logger.info(f'{len(captured)} response(s) captured on {current_url}')
+        return entries
+
+    def resource_statistics(self) -> dict[str, int]:
+        policies = [self.default_resource_policy]
+        if self._meta.router is not None:
+            for route in self._meta.router.routes.values():
+                policies.append(route.resource_policy)
+
+        totals = defaultdict(int)
+        for policy in {id(policy): policy for policy in policies if policy is not None}.values():
+            for key, value in policy.statistics().items():
+                totals[key] += value
+        return dict(totals)
+
+    @cached_property
+    def default_readiness(self) -> ReadinessPolicy:
+        return self._meta.readiness or ReadinessPolicy.from_settings()
+
+    def get_readiness(self, current_url: URL) -> ReadinessPolicy:
+        """Returns the readiness policy of the route matching
+        the url or, by default, the policy of the spider"""
+        if self._meta.router is not None:
+            result = self._meta.router.match(current_url)
+            if result is not None and result.route.readiness is not None:
+                return result.route.readiness
+        return self.default_readiness
+
+    def wait_until_ready(self, current_url: URL) -> ReadinessResult:
+        """Waits until the page that was navigated to fulfills
+        the conditions of its readiness policy. A page that is
+        not ready is still used with the content that was loaded
+        and the timeout is counted in the readiness statistics"""
+        result = self.get_readiness(current_url).wait(self.driver)
+        if result.is_ready:
+            logger.debug(f'Page ready after {round(result.waited, 3)}s')
+        else:
+            logger.warning(
+                f'Page was not ready after {round(result.waited, 3)}s '
+                f'({", ".join(result.pending_conditions)}), continuing '
+                f'with the loaded content: {current_url}'
+            )
+        return result
+
+    def readiness_statistics(self) -> dict[str, Any]:
+        policies = [self.default_readiness]
+        if self._meta.router is not None:
+            for route in self._meta.router.routes.values():
+                policies.append(route.readiness)
+
+        totals = defaultdict(int)
+        for policy in {id(policy): policy for policy in policies if policy is not None}.values():
+            for key, value in policy.totals.items():
+                totals[key] += value
+
+        if totals['pages_count'] > 0:
+            totals['average_wait_time'] = round(
+                totals['total_wait_time'] / totals['pages_count'],
+                3
+            )
+        return dict(totals)
+
+    def record_failed_request(self, current_url: URL, request_start_time: float):
+        """Records a failed request on the governor and
+        returns the date before which the host should
+        not be requested again"""
+        self.performance_audit.add_error_count()
+        self.rate_governor.record_response(
+            current_url,
+            time.monotonic() - request_start_time,
+            error=True
+        )
+        self.identity_pool.record_response(
+            get_browser_identity(self.driver),
+            error=True
+        )
+        wait_time = self.rate_governor.get_wait_time(current_url)
+        return self.get_current_date + datetime.timedelta(seconds=wait_time)
+
+    def get_page_status_code(self, current_url: URL, entries: Optional[list[dict[str, Any]]] = None) -> Optional[int]:
+        """Returns the status of the page loaded in the browser
+        from the performance logs or, when they are not enabled,
+        from the Navigation Timing API. The status is kept so that
+        the page does not need to be requested again"""
+        status_code = None
+        if entries:
+            status_code = get_document_status(entries, str(current_url))
+
+        if status_code is None:
+            try:
+                status_code = self.driver.execute_script(NAVIGATION_STATUS_SCRIPT)
+            except Exception:
+                return None
+
+        if not isinstance(status_code, int) or status_code == 0:
+            return None
+
+        self.status_checker.record(current_url, status_code)
+        return status_code
+
+    def record_successful_request(self, current_url: URL, request_start_time: float, status_code: Optional[int] = None):
+        """Records the latency and the status of a page that was
+        loaded on the governor and on the proxy of the browser"""
+        latency = time.monotonic() - request_start_time
+        self.rate_governor.record_response(
+            current_url,
+            latency,
+            status_code=status_code
+        )
+        # Pages returning 403, 407 or 429 ban the
+        # proxy used by the browser
+        self.identity_pool.record_response(
+            get_browser_identity(self.driver),
+            latency=latency,
+            status_code=status_code
+        )
+
     def current_page_actions(self, current_url: URL, **kwargs):
         """Custom actions to execute on the current page. 
 
@@ -824,7 +1292,9 @@ class BaseCrawler(metaclass=Crawler):
         """
         return NotImplemented
 
-    def after_data_save(self, data: Any):
+    def after_data_save(self, data: list[Any]):
+        """Called with each batch of items after it was
+        written by the sinks of the pipeline"""
         return NotImplemented
 
     def before_start(self, start_urls: list[Union[str, URL]], *args, **kwargs):
@@ -834,32 +1304,41 @@ class BaseCrawler(metaclass=Crawler):
 class OnPageActionsMixin:
     def click_consent_button(self, element_id: Optional[str] = None, element_class: Optional[str] = None, before_click_wait_time: int = 2, wait_time: Optional[int] = None):
         """Click the consent to cookies button which often
-        tends to appear on websites"""
+        tends to appear on websites. The button is clicked as
+        soon as it is clickable (waiting at most `before_click_wait_time`
+        seconds) and, after the click, the spider waits at most
+        `wait_time` seconds for the page to stop changing. The
+        consent is saved when PERSIST_SESSION_STATE is enabled"""
         try:
-            element = None
+            locator = None
             if element_id is not None:
-                element = self.driver.find_element(By.ID, element_id)
+                locator = (By.ID, element_id)
 
             if element_class is not None:
-                element = self.driver.find_element(
-                    By.CLASS_NAME,
-                    element_class
-                )
-
-            if element is not None and before_click_wait_time:
-                time.sleep(before_click_wait_time)
+                locator = (By.CLASS_NAME, element_class)
+
+            # When the consent was restored from a previous
+            # session, the banner is not expected to appear
+            # and there is no need to wait for it
+            if locator is not None and before_click_wait_time and not self.session_state_restored:
+                wait = WebDriverWait(self.driver, before_click_wait_time)
+                element = wait.until(EC.element_to_be_clickable(locator))
+            else:
+                element = self.driver.find_element(*locator)
 
             element.click()
         except:
             logger.info('Consent button not found')
+        else:
+            self.save_session_state()
         finally:
             # Some websites might create an issue when
             # trying to gather the urls of page just
-            # after clicking the consent button. Using
-            # the wait time can prevent the stale element
-            # error from being raised
+            # after clicking the consent button. Waiting
+            # for the DOM to be stable can prevent the stale
+            # element error from being raised
             if wait_time is not None:
-                time.sleep(wait_time)
+                wait_for(self.driver, [DOMQuiescence()], timeout=wait_time)
 
 
 class SiteCrawler(OnPageActionsMixin, BaseCrawler):
@@ -870,10 +1349,128 @@ class SiteCrawler(OnPageActionsMixin, BaseCrawler):
         self.end_date = None
         self.performance_audit: PerformanceAuditProtocol = Performance()
         self.performance_audit.timezone = self.timezone
+        self.rate_governor = RateGovernor.from_settings()
+
+        self.robots = None
+        self.robots_txt_test = None
+        if settings.ROBOTS_TXT_OBEY:
+            self.robots = RobotsCache.from_settings(governor=self.rate_governor)
+            self.robots_txt_test = RobotsTxtTest(self.robots)
+
+        # window handle -> patterns blocked in the tab
+        self.applied_resource_patterns: dict[str, list[str]] = {}
+        self.browser_lifecycle = BrowserLifecycle.from_settings()
+
+        # Cookies and local storage saved after accepting
+        # the cookies or logging in by a previous spider
+        self.session_store = None
+        self.session_state_restored = False
+        if settings.PERSIST_SESSION_STATE:
+            self.session_store = SessionStore.from_settings()
+
+    def open_tabs(self, windows: int):
+        # Create the amount of tabs/windows
+        # necessary for visiting each page
+        for i in range(windows):
+            self.driver.switch_to.new_window('tab')
+
+        # Get position on the first opened window
+        # as opposed to the being on the last created one
+        self.driver.switch_to.window(self.driver.window_handles[0])
+
+    def replace_driver(self, driver):
+        self.driver = driver
+        # The tabs of the new browser do not
+        # block any resource yet
+        self.applied_resource_patterns.clear()
+        self.restore_session_state()
+
+    @property
+    def session_domain(self) -> Optional[str]:
+        if self.start_url is None:
+            return None
+        return self.start_url.url_object.hostname
+
+    def restore_session_state(self) -> bool:
+        """Restores the cookies and the local storage that were
+        saved for the domain of the spider in the new browser"""
+        if self.session_store is None or self.session_domain is None:
+            return False
+
+        self.session_state_restored = self.session_store.restore(
+            self.driver,
+            self.session_domain
+        )
+        if self.session_state_restored:
+            logger.info(f'Session state restored for {self.session_domain}')
+        return self.session_state_restored
+
+    def save_session_state(self) -> bool:
+        """Saves the cookies and the local storage of the browser
+        for the domain of the spider. Should be called after
+        the cookies were accepted or after logging in
+
+        >>> def post_navigation_actions(self, current_url, **kwargs):
+        ...     self.login()
+        ...     self.save_session_state()
+        """
+        if self.session_store is None or self.session_domain is None:
+            return False
+
+        try:
+            self.session_store.snapshot(self.driver, self.session_domain)
+        except Exception as e:
+            logger.warning(f'Could not save the session state: {e}')
+            return False
+        return True
+
+    def maintain_browser(self, windows: Optional[int] = None) -> bool:
+        """Restarts the browser when it crashed and recycles it
+        when it loaded too many pages, used too much memory or
+        when its proxy was banned.
+        Tabs that loaded too many pages are reopened. Returns
+        True when the browser was replaced"""
+        lifecycle = self.browser_lifecycle
+
+        if not lifecycle.is_alive(self.driver):
+            logger.critical('The browser is not responding and will be restarted')
+            driver = lifecycle.restart(self.driver, self.create_driver, self.close_driver)
+        elif lifecycle.should_recycle():
+            logger.info(
+                f'Recycling the browser after {lifecycle.pages_count} '
+                f'page(s) (memory: {lifecycle.memory})'
+            )
+            driver = lifecycle.recycle(self.driver, self.create_driver, self.close_driver)
+        elif self.identity_pool.can_replace(get_browser_identity(self.driver)):
+            # The proxy of the browser was banned. The new
+            # browser is created with another proxy. While
+            # all the proxies are banned, the browser is kept
+            logger.info('Recycling the browser since its proxy was banned')
+            driver = lifecycle.recycle(self.driver, self.create_driver, self.close_driver)
+        else:
+            handles = self.driver.window_handles
+            recycled_handles = [
+                handle for handle in handles
+                if lifecycle.should_recycle_tab(handle)
+            ]
+            if recycled_handles:
+                current_handle = self.driver.current_window_handle
+                for handle in recycled_handles:
+                    new_handle = lifecycle.recycle_tab(self.driver, handle)
+                    self.applied_resource_patterns.pop(handle, None)
+                    if handle == current_handle:
+                        current_handle = new_handle
+                self.driver.switch_to.window(current_handle)
+            return False
+
+        self.replace_driver(driver)
+        if windows:
+            self.open_tabs(windows)
+        return True
 
     def __del__(self):
         try:
-            self.driver.quit()
+            self.release_driver()
         except:
             pass
         logger.info('Project stopped')
@@ -928,6 +1525,8 @@ class SiteCrawler(OnPageActionsMixin, BaseCrawler):
     def setup_class(self):
         """A function that sets up the final elements of the
         class before actually running the spider e.g. storages"""
+        logger.configure_from_settings()
+
         default_storage_path = settings.STORAGES.get('default')
         klass = self.load_storage(default_storage_path)
 
@@ -1019,24 +1618,17 @@ class SiteCrawler(OnPageActionsMixin, BaseCrawler):
         # or the urls are provided in the Meta class
         start_urls = start_urls or self._meta.start_urls
 
-        is_generator = any([
-            hasattr(start_urls, 'resolve_generator'),
-            inspect.isgenerator(start_urls)
-        ])
-
-        if is_generator:
-            start_urls = list(start_urls)
-
-        # Merge the provided start urls with the ones present
-        # in the Meta class
-        if self._meta.has_start_urls:
-            self._meta.start_urls.extend(start_urls)
-
-        start_urls = list(self.transform_string_urls(start_urls))
+        # The start urls are streamed to the urls to visit
+        # in batches so that generators yielding millions
+        # of urls are never fully loaded in memory
+        urls = self.transform_string_urls(iter_start_urls(start_urls))
+        first_url = next(urls, None)
 
         # If we have absolutely no start_url and at the
-        # same time we have no start_urls, raise an error
-        if not start_urls:
+        # same time we have no start_urls, raise an error.
+        # The urls to visit could have been seeded from
+        # another source e.g. a sitemap
+        if first_url is None and not self.urls_to_visit:
             raise exceptions.BadImplementationError(
                 "No start urls was used. Provide start urls list "
                 "in spider.Meta to start crawling a list of urls"
@@ -1045,10 +1637,13 @@ class SiteCrawler(OnPageActionsMixin, BaseCrawler):
         logger.info(
             f'{color_text('blue', self.__class__.__name__)} ready to crawl website')
 
-        if self.start_url is None:
-            self.start_url = URL(start_urls[-1])
+        if first_url is not None:
+            if self.start_url is None:
+                self.start_url = self.canonicalize_url(first_url)
 
-        self.add_urls(start_urls)
+            urls = itertools.chain([first_url], urls)
+            for batch in itertools.batched(urls, START_URLS_BATCH_SIZE):
+                self.add_urls(batch)
 
     def start(self, start_urls: Sequence[str | URL] = [], **kwargs: str | bool):
         skip_setup = kwargs.get('skip_setup', False)
@@ -1065,150 +1660,184 @@ class SiteCrawler(OnPageActionsMixin, BaseCrawler):
             logger.warning("Calling start in debug mode will have no effect")
             return False
 
-        maximize_window = kwargs.get('maximize_window', True)
-        if maximize_window:
-            self.driver.maximize_window()
+        if getattr(self, 'driver', None) is None:
+            self.driver = self.create_driver()
+
+        try:
+            maximize_window = kwargs.get('maximize_window', True)
+            if maximize_window:
+                self.driver.maximize_window()
+
+            self.restore_session_state()
+            next_execution_date = None
 
-        wait_time = settings.WAIT_TIME
-        next_execution_date = None
+            while self.urls_to_visit:
+                if next_execution_date is not None:
+                    remaining_time = next_execution_date - self.get_current_date
+                    if remaining_time.total_seconds() > 0:
+                        time.sleep(remaining_time.total_seconds())
 
-        while self.urls_to_visit:
-            if next_execution_date is not None:
-                if self.get_current_date < next_execution_date:
+                current_url = URL(self.urls_to_visit.pop())
+                logger.info(
+                    f"{color_text('green', len(self.urls_to_visit))} urls left to visit")
+
+                if current_url.is_empty:
                     continue
 
-            current_url = URL(self.urls_to_visit.pop())
-            logger.info(
-                f"{color_text('green', len(self.urls_to_visit))} urls left to visit")
+                if not current_url.is_same_domain(self.start_url):
+                    continue
 
-            if current_url.is_empty:
-                continue
+                if self.robots is not None and not self.robots.is_allowed(current_url):
+                    logger.info(f'Url disallowed by robots.txt: {current_url}')
+                    continue
 
-            if not current_url.is_same_domain(self.start_url):
-                continue
+                # TODO: Factorize this section into one single function
+                # from 859:935 so that it can be used by both start and
+                # bootstart without having to write two codes
 
-            # TODO: Factorize this section into one single function
-            # from 859:935 so that it can be used by both start and
-            # bootstart without having to write two codes
+                logger.info(f'Going to url: {color_text('green', current_url)}')
+                self.maintain_browser()
+                self.apply_resource_policy(current_url)
+                self.get_readiness(current_url).setup(self.driver)
 
-            logger.info(f'Going to url: {color_text('green', current_url)}')
+                if self.network_capture is not None:
+                    self.network_capture.clear()
 
-            try:
-                self.driver.get(str(current_url))
-            except Exception as e:
-                logger.critical(
-                    f'Failed to go to: {color_text('red', current_url)}: {e.args}')
-                continue
+                # The governor adapts the delay before the next
+                # request to the host using the latency and the
+                # failures of the requests
+                self.rate_governor.record_request(current_url)
+                request_start_time = time.monotonic()
 
-            try:
-                # Always wait for the body section of
-                # the page to be located  or visible
-                wait = WebDriverWait(self.driver, 5)
+                try:
+                    self.driver.get(str(current_url))
+                except Exception as e:
+                    logger.critical(
+                        f'Failed to go to: {color_text('red', current_url)}: {e.args}')
+                    next_execution_date = self.record_failed_request(
+                        current_url,
+                        request_start_time
+                    )
+                    continue
 
-                condition = EC.presence_of_element_located(
-                    (By.TAG_NAME, 'body')
+                # Wait for the conditions of the readiness
+                # policy, by default the presence of the body
+                # Only navigation errors are failed requests. A page
+                # that is not ready in time is used as it is
+                self.wait_until_ready(current_url)
+                entries = self.process_network_logs(current_url)
+                self.record_successful_request(
+                    current_url,
+                    request_start_time,
+                    status_code=self.get_page_status_code(current_url, entries)
                 )
-                wait.until(condition)
-            except:
-                logger.critical('Body element of page was not located')
-                continue
-            else:
+                self.browser_lifecycle.record_page(self.driver)
+
                 if inspect.iscoroutinefunction(self.post_navigation_actions):
                     async_to_sync(self.post_navigation_actions)(current_url)
                 else:
                     self.post_navigation_actions(current_url)
 
-            self.visited_urls.add(current_url)
+                self.register_canonical_url(current_url)
+                self.visited_urls.add(current_url)
 
-            if self._meta.crawl:
-                self.add_urls(self.collect_page_urls())
-                self.backup_urls()
+                if self._meta.crawl:
+                    self.add_urls(self.collect_page_urls())
+                    self.backup_urls()
 
-            current_page_actions_params = {}
+                current_page_actions_params = {}
 
-            try:
-                if inspect.iscoroutinefunction(self.current_page_actions):
-                    async_to_sync(self.current_page_actions)(
-                        current_url,
-                        **current_page_actions_params
+                try:
+                    if inspect.iscoroutinefunction(self.current_page_actions):
+                        async_to_sync(self.current_page_actions)(
+                            current_url,
+                            **current_page_actions_params
+                        )
+                    else:
+                        self.current_page_actions(
+                            current_url,
+                            **current_page_actions_params
+                        )
+                except TypeError as e:
+                    logger.error(e)
+                    raise TypeError(
+                        "'self.current_page_actions' should "
+                        "be able to accept arguments"
                     )
-                else:
-                    self.current_page_actions(
-                        current_url,
-                        **current_page_actions_params
+                except Exception as e:
+                    logger.error(e)
+                    raise ExceptionGroup(
+                        "An exception occured while trying "
+                        "to execute 'current_page_actions'",
+                        [
+                            Exception(e),
+                            exceptions.SpiderExecutionError()
+                        ]
                     )
-            except TypeError as e:
-                logger.error(e)
-                raise TypeError(
-                    "'self.current_page_actions' should "
-                    "be able to accept arguments"
-                )
-            except Exception as e:
-                logger.error(e)
-                raise ExceptionGroup(
-                    "An exception occured while trying "
-                    "to execute 'current_page_actions'",
-                    [
-                        Exception(e),
-                        exceptions.SpiderExecutionError()
-                    ]
-                )
-            else:
-                # Refresh the urls once the
-                # user actions have been completed
-                # for example scrolling down a page
-                # that could generate new urls to
-                # disover or changing a filter
-                if self._meta.crawl:
-                    self.add_urls(self.collect_page_urls(), refresh=True)
-                    self.backup_urls()
+                else:
+                    # Refresh the urls once the
+                    # user actions have been completed
+                    # for example scrolling down a page
+                    # that could generate new urls to
+                    # disover or changing a filter
+                    if self._meta.crawl:
+                        self.add_urls(self.collect_page_urls(), refresh=True)
+                        self.backup_urls()
 
-            try:
-                next_url = self.urls_to_visit[-1]
-            except:
-                pass
-            else:
-                if inspect.iscoroutinefunction(self.before_next_page_actions):
-                    async_to_sync(self.before_next_page_actions)(
-                        current_url,
-                        next_url
-                    )
+                try:
+                    next_url = self.urls_to_visit[-1]
+                except:
+                    pass
                 else:
-                    self.before_next_page_actions(current_url, next_url)
+                    if inspect.iscoroutinefunction(self.before_next_page_actions):
+                        async_to_sync(self.before_next_page_actions)(
+                            current_url,
+                            next_url
+                        )
+                    else:
+                        self.before_next_page_actions(current_url, next_url)
 
-            if self._meta.router is not None:
-                pass
+                if self._meta.router is not None:
+                    self._meta.router.resolve(current_url, self)
 
-            if self._meta.crawl:
-                self.calculate_performance()
+                if self._meta.crawl:
+                    self.calculate_performance()
 
-            if settings.WAIT_TIME_RANGE:
-                wait_time = random.randrange(
-                    settings.WAIT_TIME_RANGE[0],
-                    settings.WAIT_TIME_RANGE[1],
+                wait_time = self.rate_governor.get_wait_time(current_url)
+                if settings.WAIT_TIME_RANGE:
+                    wait_time = max(
+                        wait_time,
+                        random.randrange(
+                            settings.WAIT_TIME_RANGE[0],
+                            settings.WAIT_TIME_RANGE[1],
+                        )
+                    )
+
+                next_execution_date = (
+                    self.get_current_date +
+                    datetime.timedelta(seconds=wait_time)
                 )
 
-            next_execution_date = (
-                self.get_current_date +
-                datetime.timedelta(seconds=wait_time)
-            )
+                self.performance_audit.add_iteration_count()
 
-            self.performance_audit.add_iteration_count()
+                if len(self.urls_to_visit) == 0:
+                    self.performance_audit.end_date = self.get_current_date
+                    self.performance_audit.calculate_duration()
 
-            if len(self.urls_to_visit) == 0:
-                self.performance_audit.end_date = self.get_current_date
-                self.performance_audit.calculate_duration()
+                self.performance_audit.count_urls_to_visit = len(
+                    self.urls_to_visit
+                )
+                self.performance_audit.count_visited_urls = len(self.visited_urls)
 
-            self.performance_audit.count_urls_to_visit = len(
-                self.urls_to_visit
-            )
-            self.performance_audit.count_visited_urls = len(self.visited_urls)
+                logger.info(
+                    f"Next execution time: {color_text('blue', next_execution_date)}")
 
-            logger.info(
-                f"Next execution time: {color_text('blue', next_execution_date)}")
+                if os.getenv('KYRPTONE_TEST_RUN') is not None:
+                    break
 
-            if os.getenv('KYRPTONE_TEST_RUN') is not None:
-                break
+            self.save_session_state()
+        finally:
+            self.finish_crawl()
 
     def resume(self, windows: int = 1, **kwargs: str | bool):
         """Resume a previous crawling sessiong by reloading
@@ -1245,15 +1874,34 @@ class SiteCrawler(OnPageActionsMixin, BaseCrawler):
         #             urls_to_visit = storage.get('urls_to_vist')
         #             visited_urls = storage.get('visited_urls')
         # else:
-        data = async_to_sync(self.storage.get)('cache.json')
-
-        self.start_url = URL(self._meta.start_urls[0])
+        start_url = next(iter_start_urls(self._meta.start_urls), None)
+        if start_url is None:
+            raise exceptions.BadImplementationError(
+                "Resuming a spider requires start urls "
+                "in spider.Meta in order to get the start url"
+            )
+        self.start_url = self.canonicalize_url(start_url)
+
+        # The urls of the snapshot were already checked
+        # during the previous session and are loaded
+        # directly without being validated again
+        snapshot = self.load_snapshot()
+        if snapshot is not None:
+            self.urls_to_visit = snapshot.urls_to_visit
+            self.visited_urls = snapshot.visited_urls
+            self.list_of_seen_urls = snapshot.seen_urls
+            logger.info(
+                f'Restored {len(self.urls_to_visit)} url(s) to visit '
+                f'and {len(self.visited_urls)} visited url(s) from snapshot'
+            )
+        else:
+            data = async_to_sync(self.storage.get)('cache.json')
 
-        urls_to_visit = self.check_urls(data['urls_to_visit'])
-        visited_urls = self.check_urls(data['visited_urls'])
+            urls_to_visit = self.check_urls(data['urls_to_visit'])
+            visited_urls = self.check_urls(data['visited_urls'])
 
-        self.urls_to_visit = urls_to_visit
-        self.visited_urls = visited_urls
+            self.urls_to_visit = urls_to_visit
+            self.visited_urls = visited_urls
 
         state = async_to_sync(self.storage.has)('seen_urls.csv')
         if not state:
@@ -1272,11 +1920,93 @@ class SiteCrawler(OnPageActionsMixin, BaseCrawler):
         else:
             self.start(skip_setup=True, **kwargs)
 
+    def get_last_visit_date(self) -> Optional[datetime.datetime]:
+        """Returns the date on which the previous crawling
+        session was started using the performance file"""
+        if self.storage is None:
+            return None
+
+        if not async_to_sync(self.storage.has)('performance.json'):
+            return None
+
+        data = async_to_sync(self.storage.get)('performance.json')
+        if not isinstance(data, dict) or not data.get('start_date'):
+            return None
+
+        try:
+            date = datetime.datetime.fromisoformat(data['start_date'])
+        except ValueError:
+            return None
+
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=pytz.UTC)
+        return date
+
     def start_from_sitemap_xml(self, url: Union[str, URL], windows: Optional[int] = 1, **kwargs: str | bool):
-        return NotImplemented
+        """Seeds the urls to visit from a sitemap or a sitemap index
+        and then starts crawling. The sitemap is streamed and the urls
+        are pushed in batches to the urls to visit. Urls which were not
+        modified since the last crawling session are skipped
+
+        >>> spider.start_from_sitemap_xml('https://example.com/sitemap.xml')
+        """
+        skip_setup = kwargs.pop('skip_setup', False)
+        if not skip_setup:
+            self.setup_class()
+
+        since = kwargs.pop('since', None)
+        if since is None:
+            since = self.get_last_visit_date()
+
+        min_priority = kwargs.pop('min_priority', None)
+
+        url = URL(url)
+        if self.start_url is None:
+            self.start_url = self.canonicalize_url(urlunparse((
+                url.url_object.scheme,
+                url.url_object.netloc,
+                '/',
+                None,
+                None,
+                None
+            )))
+
+        loader = SitemapLoader(
+            url,
+            since=since,
+            min_priority=min_priority,
+            batch_size=settings.SITEMAP_BATCH_SIZE,
+            max_workers=settings.SITEMAP_MAX_WORKERS
+        )
+
+        for batch in loader:
+            if batch:
+                self.add_urls([entry.loc for entry in batch])
+
+        logger.info(
+            f"Loaded {loader.entries_count} url(s) from "
+            f"{loader.sitemaps_count} sitemap(s). {loader.skipped_count} "
+            "url(s) were not modified since the last visit"
+        )
+
+        if windows is not None and windows > 1:
+            self.boost_start(windows=windows, skip_setup=True, **kwargs)
+        else:
+            self.start(skip_setup=True, **kwargs)
 
     def start_from_json(self, windows: Optional[int] = 1, **kwargs: str | bool):
-        return NotImplemented
+        """Starts crawling using the urls present in a JSON
+        file located at the root of the project
+
+        >>> spider.start_from_json(filename='start_urls')
+        """
+        filename = kwargs.pop('filename', None)
+        start_urls = LoadStartUrls(filename=filename, is_json=True)
+
+        if windows is not None and windows > 1:
+            self.boost_start(start_urls, windows=windows, **kwargs)
+        else:
+            self.start(start_urls, **kwargs)
 
     def boost_start(self, start_urls: Sequence[Union[str, URL]] = [], *, windows: int = 1, **kwargs: str | bool):
         """Calling this method will make selenium open either
@@ -1289,181 +2019,220 @@ class SiteCrawler(OnPageActionsMixin, BaseCrawler):
         if not skip_setup:
             self.setup_class()
 
-        self.before_start(start_urls, **kwargs)
-
-        wait_time = settings.WAIT_TIME
-
-        # Create the amount of tabs/windows
-        # necessary for visiting each page
-        for i in range(windows):
-            self.driver.switch_to.new_window('tab')
-
-        # Get position on the first opened window
-        # as opposed to the being on the last created one
-        self.driver.switch_to.window(self.driver.window_handles[0])
-        next_execution_date = None
+        if settings.RATE_GOVERNOR_INITIAL_CONCURRENCY is None:
+            # All the tabs can be used from the first batch and
+            # the governor reduces the concurrency on errors
+            self.rate_governor.initial_concurrency = min(
+                max(1, windows),
+                self.rate_governor.max_concurrency
+            )
 
-        while self.urls_to_visit:
-            if next_execution_date is not None:
-                if self.get_current_date < next_execution_date:
-                    continue
+        self.before_start(start_urls, **kwargs)
 
-            current_urls = []
+        if getattr(self, 'driver', None) is None:
+            self.driver = self.create_driver()
 
-            # 1. Create a batch of urls to visit
-            # and navigate to
-            for _ in self.driver.window_handles:
-                try:
-                    # In the very start we could have just
-                    # one url available to visit. In which
-                    # case, just pass. We'll go to the pages
-                    # when we get more urls to use in the tabs
+        try:
+            self.restore_session_state()
+            self.open_tabs(windows)
+            next_execution_date = None
+
+            while self.urls_to_visit:
+                if next_execution_date is not None:
+                    remaining_time = next_execution_date - self.get_current_date
+                    if remaining_time.total_seconds() > 0:
+                        time.sleep(remaining_time.total_seconds())
+
+                current_urls = []
+                deferred_urls = []
+                batch_hosts = defaultdict(int)
+
+                batch_size = len(self.driver.window_handles)
+
+                # 1. Create a batch of urls to visit
+                # and navigate to. A host never gets more
+                # tabs than the concurrency allowed by
+                # the rate governor. The scan stops once as
+                # many urls as tabs were put aside so that the
+                # whole frontier is not read for each batch
+                while self.urls_to_visit and len(current_urls) < batch_size and len(deferred_urls) < batch_size:
                     current_url = URL(self.urls_to_visit.pop())
-                except:
-                    continue
-                else:
                     if current_url.is_empty:
                         continue
+
+                    host = self.rate_governor.get_host(current_url)
+                    if batch_hosts[host] >= self.rate_governor.get_concurrency(current_url):
+                        deferred_urls.append(str(current_url))
+                        continue
+
+                    batch_hosts[host] += 1
                     current_urls.append(str(current_url))
 
-            logger.info(f"{len(self.urls_to_visit)} urls left to visit")
+                self.urls_to_visit.update(deferred_urls)
 
-            # 2. Load each urls into the tabs
-            url_instances = []
+                logger.info(f"{len(self.urls_to_visit)} urls left to visit")
 
-            for i, handle in enumerate(self.driver.window_handles):
-                try:
-                    # Same. If we only had one url
-                    # to start with, this will raise
-                    # IndexError - so just skip
-                    current_url = URL(current_urls[i])
-                except IndexError:
-                    continue
+                # 2. Load each urls into the tabs
+                url_instances = []
+                self.maintain_browser(windows=windows)
 
-                self.driver.switch_to.window(handle)
+                if self.network_capture is not None:
+                    self.network_capture.clear()
 
-                # If we are not on the same domain as the
-                # starting url: *stop*. we are not interested
-                # in exploring the whole internet
-                if not current_url.is_same_domain(self.start_url):
-                    continue
+                for i, handle in enumerate(self.driver.window_handles):
+                    try:
+                        # Same. If we only had one url
+                        # to start with, this will raise
+                        # IndexError - so just skip
+                        current_url = URL(current_urls[i])
+                    except IndexError:
+                        continue
 
-                logger.info(f'Going to url: {current_url}')
+                    self.driver.switch_to.window(handle)
 
-                if self._meta.ignore_images:
-                    if current_url.is_image:
+                    # If we are not on the same domain as the
+                    # starting url: *stop*. we are not interested
+                    # in exploring the whole internet
+                    if not current_url.is_same_domain(self.start_url):
                         continue
 
-                self.driver.get(str(current_url))
-                self.visited_pages_count = self.visited_pages_count + 1
+                    if self.robots is not None and not self.robots.is_allowed(current_url):
+                        logger.info(f'Url disallowed by robots.txt: {current_url}')
+                        continue
 
-                try:
-                    # Always wait for the body section of
-                    # the page to be located  or visible
-                    wait = WebDriverWait(self.driver, 5)
-                    wait.until(
-                        EC.presence_of_element_located(
-                            (
-                                By.TAG_NAME,
-                                'body'
-                            )
-                        )
-                    )
-                except:
-                    logger.error('Body element of page was not detected')
+                    logger.info(f'Going to url: {current_url}')
 
-                if inspect.iscoroutinefunction(self.post_navigation_actions):
-                    async_to_sync(self.post_navigation_actions)(current_url)
-                else:
-                    self.post_navigation_actions(current_url)
+                    if self._meta.ignore_images:
+                        if current_url.is_image:
+                            continue
 
-                self.visited_urls.add(current_url)
-                url_instances.append(current_url)
+                    self.apply_resource_policy(current_url)
+                    self.get_readiness(current_url).setup(self.driver)
+                    self.rate_governor.record_request(current_url)
+                    request_start_time = time.monotonic()
 
-            # 3. Run the custom actions on the page
-            for i, handle in enumerate(self.driver.window_handles):
-                try:
-                    url_instance = url_instances[i]
-                except IndexError:
-                    continue
+                    try:
+                        self.driver.get(str(current_url))
+                    except Exception as e:
+                        logger.critical(
+                            f'Failed to go to: {color_text('red', current_url)}: {e.args}')
+                        self.record_failed_request(current_url, request_start_time)
+                        continue
 
-                self.driver.switch_to.window(handle)
+                    self.visited_pages_count = self.visited_pages_count + 1
 
-                if self._meta.crawl:
-                    self.collect_page_urls()
-                else:
+                    self.wait_until_ready(current_url)
+                    entries = self.process_network_logs(current_url)
+                    self.record_successful_request(
+                        current_url,
+                        request_start_time,
+                        status_code=self.get_page_status_code(current_url, entries)
+                    )
+                    self.browser_lifecycle.record_page(self.driver)
+
+                    if inspect.iscoroutinefunction(self.post_navigation_actions):
+                        async_to_sync(self.post_navigation_actions)(current_url)
+                    else:
+                        self.post_navigation_actions(current_url)
+
+                    self.register_canonical_url(current_url)
                     self.visited_urls.add(current_url)
-                    self.list_of_seen_urls.add(current_url)
+                    url_instances.append(current_url)
 
-                self.backup_urls()
+                # 3. Run the custom actions on the page
+                for i, handle in enumerate(self.driver.window_handles):
+                    try:
+                        url_instance = url_instances[i]
+                    except IndexError:
+                        continue
+
+                    self.driver.switch_to.window(handle)
 
-                try:
-                    if inspect.iscoroutinefunction(self.current_page_actions):
-                        async_to_sync(self.current_page_actions)(url_instance)
-                    else:
-                        # Run custom user actions once
-                        # everything is completed
-                        self.current_page_actions(url_instance)
-                except TypeError as e:
-                    logger.info(e)
-                    raise TypeError(
-                        "'self.current_page_actions' "
-                        f"should be able to accept arguments: {e}"
-                    )
-                except Exception as e:
-                    logger.error(e)
-                    raise ExceptionGroup(
-                        "An exception occured while trying "
-                        "to execute 'self.current_page_actions'",
-                        [
-                            Exception(e),
-                            exceptions.SpiderExecutionError()
-                        ]
-                    )
-                else:
-                    # Refresh the urls once the
-                    # user actions have been completed
-                    # for example scrolling down a page
-                    # that could generate new urls to
-                    # disover or changing a filter
                     if self._meta.crawl:
                         self.collect_page_urls()
-                        self.backup_urls()
+                    else:
+                        self.visited_urls.add(current_url)
+                        self.list_of_seen_urls.add(current_url)
 
-                # Run routing actions aka, base on given
-                # url path, route to a function that
-                # would execute said task
-                if self._meta.router is not None:
-                    self._meta.router.resolve(url_instance, self)
+                    self.backup_urls()
 
-                if self._meta.crawl:
-                    self.calculate_performance()
+                    try:
+                        if inspect.iscoroutinefunction(self.current_page_actions):
+                            async_to_sync(self.current_page_actions)(url_instance)
+                        else:
+                            # Run custom user actions once
+                            # everything is completed
+                            self.current_page_actions(url_instance)
+                    except TypeError as e:
+                        logger.info(e)
+                        raise TypeError(
+                            "'self.current_page_actions' "
+                            f"should be able to accept arguments: {e}"
+                        )
+                    except Exception as e:
+                        logger.error(e)
+                        raise ExceptionGroup(
+                            "An exception occured while trying "
+                            "to execute 'self.current_page_actions'",
+                            [
+                                Exception(e),
+                                exceptions.SpiderExecutionError()
+                            ]
+                        )
+                    else:
+                        # Refresh the urls once the
+                        # user actions have been completed
+                        # for example scrolling down a page
+                        # that could generate new urls to
+                        # disover or changing a filter
+                        if self._meta.crawl:
+                            self.collect_page_urls()
+                            self.backup_urls()
+
+                    # Run routing actions aka, base on given
+                    # url path, route to a function that
+                    # would execute said task
+                    if self._meta.router is not None:
+                        self._meta.router.resolve(url_instance, self)
 
-                self.performance_audit.add_iteration_count()
+                    if self._meta.crawl:
+                        self.calculate_performance()
 
-            if settings.WAIT_TIME_RANGE:
-                start = settings.WAIT_TIME_RANGE[0]
-                stop = settings.WAIT_TIME_RANGE[1]
-                wait_time = random.randrange(start, stop)
+                    self.performance_audit.add_iteration_count()
 
-            next_execution_date = (
-                self.get_current_date +
-                datetime.timedelta(seconds=wait_time)
-            )
+                # Wait for the slowest host of
+                # the batch to be available again
+                wait_time = max(
+                    [self.rate_governor.get_wait_time(url) for url in url_instances],
+                    default=settings.WAIT_TIME
+                )
+                if settings.WAIT_TIME_RANGE:
+                    start = settings.WAIT_TIME_RANGE[0]
+                    stop = settings.WAIT_TIME_RANGE[1]
+                    wait_time = max(wait_time, random.randrange(start, stop))
+
+                next_execution_date = (
+                    self.get_current_date +
+                    datetime.timedelta(seconds=wait_time)
+                )
 
-            if len(self.urls_to_visit) == 0:
-                self.performance_audit.end_date = self.get_current_date
-                self.performance_audit.calculate_duration()
+                if len(self.urls_to_visit) == 0:
+                    self.performance_audit.end_date = self.get_current_date
+                    self.performance_audit.calculate_duration()
 
-            self.performance_audit.count_urls_to_visit = len(
-                self.urls_to_visit
-            )
-            self.performance_audit.count_visited_urls = len(self.visited_urls)
+                self.performance_audit.count_urls_to_visit = len(
+                    self.urls_to_visit
+                )
+                self.performance_audit.count_visited_urls = len(self.visited_urls)
 
-            if os.getenv('KYRPTONE_TEST_RUN') is not None:
-                break
+                if os.getenv('KYRPTONE_TEST_RUN') is not None:
+                    break
 
-            logger.info(f"Next execution time: {next_execution_date}")
+                logger.info(f"Next execution time: {next_execution_date}")
 
-            current_urls.clear()
-            url_instances.clear()
+                current_urls.clear()
+                url_instances.clear()
+
+            self.save_session_state()
+        finally:
+            self.finish_crawl()
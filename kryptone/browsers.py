@@ -0,0 +1,874 @@
+import dataclasses
+import json
+import os
+import pathlib
+import queue
+import shutil
+import threading
+import time
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+from string import Template
+from typing import Any, Callable, Optional, Union
+from urllib.parse import urlparse
+
+from selenium.webdriver import Chrome, ChromeOptions, Edge, EdgeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.proxy import Proxy, ProxyType
+from selenium.webdriver.edge.service import Service as EdgeService
+
+from kryptone import logger
+from kryptone.conf import settings
+from kryptone.identities import Identity, get_identity_pool
+from kryptone.utils.file_readers import atomic_write
+
+# Name of the driver executables that are
+# looked up in the PATH when no driver
+# could be resolved otherwise
+DRIVER_EXECUTABLES = {
+    'Chrome': 'chromedriver',
+    'Edge': 'msedgedriver'
+}
+
+
+class DriverCache:
+    """Resolves the path of the driver executable of a browser
+    without using the network when possible. The path resolved
+    by webdriver-manager is stored in a JSON file and reused for
+    `ttl` seconds. When the driver cannot be installed (e.g. the
+    machine is offline), the last known driver or the driver
+    in the PATH is used instead
+
+    >>> cache = DriverCache()
+    ... cache.get_driver_path('Chrome')
+    ... '/home/user/.wdm/drivers/chromedriver/linux64/131.0/chromedriver'
+    """
+
+    def __init__(self, *, cache_path: Optional[Union[str, pathlib.Path]] = None, ttl: float = 604800, driver_version: Optional[str] = None):
+        self.cache_path = None if cache_path is None else pathlib.Path(cache_path)
+        self.ttl = ttl
+        self.driver_version = driver_version
+        self.lock = threading.Lock()
+        # Paths resolved in the current process
+        self.resolved_paths: dict[str, str] = {}
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.cache_path}>'
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            cache_path=settings.WEBDRIVER_CACHE_FILE,
+            ttl=settings.WEBDRIVER_CACHE_TTL,
+            driver_version=settings.WEBDRIVER_VERSION
+        )
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+
+        try:
+            with open(self.cache_path, mode='r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self, entries: dict[str, dict[str, Any]]):
+        if self.cache_path is None:
+            return False
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(self.cache_path) as f:
+                json.dump(entries, f)
+        except OSError as e:
+            logger.warning(f'Could not save the driver cache: {e}')
+            return False
+        return True
+
+    def get_cache_key(self, browser_name: str):
+        return f'{browser_name}:{self.driver_version or "latest"}'
+
+    def install(self, browser_name: str) -> str:
+        """Downloads the driver using webdriver-manager
+        which requires network access"""
+        if browser_name == 'Chrome':
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager(driver_version=self.driver_version).install()
+
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        return EdgeChromiumDriverManager(version=self.driver_version).install()
+
+    def get_driver_path(self, browser_name: str) -> Optional[str]:
+        key = self.get_cache_key(browser_name)
+        path = self.resolved_paths.get(key)
+        if path is not None and os.path.exists(path):
+            return path
+
+        with self.lock:
+            entries = self.load()
+            entry = entries.get(key)
+
+            if entry is not None and os.path.exists(entry['path']):
+                # A pinned version never needs to be
+                # checked against the latest release
+                is_fresh = time.time() - entry['installed_at'] < self.ttl
+                if self.driver_version is not None or is_fresh:
+                    self.resolved_paths[key] = entry['path']
+                    return entry['path']
+
+            try:
+                path = self.install(browser_name)
+            except Exception as e:
+                logger.warning(
+                    f'Could not install the driver for {browser_name}, '
+                    f'using a local driver instead: {e}'
+                )
+
+                if entry is not None and os.path.exists(entry['path']):
+                    path = entry['path']
+                else:
+                    path = shutil.which(DRIVER_EXECUTABLES.get(browser_name, ''))
+
+                if path is not None:
+                    self.resolved_paths[key] = path
+                return path
+
+            entries[key] = {'path': path, 'installed_at': time.time()}
+            self.save(entries)
+            self.resolved_paths[key] = path
+            return path
+
+
+_driver_cache: Optional[DriverCache] = None
+
+
+def get_driver_cache() -> DriverCache:
+    global _driver_cache
+    if _driver_cache is None:
+        _driver_cache = DriverCache.from_settings()
+    return _driver_cache
+
+
+# Identities of the browsers that are
+# alive which are used to record the
+# results of the requests on the proxies
+browser_identities: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_browser_identity(driver) -> Optional[Identity]:
+    return browser_identities.get(driver)
+
+
+def create_browser_options(browser_name: str, headless: bool = False, load_images: bool = True, load_js: bool = True, performance_logs: bool = True, identity: Optional[Identity] = None):
+    if identity is None:
+        identity = get_identity_pool().get()
+
+    options_klass = ChromeOptions if browser_name == 'Chrome' else EdgeOptions
+    options = options_klass()
+    options.add_argument('--remote-allow-origins=*')
+    options.add_argument(f'--user-agent={identity.user_agent}')
+    # The performance logs contain the network events of
+    # the pages. They accumulate in the browser until they
+    # are read and are therefore only enabled when used
+    if performance_logs:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    # With "eager" or "none", the navigation does not wait
+    # for all the resources of the page to be loaded and
+    # the readiness conditions decide when the page is ready
+    options.page_load_strategy = settings.PAGE_LOAD_STRATEGY
+
+    # Allow Selenium to be launched
+    # in headless mode
+    if headless:
+        options.add_argument('--headless=new')
+
+    # 0 = Default, 1 = Allow, 2 = Block
+    preferences = {
+        'profile.default_content_setting_values': {
+            'images': 0 if load_images else 2,
+            'javascript': 0 if load_js else 2,
+            'popups': 2,
+            'geolocation': 2,
+            'notifications': 2
+        }
+    }
+    options.add_experimental_option('prefs', preferences)
+
+    # Proxies
+    if identity.proxy is not None:
+        proxy = Proxy()
+        proxy.proxy_type = ProxyType.MANUAL
+        proxy.http_proxy = identity.proxy
+        options.add_argument(
+            f'--proxy-server={identity.proxies['http']}'
+        )
+        options.add_argument('--disable-gpu')
+    return options
+
+
+def create_browser(browser_name: Optional[str] = None, headless: bool = False, load_images: bool = True, load_js: bool = True, performance_logs: bool = True, identity: Optional[Identity] = None):
+    """Creates a new browser using the driver resolved by
+    the driver cache. Each browser uses its own identity
+    (user agent and proxy) for the whole session"""
+    browser_name = browser_name or settings.WEBDRIVER
+    identity = identity or get_identity_pool().get()
+    options = create_browser_options(
+        browser_name,
+        headless=headless,
+        load_images=load_images,
+        load_js=load_js,
+        performance_logs=performance_logs,
+        identity=identity
+    )
+
+    driver_path = settings.WEBDRIVER_PATH or get_driver_cache().get_driver_path(browser_name)
+    if driver_path is None:
+        raise ConnectionError(
+            f'No driver could be found for {browser_name}. Are you '
+            'offline? Set WEBDRIVER_PATH to use a local driver'
+        )
+
+    if browser_name == 'Chrome':
+        driver = Chrome(service=ChromeService(driver_path), options=options)
+    else:
+        driver = Edge(service=EdgeService(driver_path), options=options)
+
+    browser_identities[driver] = identity
+    return driver
+
+
+class BrowserPool:
+    """A pool of browsers that are launched in advance and
+    reused by the spiders in order to avoid the cost of starting
+    a new browser. Browsers are checked before being leased and
+    are replaced after `max_uses` leases
+
+    >>> pool = BrowserPool(size=2)
+    ... pool.warm()
+    ... with pool.session() as driver:
+    ...     driver.get('http://example.com')
+    """
+
+    def __init__(self, *, browser_name: Optional[str] = None, size: int = 2, max_uses: int = 50, max_launch_attempts: int = 3, headless: bool = False, load_images: bool = True, load_js: bool = True, performance_logs: bool = True):
+        self.browser_name = browser_name or settings.WEBDRIVER
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_launch_attempts = max(1, max_launch_attempts)
+        self.browser_options = {
+            'headless': headless,
+            'load_images': load_images,
+            'load_js': load_js,
+            'performance_logs': performance_logs
+        }
+        self.idle_browsers: queue.LifoQueue = queue.LifoQueue()
+        # driver -> number of times it was leased
+        self.uses: dict[Any, int] = {}
+        # Browsers that are being launched
+        self.pending_count = 0
+        self.lock = threading.Lock()
+        self.is_closed = False
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}[{self.browser_name}]: {len(self.uses)}/{self.size}>'
+
+    def __len__(self):
+        return len(self.uses)
+
+    @classmethod
+    def from_settings(cls, browser_name: Optional[str] = None, performance_logs: bool = True):
+        return cls(
+            browser_name=browser_name,
+            size=settings.BROWSER_POOL_SIZE,
+            max_uses=settings.BROWSER_POOL_MAX_USES,
+            headless=settings.HEADLESS,
+            load_images=settings.LOAD_IMAGES,
+            load_js=settings.LOAD_JS,
+            performance_logs=performance_logs
+        )
+
+    def reserve(self) -> bool:
+        with self.lock:
+            if len(self.uses) + self.pending_count >= self.size:
+                return False
+            self.pending_count = self.pending_count + 1
+            return True
+
+    def create(self):
+        try:
+            driver = create_browser(self.browser_name, **self.browser_options)
+        finally:
+            with self.lock:
+                self.pending_count = self.pending_count - 1
+
+        with self.lock:
+            self.uses[driver] = 0
+        return driver
+
+    def destroy(self, driver):
+        with self.lock:
+            self.uses.pop(driver, None)
+
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def warm(self, count: Optional[int] = None):
+        """Launches browsers until the pool contains
+        `count` browsers (by default the size of the pool)"""
+        count = min(self.size, count or self.size)
+        while len(self.uses) < count and self.reserve():
+            self.idle_browsers.put(self.create())
+
+    def is_healthy(self, driver) -> bool:
+        try:
+            # Fails when the browser or the
+            # driver process was closed
+            driver.execute_script('return 1')
+        except Exception:
+            return False
+        # Browsers whose proxy was banned are replaced
+        # only when another proxy can be used, otherwise
+        # the new browser would get a banned proxy too
+        return not get_identity_pool().can_replace(get_browser_identity(driver))
+
+    def lease(self, timeout: Optional[float] = None):
+        """Returns a healthy browser from the pool. A new browser
+        is launched when none is idle and the pool is not full,
+        otherwise waits for a browser to be released. Raises an
+        error after `max_launch_attempts` unhealthy new browsers"""
+        if self.is_closed:
+            raise RuntimeError('The browser pool is closed')
+
+        launch_attempts = 0
+        while True:
+            try:
+                driver = self.idle_browsers.get_nowait()
+            except queue.Empty:
+                if self.reserve():
+                    if launch_attempts >= self.max_launch_attempts:
+                        with self.lock:
+                            self.pending_count = self.pending_count - 1
+                        raise RuntimeError(
+                            'Could not launch a healthy browser '
+                            f'after {launch_attempts} attempts'
+                        )
+                    launch_attempts = launch_attempts + 1
+                    driver = self.create()
+                else:
+                    try:
+                        driver = self.idle_browsers.get(timeout=timeout)
+                    except queue.Empty:
+                        raise TimeoutError(
+                            'No browser was released by the '
+                            f'pool after {timeout} seconds'
+                        )
+
+            if not self.is_healthy(driver):
+                logger.warning('Replacing a browser that is not responding')
+                self.destroy(driver)
+                continue
+
+            with self.lock:
+                self.uses[driver] = self.uses.get(driver, 0) + 1
+            return driver
+
+    def release(self, driver):
+        """Returns a browser to the pool. The state of the
+        previous spider (cookies, storage, opened tabs) is
+        cleared before the browser can be leased again"""
+        if self.is_closed or self.uses.get(driver, 0) >= self.max_uses:
+            self.destroy(driver)
+            return False
+
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+        except Exception:
+            self.destroy(driver)
+            return False
+
+        self.idle_browsers.put(driver)
+        return True
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        driver = self.lease(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        self.is_closed = True
+        while True:
+            try:
+                driver = self.idle_browsers.get_nowait()
+            except queue.Empty:
+                break
+            self.destroy(driver)
+
+        for driver in list(self.uses):
+            self.destroy(driver)
+
+
+_browser_pools: dict[tuple[str, bool], BrowserPool] = {}
+
+
+def get_browser_pool(browser_name: Optional[str] = None, performance_logs: bool = True) -> BrowserPool:
+    """Returns the browser pool of the current
+    process for the given browser"""
+    browser_name = browser_name or settings.WEBDRIVER
+    key = (browser_name, performance_logs)
+    pool = _browser_pools.get(key)
+    if pool is None or pool.is_closed:
+        pool = BrowserPool.from_settings(
+            browser_name=browser_name,
+            performance_logs=performance_logs
+        )
+        _browser_pools[key] = pool
+        # Launch the browsers in advance so that the
+        # next spiders do not wait for them to start
+        if settings.BROWSER_POOL_SIZE > 0:
+            pool.warm()
+    return pool
+
+
+def get_process_memory(pid: int) -> Optional[int]:
+    """Returns the resident memory in bytes of the process and
+    of its children e.g. the driver and the processes of the
+    browser. Uses psutil when it is installed and the /proc
+    filesystem otherwise"""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            processes = [process, *process.children(recursive=True)]
+        except psutil.Error:
+            return None
+
+        total = 0
+        for process in processes:
+            try:
+                total = total + process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    proc_path = pathlib.Path('/proc')
+    if not proc_path.is_dir():
+        return None
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    children: dict[int, list[int]] = defaultdict(list)
+    memory: dict[int, int] = {}
+
+    for path in proc_path.iterdir():
+        if not path.name.isdigit():
+            continue
+
+        try:
+            with open(path / 'stat', encoding='utf-8') as f:
+                stat = f.read()
+            with open(path / 'statm', encoding='utf-8') as f:
+                statm = f.read().split()
+        except OSError:
+            continue
+
+        # The name of the process is between parentheses
+        # and can contain spaces, the parent id is the
+        # second field after the name
+        fields = stat.rsplit(')', 1)[1].split()
+        process_id = int(path.name)
+        children[int(fields[1])].append(process_id)
+        memory[process_id] = int(statm[1]) * page_size
+
+    if pid not in memory:
+        return None
+
+    total = 0
+    stack = [pid]
+    while stack:
+        process_id = stack.pop()
+        total = total + memory.get(process_id, 0)
+        stack.extend(children.get(process_id, []))
+    return total
+
+
+# Restores the local storage of an origin when a
+# page of this origin is loaded in the new browser
+LOCAL_STORAGE_SCRIPT = """
+(() => {
+    if (location.origin !== $origin) return
+    for (const [key, value] of $items) {
+        if (localStorage.getItem(key) === null) localStorage.setItem(key, value)
+    }
+})()
+"""
+
+# Fields of the cookies returned by Network.getAllCookies
+# that are accepted by Network.setCookies
+COOKIE_FIELDS = ['name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires']
+
+
+@dataclasses.dataclass
+class BrowserState:
+    """The cookies and the local storage of the current origin
+    which contain the session and the consent choices"""
+
+    cookies: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+    origin: Optional[str] = None
+    local_storage: list[list[str]] = dataclasses.field(default_factory=list)
+
+
+def capture_browser_state(driver) -> BrowserState:
+    state = BrowserState()
+
+    try:
+        # Contrary to get_cookies, returns the
+        # cookies of all the domains
+        result = driver.execute_cdp_cmd('Network.getAllCookies', {})
+        state.cookies = result.get('cookies', [])
+    except Exception:
+        try:
+            state.cookies = driver.get_cookies()
+        except Exception:
+            pass
+
+    try:
+        state.origin, state.local_storage = driver.execute_script(
+            'return [location.origin, Object.entries(localStorage)]'
+        )
+    except Exception:
+        pass
+    return state
+
+
+def restore_browser_state(driver, state: BrowserState):
+    if state.cookies:
+        cookies = []
+        for cookie in state.cookies:
+            params = {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+            # Session cookies do not expire
+            if cookie.get('session') or params.get('expires', 0) < 0:
+                params.pop('expires', None)
+            cookies.append(params)
+
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+        except Exception as e:
+            logger.warning(f'Could not restore the cookies: {e}')
+
+    if state.origin and state.local_storage:
+        script = Template(LOCAL_STORAGE_SCRIPT).substitute(
+            origin=json.dumps(state.origin),
+            items=json.dumps(state.local_storage)
+        )
+        try:
+            driver.execute_cdp_cmd(
+                'Page.addScriptToEvaluateOnNewDocument',
+                {'source': script}
+            )
+        except Exception as e:
+            logger.warning(f'Could not restore the local storage: {e}')
+
+
+class BrowserLifecycle:
+    """Tracks the number of pages loaded and the memory used by
+    the browser. The browser is recycled after `max_pages` pages
+    or when it uses more than `max_memory` megabytes, the cookies
+    and the local storage being restored in the new browser. Tabs
+    are reopened after `max_tab_pages` pages
+
+    >>> lifecycle = BrowserLifecycle(max_pages=500, max_memory=2048)
+    ... lifecycle.record_page(driver)
+    ... if lifecycle.should_recycle():
+    ...     driver = lifecycle.recycle(driver, create_driver, close_driver)
+    """
+
+    def __init__(self, *, max_pages: Optional[int] = 1000, max_memory: Optional[float] = 2048, max_tab_pages: Optional[int] = 100, check_interval: int = 10):
+        self.max_pages = max_pages
+        self.max_memory = max_memory
+        self.max_tab_pages = max_tab_pages
+        # Number of pages between two measures of
+        # the memory and two captures of the state
+        self.check_interval = max(1, check_interval)
+        self.pages_count = 0
+        self.tab_pages: dict[str, int] = defaultdict(int)
+        self.memory: Optional[int] = None
+        self.state: Optional[BrowserState] = None
+        self.recycled_count = 0
+        self.restarted_count = 0
+        self.recycled_tabs_count = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.pages_count} page(s)>'
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_pages=settings.BROWSER_MAX_PAGES,
+            max_memory=settings.BROWSER_MAX_MEMORY,
+            max_tab_pages=settings.TAB_MAX_PAGES
+        )
+
+    @staticmethod
+    def is_alive(driver) -> bool:
+        try:
+            driver.execute_script('return 1')
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def get_memory(driver) -> Optional[int]:
+        service = getattr(driver, 'service', None)
+        process = getattr(service, 'process', None)
+        pid = getattr(process, 'pid', None)
+        if not isinstance(pid, int):
+            return None
+        return get_process_memory(pid)
+
+    def record_page(self, driver):
+        self.pages_count = self.pages_count + 1
+
+        try:
+            handle = driver.current_window_handle
+        except Exception:
+            handle = None
+
+        if handle is not None:
+            self.tab_pages[handle] += 1
+
+        if self.pages_count % self.check_interval == 0:
+            self.memory = self.get_memory(driver)
+            # Keeps a recent state in order to restore
+            # the session if the browser crashes
+            self.state = capture_browser_state(driver)
+
+    def should_recycle(self) -> bool:
+        if self.max_pages is not None and self.pages_count >= self.max_pages:
+            return True
+
+        if self.max_memory is not None and self.memory is not None:
+            return self.memory > self.max_memory * 1024 * 1024
+        return False
+
+    def should_recycle_tab(self, handle: str) -> bool:
+        if self.max_tab_pages is None:
+            return False
+        return self.tab_pages.get(handle, 0) >= self.max_tab_pages
+
+    def recycle_tab(self, driver, handle: str) -> str:
+        """Replaces the tab with a new one
+        and returns the handle of the new tab"""
+        driver.switch_to.window(handle)
+        driver.switch_to.new_window('tab')
+        new_handle = driver.current_window_handle
+
+        driver.switch_to.window(handle)
+        driver.close()
+        driver.switch_to.window(new_handle)
+
+        self.tab_pages.pop(handle, None)
+        self.recycled_tabs_count = self.recycled_tabs_count + 1
+        return new_handle
+
+    def reset(self):
+        self.pages_count = 0
+        self.memory = None
+        self.tab_pages.clear()
+
+    def recycle(self, driver, create_driver: Callable[[], Any], close_driver: Callable[[Any], Any]):
+        """Replaces the browser by a new one
+        with the same cookies and local storage"""
+        state = capture_browser_state(driver)
+        close_driver(driver)
+
+        new_driver = create_driver()
+        restore_browser_state(new_driver, state)
+
+        self.state = state
+        self.reset()
+        self.recycled_count = self.recycled_count + 1
+        return new_driver
+
+    def restart(self, driver, create_driver: Callable[[], Any], close_driver: Callable[[Any], Any]):
+        """Replaces a browser that crashed using
+        the last state that was captured"""
+        try:
+            close_driver(driver)
+        except Exception:
+            pass
+
+        new_driver = create_driver()
+        if self.state is not None:
+            restore_browser_state(new_driver, self.state)
+
+        self.reset()
+        self.restarted_count = self.restarted_count + 1
+        return new_driver
+
+    def statistics(self):
+        return {
+            'pages_count': self.pages_count,
+            'memory': self.memory,
+            'recycled_count': self.recycled_count,
+            'restarted_count': self.restarted_count,
+            'recycled_tabs_count': self.recycled_tabs_count
+        }
+
+
+def is_cookie_of(cookie_domain: str, domain: str) -> bool:
+    """Whether a cookie set for `cookie_domain` is
+    sent to `domain` or to one of its subdomains"""
+    cookie_domain = cookie_domain.lstrip('.').lower()
+    domain = domain.lower()
+    if domain.startswith('www.'):
+        domain = domain[4:]
+
+    return (
+        cookie_domain == domain or
+        cookie_domain.endswith(f'.{domain}') or
+        domain.endswith(f'.{cookie_domain}')
+    )
+
+
+class SessionStore:
+    """Stores the cookies and the local storage of each domain
+    (e.g. after accepting the cookies or logging in) so that
+    they can be restored in the new browsers before the first
+    navigation. The state of a domain is refreshed once it is
+    older than `ttl` seconds and expired cookies are never
+    restored
+
+    >>> store = SessionStore('media/sessions.json')
+    ... store.snapshot(driver, 'example.com')
+    ... store.restore(new_driver, 'example.com')
+    ... True
+    """
+
+    def __init__(self, path: Optional[Union[str, pathlib.Path]] = None, ttl: float = 86400):
+        self.path = None if path is None else pathlib.Path(path)
+        self.ttl = ttl
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {list(self.entries)}>'
+
+    def __contains__(self, domain: str):
+        return self.get(domain) is not None
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            path=pathlib.Path(settings.MEDIA_FOLDER).joinpath(
+                settings.SESSION_STATE_FILE_NAME
+            ),
+            ttl=settings.SESSION_STATE_TTL
+        )
+
+    def read(self) -> dict[str, dict[str, Any]]:
+        if self.path is None or not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, mode='r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def load(self):
+        self.entries = self.read()
+
+    def save(self):
+        if self.path is None or not self.path.parent.is_dir():
+            return False
+
+        with self.lock:
+            # Other spiders or workers could have saved
+            # the state of other domains in the meantime
+            entries = self.read()
+            for domain, entry in self.entries.items():
+                current_entry = entries.get(domain)
+                if current_entry is None or current_entry['saved_at'] <= entry['saved_at']:
+                    entries[domain] = entry
+            self.entries = entries
+
+            with atomic_write(self.path) as f:
+                json.dump(entries, f)
+        return True
+
+    def is_expired(self, domain: str) -> bool:
+        entry = self.entries.get(domain)
+        if entry is None:
+            return True
+        return time.time() - entry['saved_at'] >= self.ttl
+
+    def get(self, domain: str) -> Optional[dict[str, Any]]:
+        if self.is_expired(domain):
+            return None
+
+        entry = self.entries[domain]
+        now = time.time()
+        cookies = [
+            cookie for cookie in entry['cookies']
+            if cookie.get('session') or cookie.get('expires', -1) < 0 or cookie['expires'] > now
+        ]
+        return {**entry, 'cookies': cookies}
+
+    def update(self, domain: str, state: BrowserState):
+        cookies = [
+            cookie for cookie in state.cookies
+            if is_cookie_of(cookie.get('domain', ''), domain)
+        ]
+
+        local_storage = {}
+        entry = self.entries.get(domain)
+        if entry is not None and not self.is_expired(domain):
+            local_storage.update(entry['local_storage'])
+
+        if state.origin and is_cookie_of(urlparse(state.origin).hostname or '', domain):
+            local_storage[state.origin] = state.local_storage
+
+        self.entries[domain] = {
+            'saved_at': time.time(),
+            'cookies': cookies,
+            'local_storage': local_storage
+        }
+        return self.entries[domain]
+
+    def snapshot(self, driver, domain: str):
+        """Captures the state of the browser for
+        the domain and saves it to the store"""
+        entry = self.update(domain, capture_browser_state(driver))
+        self.save()
+        return entry
+
+    def restore(self, driver, domain: str) -> bool:
+        """Restores the state of the domain in the browser.
+        Returns False if there is no state or if it expired"""
+        entry = self.get(domain)
+        if entry is None:
+            return False
+
+        restore_browser_state(driver, BrowserState(cookies=entry['cookies']))
+        for origin, items in entry['local_storage'].items():
+            restore_browser_state(
+                driver,
+                BrowserState(origin=origin, local_storage=items)
+            )
+        return True
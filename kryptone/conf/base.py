@@ -18,6 +18,108 @@ PROJECT_PATH = None
 WEBDRIVER = 'Chrome'
 
 
+# Absolute path to a driver executable (e.g. chromedriver)
+# to use instead of the driver resolved by webdriver-manager
+WEBDRIVER_PATH = None
+
+
+# Pins the version of the driver installed by
+# webdriver-manager. When set, a driver that was
+# already installed is never checked again online
+WEBDRIVER_VERSION = None
+
+
+# File in which the path of the installed drivers
+# is stored in order to launch the browsers without
+# network access. The installed driver is reused for
+# WEBDRIVER_CACHE_TTL seconds before checking for
+# a newer version
+WEBDRIVER_CACHE_FILE = pathlib.Path.home().joinpath('.kryptone', 'drivers.json')
+
+WEBDRIVER_CACHE_TTL = 604800
+
+
+# Number of browsers kept by the browser pool of
+# the process. Spiders lease a browser that was
+# already launched instead of starting a new one.
+# The pool is disabled when set to 0
+BROWSER_POOL_SIZE = 0
+
+
+# Number of times a browser of the pool can
+# be leased before being replaced by a new one
+BROWSER_POOL_MAX_USES = 50
+
+
+# Number of seconds a spider waits for a browser
+# to be released when all the browsers of the
+# pool are used by other spiders
+BROWSER_POOL_LEASE_TIMEOUT = 300
+
+
+# Number of pages after which the browser is replaced
+# by a new one in order to release the memory it leaks.
+# The cookies and the local storage are kept
+BROWSER_MAX_PAGES = 1000
+
+
+# Memory in megabytes used by the browser processes
+# above which the browser is replaced by a new one
+BROWSER_MAX_MEMORY = 2048
+
+
+# Number of pages after which
+# a tab is closed and reopened
+TAB_MAX_PAGES = 100
+
+
+# Whether to save the cookies and the local storage of
+# the crawled domain (e.g. after accepting the cookies or
+# logging in) and restore them in the new browsers before
+# the first navigation
+PERSIST_SESSION_STATE = False
+
+
+# Number of seconds after which the saved
+# session state of a domain is refreshed
+SESSION_STATE_TTL = 86400
+
+SESSION_STATE_FILE_NAME = 'sessions.json'
+
+
+# Page load strategy of the browser: 'normal' waits for
+# all the resources of the page, 'eager' for the DOM to be
+# parsed and 'none' returns immediately. The readiness
+# conditions then decide when the page can be used
+PAGE_LOAD_STRATEGY = 'normal'
+
+
+# Maximum number of seconds to wait for a
+# page to fulfill its readiness conditions
+READINESS_TIMEOUT = 5
+
+
+# Types of resources that the browser does not load
+# using the DevTools Protocol. Valid types are 'font',
+# 'media', 'image' and 'stylesheet'
+BLOCKED_RESOURCE_TYPES = []
+
+
+# Domains from which the browser does not load
+# any resource e.g. ['cdn.example.com']
+BLOCKED_DOMAINS = []
+
+
+# Whether to block the requests made to the known
+# analytics, advertising and tracking domains
+BLOCK_TRACKERS = False
+
+
+# Size in bytes above which a resource that was loaded
+# on a page is blocked on the next pages
+MAX_RESOURCE_SIZE = None
+
+
 # Name of the media folder, used for storing
 # resources like downloads and screenshots.
 # The resolved path will point to
@@ -25,6 +127,23 @@ WEBDRIVER = 'Chrome'
 MEDIA_FOLDER = 'media'
 
 
+# Format of the screenshots which is
+# either 'webp', 'jpeg' or 'png'
+SCREENSHOT_FORMAT = 'webp'
+
+SCREENSHOT_QUALITY = 80
+
+
+# Whether to capture the whole page instead of only
+# the visible part of the page when taking screenshots
+SCREENSHOT_FULL_PAGE = False
+
+
+# Number of megabytes of screenshots that can be written
+# during a crawl. None means that there is no limit
+SCREENSHOT_MAX_DISK_USAGE = 500
+
+
 # Specifies the default wait time (in seconds)
 # for the browser before navigating to the next URL
 WAIT_TIME = 25
@@ -36,11 +155,134 @@ WAIT_TIME = 25
 WAIT_TIME_RANGE = []
 
 
+# Bounds of the delay (in seconds) between two requests
+# to the same host. The delay starts at WAIT_TIME and is
+# adapted to the latency and the errors of each host
+RATE_GOVERNOR_MIN_DELAY = 1
+
+RATE_GOVERNOR_MAX_DELAY = 120
+
+
+# Maximum number of pages of the same host
+# that can be loaded in the tabs of a batch
+RATE_GOVERNOR_MAX_CONCURRENCY = 4
+
+
+# Number of pages of the same host loaded in
+# the tabs of the first batch. When None, all
+# the windows of boost_start are used
+RATE_GOVERNOR_INITIAL_CONCURRENCY = None
+
+
+# Average page load time (in seconds) above
+# which a host is considered to be struggling
+RATE_GOVERNOR_LATENCY_THRESHOLD = 10
+
+
+# Whether the spider should fetch the robots.txt file
+# of each host and skip the urls that it disallows. The
+# Crawl-delay of the host becomes its minimum delay
+ROBOTS_TXT_OBEY = False
+
+
+# User agent token used to select the group
+# of rules in the robots.txt files
+ROBOTS_USER_AGENT = 'Kryptone'
+
+
+# Number of seconds during which a robots.txt file
+# is kept in the cache before being fetched again
+ROBOTS_CACHE_TTL = 86400
+
+ROBOTS_CACHE_FILE_NAME = 'robots.json'
+
+
+# Number of urls that are pushed at once to the
+# urls to visit when seeding the spider from a sitemap
+SITEMAP_BATCH_SIZE = 1000
+
+
+# Maximum number of child sitemaps of a sitemap
+# index that are fetched concurrently
+SITEMAP_MAX_WORKERS = 4
+
+
+# Minimum level of the messages that are logged
+# e.g. DEBUG, INFO, WARNING, ERROR
+LOG_LEVEL = 'DEBUG'
+
+
+# Path to the file in which the logs are written
+LOG_FILE = 'access.log'
+
+
+# Write the logs from a background thread so
+# that the spider does not wait for the console
+# or the disk when logging messages
+LOG_USE_QUEUE = False
+
+
+# Write the logs of the log file as JSON lines
+LOG_JSON_FORMAT = False
+
+
+# Rotate the log file when it reaches this size (in bytes).
+# Use 0 to never rotate the log file
+LOG_MAX_BYTES = 0
+
+
+# Number of rotated log files to keep
+LOG_BACKUP_COUNT = 3
+
+
+# Number of saved items that are buffered before
+# being written at once to the sinks of the pipeline
+PIPELINE_BATCH_SIZE = 100
+
+
+# Maximum time (in seconds) during which saved items
+# can stay in the buffer of the pipeline before being
+# written. Use None to only flush full batches
+PIPELINE_FLUSH_INTERVAL = 30
+
+
+# Number of the most recently saved items that are
+# kept in memory in the spider's DATA_CONTAINER when
+# the pipeline writes the items to sinks
+DATA_CONTAINER_MAX_SIZE = 1000
+
+
+# Compression codec used when writing Parquet files
+# e.g. 'zstd', 'snappy', 'gzip' or None
+PARQUET_COMPRESSION = 'zstd'
+
+
+# Maximum number of rows in each row group of
+# the Parquet files. Smaller row groups allow
+# readers to skip more data when filtering
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+
+# Name of the database file created in the
+# media folder by the SQLite storage
+SQLITE_DATABASE_NAME = 'kryptone.sqlite'
+
+
 # Name of the file used for caching URLs
 # to visit and already visited URLs
 CACHE_FILE_NAME = 'cache'
 
 
+# Write a compressed binary snapshot of the urls
+# when the cache is saved. The snapshot is used to
+# resume the spider without checking the urls again
+USE_CRAWL_SNAPSHOTS = True
+
+
+# Name of the snapshot file in the media folder
+CRAWL_SNAPSHOT_FILE_NAME = 'crawl.snapshot'
+
+
 # Frequency (in seconds) at which data
 # is sent to registered webhooks
 WEBHOOK_INTERVAL = 15
@@ -94,6 +336,45 @@ LOAD_JS = True
 PROXY_IP_ADDRESS = None
 
 
+# Proxies used by the browsers and the HTTP requests.
+# Each proxy is either an address or a dictionary with
+# an address and a weight. Example:
+# ['192.168.0.1:8080', {'address': '192.168.0.2:8080', 'weight': 2}]
+PROXIES = []
+
+
+# Number of consecutive errors after which
+# a proxy is banned for PROXY_BAN_TIME seconds
+PROXY_MAX_ERRORS = 3
+
+PROXY_BAN_TIME = 300
+
+
+# Number of consecutive 403, 407 or 429 responses
+# after which a proxy is banned
+PROXY_MAX_BAN_RESPONSES = 3
+
+
+# User agents used by the browsers and the HTTP
+# requests. When empty, the user agents of the
+# data/user_agents.txt file are used
+USER_AGENTS = []
+
+
+# Whether the HTTP requests sent to a domain keep
+# using the same user agent and proxy until the
+# proxy is banned
+STICKY_IDENTITIES = True
+
+
+# Number of urls whose status is checked concurrently
+# by the status checker and the number of seconds
+# after which a request is considered as failed
+STATUS_CHECK_MAX_WORKERS = 10
+
+STATUS_CHECK_TIMEOUT = 10
+
+
 # Storage settings for saving and retrieving data during spider execution
 
 # A dictionary mapping storage aliases to their respective
@@ -7,11 +7,16 @@ IMAGE_EXTENSIONS: Final[set[str]] = {
     '3dm',
     '3ds',
     'max',
+    'apng',
     'avif',
     'bmp',
     'dds',
     'gif',
+    'heic',
     'heif',
+    'ico',
+    'jfif',
+    'jpe',
     'jpg',
     'jpeg',
     'jxl',
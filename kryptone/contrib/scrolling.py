@@ -1,65 +1,250 @@
-import time
+import dataclasses
 from string import Template
+from typing import Optional
+
+from kryptone import logger
+
+# Scrolls the page or an element of the page in the browser and
+# returns a single result once the scroll session is finished.
+# After each scroll, waits for the DOM to change or for the
+# network to be quiet before measuring the growth of the page
+SCROLL_ENGINE_SCRIPT = """
+const options = arguments[0]
+const done = arguments[arguments.length - 1]
+
+const findScrollable = (element) => {
+    if (element.scrollHeight > element.clientHeight) return element
+    for (const child of element.querySelectorAll('*')) {
+        if (child.scrollHeight > child.clientHeight && getComputedStyle(child).overflowY !== 'visible') return child
+    }
+    return element
+}
+
+const getNetworkState = () => {
+    const state = window.__kryptoneNetwork
+    let last = 0
+    for (const entry of performance.getEntriesByType('resource')) {
+        last = Math.max(last, entry.responseEnd)
+    }
+    if (state) last = Math.max(last, state.last)
+    return [state ? state.inflight : 0, performance.now() - last]
+}
+
+const run = async () => {
+    let container = null
+    if (options.selector) {
+        container = document.querySelector(options.selector)
+    } else if (options.xpath) {
+        container = document.evaluate(options.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    }
+    if ((options.selector || options.xpath) && !container) {
+        return { reason: 'not_found' }
+    }
+
+    const element = container ? findScrollable(container) : null
+    const root = container || document
+    const target = element || document.scrollingElement || document.documentElement
+
+    const getPosition = () => element ? element.scrollTop : window.scrollY
+    const getViewport = () => element ? element.clientHeight : window.innerHeight
+    const scrollTo = (position) => element ? element.scrollTo(0, position) : window.scrollTo(0, position)
+    const countLinks = () => root.querySelectorAll('a[href]').length
+    const countItems = () => options.itemSelector ? root.querySelectorAll(options.itemSelector).length : null
+
+    // Resolves with true when the DOM changed and stopped changing
+    // for quietTime, with false when nothing changed and the network
+    // was quiet for quietTime or when the step timed out
+    const waitForChange = () => new Promise((resolve) => {
+        const start = performance.now()
+        let changed = false
+        let quietTimer = null
+        let timeout = null
+        let interval = null
+
+        const finish = (result) => {
+            observer.disconnect()
+            clearTimeout(quietTimer)
+            clearTimeout(timeout)
+            clearInterval(interval)
+            resolve(result)
+        }
+
+        const observer = new MutationObserver(() => {
+            changed = true
+            clearTimeout(quietTimer)
+            quietTimer = setTimeout(() => finish(true), options.quietTime)
+        })
+        observer.observe(root === document ? document.body : root, { childList: true, subtree: true })
+
+        timeout = setTimeout(() => finish(changed), options.stepTimeout)
+        interval = setInterval(() => {
+            if (changed || performance.now() - start < options.quietTime) return
+            const [inflight, idleTime] = getNetworkState()
+            if (inflight === 0 && idleTime >= options.quietTime) finish(false)
+        }, 50)
+    })
+
+    const startTime = performance.now()
+    const initialLinks = countLinks()
+    const linksAdded = []
+    let previousHeight = target.scrollHeight
+    let previousLinks = initialLinks
+    let noGrowth = 0
+    let reason = null
+
+    while (reason === null) {
+        scrollTo(getPosition() + (options.increment || getViewport()))
+        await waitForChange()
+
+        const height = target.scrollHeight
+        const links = countLinks()
+        const items = countItems()
+        const position = getPosition()
+        linksAdded.push(links - previousLinks)
+
+        const hasGrown = height > previousHeight || links > previousLinks
+        const isAtBottom = position + getViewport() >= height - 100
+        noGrowth = isAtBottom && !hasGrown ? noGrowth + 1 : 0
+
+        if (options.targetCount !== null && items !== null && items >= options.targetCount) {
+            reason = 'target_count'
+        } else if (options.stopAt !== null && position >= options.stopAt) {
+            reason = 'stop_at'
+        } else if (noGrowth >= options.maxNoGrowth) {
+            reason = 'no_growth'
+        } else if (linksAdded.length >= options.maxSteps) {
+            reason = 'max_steps'
+        } else if (performance.now() - startTime >= options.maxTime) {
+            reason = 'timeout'
+        }
+
+        previousHeight = height
+        previousLinks = links
+    }
+
+    return {
+        reason: reason,
+        position: getPosition(),
+        height: target.scrollHeight,
+        links_count: countLinks(),
+        new_links_count: countLinks() - initialLinks,
+        links_added: linksAdded,
+        items_count: countItems(),
+        elapsed: (performance.now() - startTime) / 1000
+    }
+}
+
+run().then(done).catch((error) => done({ reason: 'error', error: String(error) }))
+"""
+
+
+@dataclasses.dataclass
+class ScrollResult:
+    """The result of a scroll session. The reason is either
+    "target_count", "stop_at", "no_growth", "max_steps",
+    "timeout", "not_found" or "error" """
+
+    reason: str
+    position: float = 0
+    height: float = 0
+    links_count: int = 0
+    new_links_count: int = 0
+    # Number of links added to the
+    # page after each scroll
+    links_added: list[int] = dataclasses.field(default_factory=list)
+    items_count: Optional[int] = None
+    elapsed: float = 0
+    error: Optional[str] = None
+
+    @property
+    def steps(self):
+        return len(self.links_added)
+
 
 class ScrollMixin:
     """A mixin that implements special scrolling
     functionnalities to the spider"""
 
-    def scroll_window(self, wait_time=5, increment=1000, stop_at=None):
-        """Scrolls the entire window by incremeting the current
-        scroll position by a given number of pixels"""
-        can_scroll = True
-        new_scroll_pixels = 1000
-
-        while can_scroll:
-            scroll_script = f"""window.scroll(0, {new_scroll_pixels})"""
-
-            self.driver.execute_script(scroll_script)
-            # Scrolls until we get a result that determines that we
-            # have actually scrolled to the bottom of the page
-            has_reached_bottom = self.driver.execute_script(
-                """return (window.innerHeight + window.scrollY) >= (document.documentElement.scrollHeight - 100)"""
-            )
-            if has_reached_bottom:
-                can_scroll = False
-
-            current_position = self.driver.execute_script(
-                """return window.scrollY"""
-            )
-            if stop_at is not None and current_position > stop_at:
-                can_scroll = False
+    def run_scroll_engine(self, selector=None, xpath=None, wait_time=5, increment=1000, stop_at=None, item_selector=None, target_count=None, quiet_time=0.5, max_no_growth=2, max_steps=500, max_time=300):
+        """Runs the scroll session in the browser using a single
+        asynchronous script and returns its result"""
+        options = {
+            'selector': selector,
+            'xpath': xpath,
+            'increment': increment,
+            'stopAt': stop_at,
+            'itemSelector': item_selector,
+            'targetCount': target_count,
+            'quietTime': quiet_time * 1000,
+            'stepTimeout': wait_time * 1000,
+            'maxNoGrowth': max(1, max_no_growth),
+            'maxSteps': max_steps,
+            'maxTime': max_time * 1000
+        }
 
-            new_scroll_pixels = new_scroll_pixels + increment
-            time.sleep(wait_time)
+        try:
+            previous_timeout = self.driver.timeouts.script
+        except Exception:
+            previous_timeout = None
 
-    def scroll_page_section(self, xpath=None, css_selector=None):
-        """Scrolls a specific portion on the page"""
-        if css_selector:
-            selector = """const mainWrapper = document.querySelector('{condition}')"""
-            selector = selector.format(condition=css_selector)
-        else:
-            # selector = self.evaluate_xpath(xpath)
-            # selector = """const element = document.evaluate("{condition}", document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)"""
-            # selector = selector.format(condition=xpath)
-            pass
-
-        body = """
-        const elementToScroll = mainWrapper.querySelector('div[tabindex="-1"]')
+        try:
+            # The session can take longer than the default
+            # timeout of the asynchronous scripts
+            self.driver.set_script_timeout(max_time + wait_time + 5)
+            result = self.driver.execute_async_script(
+                SCROLL_ENGINE_SCRIPT,
+                options
+            )
+        except Exception as e:
+            logger.warning(f'Scroll session failed: {e}')
+            return ScrollResult(reason='error', error=str(e))
+        finally:
+            # The other scripts of the spider
+            # keep their original timeout
+            if previous_timeout is not None:
+                self.driver.set_script_timeout(previous_timeout)
 
-        const elementHeight = elementToScroll.scrollHeight
-        let currentPosition = elementToScroll.scrollTop
+        result = ScrollResult(**result)
+        logger.info(
+            f'Scrolled {result.steps} time(s) in {round(result.elapsed, 2)}s '
+            f'({result.new_links_count} new link(s), reason: {result.reason})'
+        )
+        return result
 
-        // Indicates the scrolling speed
-        const scrollStep = Math.ceil(elementHeight / {scroll_step})
+    def scroll_window(self, wait_time=5, increment=1000, stop_at=None, item_selector=None, target_count=None, **kwargs):
+        """Scrolls the entire window by incremeting the current
+        scroll position by a given number of pixels. After each
+        scroll, waits at most `wait_time` seconds for the DOM to
+        change or for the network to be quiet. Stops when `stop_at`
+        pixels are reached, when `target_count` elements matching
+        `item_selector` are on the page or when the page stops growing
 
-        currentPosition += scrollStep
-        elementToScroll.scroll(0, currentPosition)
+        >>> result = self.scroll_window(item_selector='.product', target_count=200)
+        ... result.new_links_count
+        ... 180
+        """
+        return self.run_scroll_engine(
+            wait_time=wait_time,
+            increment=increment,
+            stop_at=stop_at,
+            item_selector=item_selector,
+            target_count=target_count,
+            **kwargs
+        )
 
-        return [ currentPosition, elementHeight ]
-        """.format(scroll_step=self.default_scroll_step)
+    def scroll_page_section(self, xpath=None, css_selector=None, increment=None, **kwargs):
+        """Scrolls a specific portion on the page. When the element
+        is not scrollable itself, its first scrollable descendant
+        is used. By default, scrolls by the height of the element"""
+        if css_selector is None and xpath is None:
+            raise ValueError('A css selector or an xpath is required')
 
-        script = css_selector + '\n' + body
-        return script
+        return self.run_scroll_engine(
+            selector=css_selector,
+            xpath=xpath,
+            increment=increment,
+            **kwargs
+        )
 
     def scroll_into_view(self, css_selector):
         """Scrolls directly into an element of the page"""
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import re
 import unicodedata
@@ -6,23 +5,13 @@ from collections import Counter, defaultdict, deque
 from functools import cached_property
 from math import log
 
-import kagglehub
-import numpy as np
-import pandas
-import pandas as pd
-import requests
 from bs4 import BeautifulSoup
-from kagglehub import KaggleDatasetAdapter
-from matplotlib import pyplot
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
 
 from kryptone.conf import settings
+from kryptone.utils.columnar import write_parquet_document
 from kryptone.utils.date_functions import get_current_date
-from kryptone.utils.file_readers import read_document
-from kryptone.utils.functions import create_filename
+from kryptone.utils.file_readers import get_media_folder, read_document
 from kryptone.utils.iterators import keep_while
-from kryptone.utils.randomizers import RANDOM_USER_AGENT
 from kryptone.utils.text import clean_text, remove_punctuation, slugify
 
 EMAIL_REGEX = r'\S+\@\S+'
@@ -122,6 +111,8 @@ class TFIDFProcessor:
 
     def compute_tfidf_matrix(self):
         """Compute the TF-IDF matrix using scikit-learn"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
         vectorizer = TfidfVectorizer()
         self.tfidf_matrix = vectorizer.fit_transform(self.documents)
         self.feature_names = vectorizer.get_feature_names_out()
@@ -258,6 +249,7 @@ class TextMixin:
         words. This function does structural destrctive changes to 
         the oringal text. The text is then run through the text processors"""
         import nltk
+        from nltk.corpus import stopwords
         from nltk.tokenize import word_tokenize
 
         abbreviations = None
@@ -269,6 +261,9 @@ class TextMixin:
             nltk.download('punkt_tab')
             nltk.download('omw-1.4')
 
+            import kagglehub
+            import pandas
+
             path = kagglehub.dataset_download('johnpendenque/french-abbreviations')
             abbreviations = pandas.read_csv(path)
 
@@ -327,6 +322,7 @@ class SEOMixin(TextMixin):
     website_tokens = deque()
     stemmed_tokens = deque()
     page_audits = defaultdict(dict)
+    broken_links = {}
     website_word_frequency = {}
 
     @property
@@ -378,6 +374,8 @@ class SEOMixin(TextMixin):
                 "Please install it via 'pip install wordcloud'"
             )
         
+        from matplotlib import pyplot
+
         page_title = self.get_page_title
         wordcloud = WordCloud()
         wordcloud.generate_from_frequencies(frequency)
@@ -388,6 +386,8 @@ class SEOMixin(TextMixin):
         fig.savefig(f'{slugify(page_title)}')
 
     def create_graph(self, current_url, x_values, y_values):
+        from matplotlib import pyplot
+
         page_title = self.get_page_title
         fig = pyplot.figure()
         fig, axes = pyplot.subplots(figsize=[15, 6])
@@ -447,14 +447,7 @@ class SEOMixin(TextMixin):
             audit['has_h1'] = True
             audit['h1'] = clean_text(result)
         else:
-            filename = create_filename(suffix='h1')
-
-            screenshots_folder = settings.MEDIA_FOLDER / 'screenshots'
-            if not screenshots_folder.exists():
-                screenshots_folder.mkdir()
-
-            path = screenshots_folder / filename
-            self.driver.get_screenshot_as_file(path)
+            self.take_screenshot(name='h1')
 
     def audit_head(self, audit):
         """Checks the head section of the
@@ -531,21 +524,27 @@ class SEOMixin(TextMixin):
         audit['timing'] = result
 
     def audit_page_status_code(self, current_url, audit):
-        async def sender():
-            headers = {'User-Agent': RANDOM_USER_AGENT()}
-            try:
-                response = requests.get(str(current_url), headers=headers)
-            except:
-                # If we get an error when trying to send
-                # the request, just put status code 0
-                audit['status_code'] = 0
-            else:
-                audit['status_code'] = response.status_code
-
-        async def main():
-            await sender()
-
-        asyncio.run(main())
+        # The status is read from the browser which already
+        # loaded the page. A status code of 0 means that
+        # the page could not be requested
+        status = self.status_checker.get_page_status(self.driver, current_url)
+        audit['status_code'] = status.status_code
+
+    def audit_broken_links(self):
+        """Checks the status of all the links that were found
+        on the audited pages and returns the broken links
+        of each page
+
+        >>> self.audit_broken_links()
+        ... {'http://example.com': [<URLStatus[404]: http://example.com/a>]}
+        """
+        self.broken_links = self.status_checker.broken_links(self.url_distribution)
+        for page, statuses in self.broken_links.items():
+            if str(page) in self.page_audits:
+                self.page_audits[str(page)]['broken_links'] = [
+                    status.json() for status in statuses
+                ]
+        return self.broken_links
 
     def audit_page(self, current_url, generate_graph=False):
         raw_text = self.get_page_text()
@@ -583,6 +582,14 @@ class SEOMixin(TextMixin):
         self.page_audits[str(current_url)] = audit
         return audit
 
+    def export_page_audits(self, filename='page_audits.parquet'):
+        """Writes the audits of the pages to a compressed Parquet
+        file in the media folder with one row per page and one
+        column per audited value"""
+        path = get_media_folder(filename)
+        write_parquet_document(path, list(self.page_audits.values()))
+        return path
+
 
 class EmailMixin(TextMixin):
     emails_container = set()
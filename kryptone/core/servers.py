@@ -1,7 +1,8 @@
-import celery
 import atexit
 import signal
 import subprocess
+from functools import lru_cache
+
 from kryptone.conf import settings
 
 
@@ -19,21 +20,35 @@ def get_backend():
     return f"redis://{host}:{port}/0"
 
 
-app = celery.Celery(
-    'kryptone',
-    broker=get_broker(),
-    backend=get_backend(),
-    log=None
-)
+@lru_cache(maxsize=1)
+def get_app():
+    """Creates the celery application. The application is
+    only created when it is used so that importing this
+    module does not require connecting to celery"""
+    import celery
+
+    app = celery.Celery(
+        'kryptone',
+        broker=get_broker(),
+        backend=get_backend(),
+        log=None
+    )
+
+    app.autodiscover_tasks(
+        [
+            'kryptone.core.tasks',
+            getattr(settings, '_PYTHON_PATH', '') + '.tasks'
+        ]
+    )
+    return app
 
-# print(vars(settings))
 
-app.autodiscover_tasks(
-    [
-        'kryptone.core.tasks',
-        getattr(settings, '_PYTHON_PATH', '') + '.tasks'
-    ]
-)
+def __getattr__(name):
+    # Allows "celery -A kryptone.core.servers.app"
+    # to lazily get the application
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_celery_server(spider_config):
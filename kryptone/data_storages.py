@@ -1,20 +1,26 @@
+import asyncio
 import csv
 import dataclasses
 import json
+import os
 import pathlib
+import re
+import sqlite3
+import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any, Optional
 
-import gspread
-import pyairtable
-import redis
 
 from kryptone import logger
 from kryptone.conf import settings
 from kryptone.internal_types import FileProtocol, _SiteCrawler
+from kryptone.utils.columnar import (read_parquet_document,
+                                     write_parquet_document)
 from kryptone.utils.encoders import DefaultJsonEncoder
 from kryptone.utils.text import color_text
-from kryptone.utils.urls import URL, load_image_extensions
+from kryptone.utils.file_readers import atomic_write
+from kryptone.utils.urls import URL, is_image_extension
 
 if TYPE_CHECKING:
     from kryptone.base import SiteCrawler
@@ -85,6 +91,11 @@ class BaseStorage:
         subclasses since the default behaviour is to call `save`"""
         return self.save(key, data, **kwargs)
 
+    async def get_modified_time(self, key: str) -> Optional[float]:
+        """Returns the timestamp of the last modification of
+        the key or None when the storage cannot know it"""
+        return None
+
 
 @dataclasses.dataclass
 class File:
@@ -107,11 +118,18 @@ class File:
     def is_csv(self):
         return self.path.suffix == '.csv'
 
+    @property
+    def is_parquet(self):
+        return self.path.suffix == '.parquet'
+
     @property
     def is_image(self):
-        return self.path.suffix in load_image_extensions()
+        return is_image_extension(self.path.suffix)
 
     async def read(self):
+        if self.is_parquet:
+            return read_parquet_document(self.path)
+
         with open(self.path, mode='r', encoding='utf-8') as f:
             if self.is_json:
                 return json.load(f)
@@ -122,11 +140,23 @@ class File:
 
 class FileStorage(BaseStorage):
     """This file based storage api is used to write
-    to files in the selected user storage"""
+    to files in the selected user storage. Only the files
+    at the root of the storage path that have one of the
+    `storage_extensions` are tracked by the storage. The
+    index of these files is updated when a file is created
+    or deleted and can be persisted between runs using
+    `persist_index`
+
+    Files are written to a temporary file which then replaces
+    the original one so that a crash never leaves a partially
+    written file in the storage
+    """
 
     file_based = True
+    storage_extensions = ('.json', '.csv')
+    index_filename = '.storage_index.json'
 
-    def __init__(self, *, spider: Optional[_SiteCrawler] = None, storage_path: Optional[pathlib.Path | str] = None, ignore_images: bool = True):
+    def __init__(self, *, spider: Optional[_SiteCrawler] = None, storage_path: Optional[pathlib.Path | str] = None, ignore_images: bool = True, persist_index: bool = False):
         super().__init__(spider=spider)
         if storage_path is not None:
             if isinstance(storage_path, str):
@@ -136,9 +166,10 @@ class FileStorage(BaseStorage):
                 raise ValueError(
                     f"Storage should be a folder. Got: {storage_path}")
 
-        self.storage = OrderedDict()
+        self.storage: OrderedDict[str, File] = OrderedDict()
         self.storage_path = storage_path or settings.MEDIA_PATH
         self.ignore_images = ignore_images
+        self.persist_index = persist_index
         # Since it's a file, the connection to the
         # local file is always considered to be True
         self.is_connected = True
@@ -147,25 +178,73 @@ class FileStorage(BaseStorage):
     def __repr__(self):
         return f'<{self.__class__.__name__}: {len(self.storage.keys())}>'
 
+    @property
+    def index_path(self) -> pathlib.Path:
+        return self.storage_path.joinpath(self.index_filename)
+
+    def is_storage_file(self, name: str):
+        if name == self.index_filename:
+            return False
+
+        suffix = pathlib.Path(name).suffix
+        if suffix.lower() in self.storage_extensions:
+            return True
+        return not self.ignore_images and is_image_extension(suffix)
+
+    def load_index(self):
+        try:
+            with open(self.index_path, mode='r', encoding='utf-8') as f:
+                names = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        for name in names:
+            path = self.storage_path.joinpath(name)
+            if path.is_file():
+                self.storage[name] = File(path)
+        return True
+
+    def save_index(self):
+        if not self.persist_index:
+            return False
+
+        with atomic_write(self.index_path) as f:
+            json.dump(list(self.storage.keys()), f)
+        return True
+
     def initialize(self):
-        """A hook function that used to
-        preload data (for example files) in the
-        storage container. This hook should be
-        called also when creating new files in
-        the storage in order to keep track"""
-        items = self.storage_path.glob('**/*')
-        for item in items:
-            if not item.is_file():
-                continue
-            instance = File(item)
-
-            if self.ignore_images:
-                if instance.is_image:
-                    continue
-
-            self.storage[item.name] = instance
+        """A hook function that used to preload the files
+        of the storage. The persisted index is used when
+        available otherwise only the root of the storage
+        path is scanned, which avoids walking through
+        folders that contain the downloaded images"""
+        self.storage.clear()
+
+        if self.persist_index and self.load_index():
+            return True
+
+        with os.scandir(self.storage_path) as entries:
+            for entry in entries:
+                if entry.is_file() and self.is_storage_file(entry.name):
+                    self.storage[entry.name] = File(pathlib.Path(entry.path))
+
+        self.save_index()
         return True
 
+    def register(self, path: pathlib.Path):
+        """Adds a file that was created to the index"""
+        instance = File(path)
+        self.storage[path.name] = instance
+        self.save_index()
+        return instance
+
+    def unregister(self, filename: str):
+        """Removes a file from the index"""
+        instance = self.storage.pop(filename, None)
+        if instance is not None:
+            self.save_index()
+        return instance
+
     async def has(self, key: str) -> bool:
         return key in self.storage
 
@@ -183,21 +262,29 @@ class FileStorage(BaseStorage):
         # we can also create the file in memory
         return self.storage[filename]
 
+    async def get_modified_time(self, key: str) -> Optional[float]:
+        if not await self.has(key):
+            return None
+
+        file = await self.get_file(key)
+        try:
+            return file.path.stat().st_mtime
+        except OSError:
+            return None
+
+    async def delete(self, filename: str) -> bool:
+        """Deletes the file from the storage"""
+        instance = self.unregister(filename)
+        if instance is None:
+            return False
+
+        instance.path.unlink(missing_ok=True)
+        return True
+
     async def save_or_create(self, filename: str, data: Any, **kwargs):
         file_exists = await self.has(filename)
         if not file_exists:
-            path = self.storage_path.joinpath(filename)
-            instance = File(path)
-
-            if instance.is_json:
-                with open(path, mode='w', encoding='utf-8') as f:
-                    json.dump(data, f, cls=DefaultJsonEncoder)
-            elif instance.is_csv:
-                with open(path, mode='w', newline='\n', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerows(data)
-            self.initialize()
-            return True
+            self.register(self.storage_path.joinpath(filename))
         return await self.save(filename, data, **kwargs)
 
     async def save(self, filename: str, data: Any, adapt_list: bool = False):
@@ -205,10 +292,10 @@ class FileStorage(BaseStorage):
         file = await self.get_file(filename)
 
         if file.is_json:
-            with open(file.path, mode='w', encoding='utf-8') as f:
+            with atomic_write(file.path) as f:
                 json.dump(data, f, indent=4, cls=DefaultJsonEncoder)
         elif file.is_csv:
-            with open(file.path, mode='w', newline='\n', encoding='utf-8') as f:
+            with atomic_write(file.path, newline='\n') as f:
                 writer = csv.writer(f)
 
                 if adapt_list:
@@ -217,16 +304,389 @@ class FileStorage(BaseStorage):
         return True
 
 
+class ParquetStorage(FileStorage):
+    """File based storage that writes the data of the spider
+    as compressed Parquet files which are read using memory
+    maps. The keys used by the spider are stored with the
+    Parquet extension e.g. `cache.json` is stored as
+    `cache.parquet`
+
+    >>> STORAGES = {
+    ...     'default': 'kryptone.data_storages.ParquetStorage'
+    ... }
+    """
+
+    storage_extensions = ('.parquet',)
+
+    @staticmethod
+    def get_filename(key: str):
+        return pathlib.Path(key).with_suffix('.parquet').name
+
+    async def has(self, key: str) -> bool:
+        return await super().has(self.get_filename(key))
+
+    async def get_file(self, filename: str) -> FileProtocol:
+        return await super().get_file(self.get_filename(filename))
+
+    async def delete(self, filename: str) -> bool:
+        return await super().delete(self.get_filename(filename))
+
+    async def save_or_create(self, filename: str, data: Any, **kwargs):
+        file_exists = await self.has(filename)
+        if not file_exists:
+            self.register(self.storage_path.joinpath(self.get_filename(filename)))
+        return await self.save(filename, data, **kwargs)
+
+    async def save(self, filename: str, data: Any, adapt_list: bool = False):
+        data = self.before_save(data)
+        file = await self.get_file(filename)
+        write_parquet_document(file.path, data)
+        return True
+
+
+class SQLiteStorage(BaseStorage):
+    """Storage that keeps the state of the spider in a single
+    SQLite database in WAL mode. The urls to visit, the visited
+    urls, the seen urls, the url distribution and the items have
+    their own indexed tables so that they can be queried and
+    updated without reading the whole state. The connection
+    lives in a dedicated thread and every save is done in
+    one single transaction
+
+    >>> STORAGES = {
+    ...     'default': 'kryptone.data_storages.SQLiteStorage'
+    ... }
+    """
+
+    file_based = True
+    schema = [
+        'create table if not exists frontier (url text primary key, position integer not null) without rowid',
+        'create index if not exists frontier_position on frontier (position)',
+        'create table if not exists visited (url text primary key) without rowid',
+        'create table if not exists seen (url text primary key) without rowid',
+        'create table if not exists url_distribution (page text not null, url text not null, primary key (page, url)) without rowid',
+        'create table if not exists items (id integer primary key autoincrement, name text not null, data text not null)',
+        'create index if not exists items_name on items (name)',
+        'create table if not exists metadata (key text primary key, value text not null) without rowid'
+    ]
+
+    def __init__(self, *, spider: Optional[_SiteCrawler] = None, storage_path: Optional[pathlib.Path | str] = None):
+        super().__init__(spider=spider)
+        storage_path = pathlib.Path(storage_path or settings.MEDIA_PATH)
+        if not storage_path.is_dir():
+            raise ValueError(f"Storage should be a folder. Got: {storage_path}")
+
+        self.storage_path = storage_path.joinpath(settings.SQLITE_DATABASE_NAME)
+        self.storage_connection: Optional[sqlite3.Connection] = None
+        # sqlite3 connections can only be used in the
+        # thread that created them which is why all the
+        # queries are run by a single worker
+        self.executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='kryptone-sqlite'
+        )
+        self.executor.submit(self.initialize).result()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.storage_path}>'
+
+    def initialize(self):
+        try:
+            self.storage_connection = sqlite3.connect(self.storage_path)
+            self.storage_connection.create_function(
+                'regexp', 2, self.regexp, deterministic=True
+            )
+            self.storage_connection.execute('pragma journal_mode=wal')
+            self.storage_connection.execute('pragma synchronous=normal')
+            with self.storage_connection:
+                for statement in self.schema:
+                    self.storage_connection.execute(statement)
+        except sqlite3.Error:
+            message = self.connection_error.format(
+                storage_name=self.__class__.__name__)
+            logger.critical(color_text('red', message))
+        else:
+            self.is_connected = True
+        return self.is_connected
+
+    @staticmethod
+    def regexp(pattern, value):
+        if value is None:
+            return False
+        return re.search(pattern, value) is not None
+
+    @property
+    def cache_key(self):
+        return f'{settings.CACHE_FILE_NAME}.json'
+
+    @staticmethod
+    def is_records(data: Any):
+        return (
+            isinstance(data, (list, tuple)) and
+            len(data) > 0 and
+            all(isinstance(item, dict) or dataclasses.is_dataclass(item) for item in data)
+        )
+
+    @staticmethod
+    def flatten_urls(urls: Any) -> list[str]:
+        # Rows coming from csv files
+        # are lists that contain one url
+        return [
+            str(url[0]) if isinstance(url, (list, tuple)) else str(url)
+            for url in urls
+        ]
+
+    async def run(self, func, *args):
+        """Runs the function in the thread of the connection"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _get_metadata(self, key: str):
+        rows = self.storage_connection.execute(
+            'select value from metadata where key=?', (key,)
+        ).fetchall()
+        if not rows:
+            return None
+        return json.loads(rows[0][0])
+
+    def _set_metadata(self, key: str, data: Any):
+        self.storage_connection.execute(
+            'insert into metadata (key, value) values (?, ?) on conflict (key) do update set value=excluded.value',
+            (key, json.dumps(data, cls=DefaultJsonEncoder))
+        )
+
+    def _touch(self, key: str):
+        # The modification time of the database file is not
+        # reliable in WAL mode since the writes go to the
+        # -wal file first which is why it is kept per key
+        self._set_metadata(f'updated_at:{key}', time.time())
+
+    def _save_cache(self, data: dict[str, Any]):
+        urls_to_visit = self.flatten_urls(data.get('urls_to_visit', []))
+        visited_urls = self.flatten_urls(data.get('visited_urls', []))
+        extra = {
+            key: value for key, value in data.items()
+            if key not in ('urls_to_visit', 'visited_urls')
+        }
+
+        connection = self.storage_connection
+        with connection:
+            self._set_metadata(self.cache_key, extra)
+            self._touch(self.cache_key)
+            connection.executemany(
+                'insert or ignore into visited (url) values (?)',
+                ((url,) for url in visited_urls)
+            )
+
+            # The cache is a snapshot of the urls to visit: the urls
+            # that are already in the frontier keep their position
+            # so that a reordered frontier is preserved
+            connection.execute('create temp table if not exists snapshot (url text primary key, position integer)')
+            connection.execute('delete from snapshot')
+            connection.executemany(
+                'insert or ignore into snapshot (url, position) values (?, ?)',
+                ((url, i) for i, url in enumerate(urls_to_visit))
+            )
+            connection.execute('delete from frontier where url not in (select url from snapshot)')
+            offset = connection.execute('select coalesce(max(position), -1) + 1 from frontier').fetchone()[0]
+            connection.execute(
+                'insert or ignore into frontier (url, position) select url, position + ? from snapshot',
+                (offset,)
+            )
+
+    def _get_cache(self):
+        data = self._get_metadata(self.cache_key) or {}
+        data['urls_to_visit'] = [
+            row[0] for row in self.storage_connection.execute('select url from frontier order by position')
+        ]
+        data['visited_urls'] = [
+            row[0] for row in self.storage_connection.execute('select url from visited')
+        ]
+        return data
+
+    def _save(self, key: str, data: Any):
+        connection = self.storage_connection
+
+        if key == self.cache_key:
+            self._save_cache(data)
+        elif key == 'seen_urls.csv':
+            with connection:
+                self._touch(key)
+                connection.executemany(
+                    'insert or ignore into seen (url) values (?)',
+                    ((url,) for url in self.flatten_urls(data))
+                )
+        elif key == 'url_distribution.json':
+            with connection:
+                self._touch(key)
+                connection.executemany(
+                    'insert or ignore into url_distribution (page, url) values (?, ?)',
+                    (
+                        (str(page), str(url))
+                        for page, urls in data.items()
+                        for url in urls
+                    )
+                )
+        elif self.is_records(data):
+            items = [
+                dataclasses.asdict(item) if dataclasses.is_dataclass(item) else item
+                for item in data
+            ]
+            with connection:
+                self._touch(key)
+                connection.execute('delete from items where name=?', (key,))
+                connection.executemany(
+                    'insert into items (name, data) values (?, ?)',
+                    ((key, json.dumps(item, cls=DefaultJsonEncoder)) for item in items)
+                )
+        else:
+            with connection:
+                self._set_metadata(key, data)
+                self._touch(key)
+        return True
+
+    def _get(self, key: str):
+        connection = self.storage_connection
+
+        if key == self.cache_key:
+            return self._get_cache()
+        elif key == 'seen_urls.csv':
+            return [row[0] for row in connection.execute('select url from seen')]
+        elif key == 'url_distribution.json':
+            data = {}
+            for page, url in connection.execute('select page, url from url_distribution'):
+                data.setdefault(page, []).append(url)
+            return data
+
+        rows = connection.execute(
+            'select data from items where name=? order by id', (key,)
+        ).fetchall()
+        if rows:
+            return [json.loads(row[0]) for row in rows]
+        return self._get_metadata(key)
+
+    def _has(self, key: str):
+        connection = self.storage_connection
+
+        if key == self.cache_key:
+            queries = [
+                ('select 1 from metadata where key=?', (key,)),
+                ('select 1 from frontier limit 1', ())
+            ]
+        elif key == 'seen_urls.csv':
+            queries = [('select 1 from seen limit 1', ())]
+        elif key == 'url_distribution.json':
+            queries = [('select 1 from url_distribution limit 1', ())]
+        else:
+            queries = [
+                ('select 1 from items where name=? limit 1', (key,)),
+                ('select 1 from metadata where key=?', (key,))
+            ]
+
+        for sql, parameters in queries:
+            if connection.execute(sql, parameters).fetchone() is not None:
+                return True
+        return False
+
+    async def has(self, key: str) -> bool:
+        return await self.run(self._has, key)
+
+    async def get(self, key: str) -> Any:
+        return await self.run(self._get, key)
+
+    async def save(self, key: str, data: Any, adapt_list: bool = False, **kwargs):
+        return await self.run(self._save, key, self.before_save(data))
+
+    async def save_or_create(self, key: str, data: Any, **kwargs):
+        return await self.save(key, data, **kwargs)
+
+    async def get_modified_time(self, key: str) -> Optional[float]:
+        return await self.run(self._get_metadata, f'updated_at:{key}')
+
+    def _add_items(self, name: str, items: list[Any]):
+        with self.storage_connection:
+            self._touch(name)
+            self.storage_connection.executemany(
+                'insert into items (name, data) values (?, ?)',
+                (
+                    (name, json.dumps(dataclasses.asdict(item) if dataclasses.is_dataclass(item) else item, cls=DefaultJsonEncoder))
+                    for item in items
+                )
+            )
+
+    async def add_items(self, name: str, items: list[Any]):
+        """Appends the items to the items that
+        were already saved under the given name"""
+        return await self.run(self._add_items, name, items)
+
+    def _get_urls_to_visit(self, pattern: Optional[str] = None):
+        if pattern is None:
+            sql, parameters = 'select url from frontier order by position', ()
+        else:
+            sql = 'select url from frontier where url regexp ? order by position'
+            parameters = (pattern,)
+        return [row[0] for row in self.storage_connection.execute(sql, parameters)]
+
+    async def get_urls_to_visit(self, pattern: Optional[str] = None) -> list[str]:
+        """Returns the urls to visit in their order of
+        visit, optionally filtered by a regex pattern"""
+        return await self.run(self._get_urls_to_visit, pattern)
+
+    def _filter_urls_to_visit(self, value: str):
+        with self.storage_connection:
+            self._touch(self.cache_key)
+            self.storage_connection.execute(
+                'insert or ignore into visited (url) select url from frontier where instr(url, ?) > 0',
+                (value,)
+            )
+            cursor = self.storage_connection.execute(
+                'delete from frontier where instr(url, ?) > 0',
+                (value,)
+            )
+        return cursor.rowcount
+
+    async def filter_urls_to_visit(self, value: str) -> int:
+        """Moves the urls to visit that contain the value
+        to the visited urls and returns their count"""
+        return await self.run(self._filter_urls_to_visit, value)
+
+    def _reorder_urls_to_visit(self, pattern: str):
+        with self.storage_connection:
+            self._touch(self.cache_key)
+            # Moving the matching urls before the first url
+            # keeps their relative order in the frontier
+            cursor = self.storage_connection.execute(
+                'update frontier set position = position - (select max(position) - min(position) + 1 from frontier) where url regexp ?',
+                (pattern,)
+            )
+        return cursor.rowcount
+
+    async def reorder_urls_to_visit(self, pattern: str) -> int:
+        """Moves the urls to visit that match the regex
+        pattern to the top of the urls to visit"""
+        return await self.run(self._reorder_urls_to_visit, pattern)
+
+    def close(self):
+        def close_connection():
+            if self.storage_connection is not None:
+                self.storage_connection.close()
+                self.storage_connection = None
+
+        self.executor.submit(close_connection).result()
+        self.executor.shutdown(wait=True)
+        self.is_connected = False
+
+
 class RedisStorage(BaseStorage):
     """A storage backend that implements basic storage
     functionnalities in addition of more advanced features
     in order to run complexe spider operations on Redis"""
 
-    storage_class = redis.Redis
+    storage_class = None
 
     def __init__(self, *, spider=None):
         super().__init__(spider=spider)
-        self.storage_connection = self.storage_class(
+        self.storage_connection = self.get_storage_class()(
             host=settings.STORAGE_REDIS_HOST,
             port=settings.STORAGE_REDIS_PORT,
             username=getattr(settings, 'STORAGE_REDIS_USERNAME'),
@@ -234,6 +694,15 @@ class RedisStorage(BaseStorage):
         )
         self.initialize()
 
+    def get_storage_class(self):
+        # The client is only imported when the
+        # storage is used in order to keep the
+        # import of the module fast
+        if self.storage_class is None:
+            import redis
+            return redis.Redis
+        return self.storage_class
+
     def initialize(self):
         try:
             self.storage_connection.ping()
@@ -309,13 +778,19 @@ class RedisStorage(BaseStorage):
 
 
 class AirtableStorage(BaseStorage):
-    storage_class = pyairtable.Api
+    storage_class = None
 
     def __init__(self):
         super().__init__()
-        self.storage_connection = self.storage_class(
+        self.storage_connection = self.get_storage_class()(
             settings.STORAGE_AIRTABLE_API_KEY)
 
+    def get_storage_class(self):
+        if self.storage_class is None:
+            import pyairtable
+            return pyairtable.Api
+        return self.storage_class
+
 
 # class ApiStorage(BaseStorage):
 #     """A storage that uses GET/POST requests in order
@@ -661,6 +1136,8 @@ class GoogleSheetStorage(BaseStorage):
     def __init__(self, spider=None):
         super().__init__(spider=spider)
 
+        import gspread
+
         path = pathlib.Path(settings.STORAGE_GOOGLE_SHEET_CREDENTIALS)
         with open(path, mode='r', encoding='utf-8') as f:
             credentials = json.load(f)
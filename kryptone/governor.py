@@ -0,0 +1,209 @@
+import dataclasses
+import threading
+import time
+from typing import Optional, Union
+
+from kryptone.conf import settings
+from kryptone.utils.urls import URL
+
+# Status codes that indicate that the
+# server is asking us to slow down
+THROTTLING_STATUS_CODES = {429, 503}
+
+
+@dataclasses.dataclass
+class HostState:
+    host: str
+    delay: float
+    concurrency: int = 1
+    in_flight: int = 0
+    latency: Optional[float] = None
+    requests_count: int = 0
+    errors_count: int = 0
+    throttled_count: int = 0
+    consecutive_successes: int = 0
+    next_request_time: float = 0
+    crawl_delay: Optional[float] = None
+
+    @property
+    def error_rate(self):
+        if self.requests_count == 0:
+            return 0
+        return round(self.errors_count / self.requests_count, 3)
+
+    def json(self):
+        return {
+            'delay': round(self.delay, 3),
+            'crawl_delay': self.crawl_delay,
+            'concurrency': self.concurrency,
+            'latency': None if self.latency is None else round(self.latency, 3),
+            'requests_count': self.requests_count,
+            'errors_count': self.errors_count,
+            'throttled_count': self.throttled_count,
+            'error_rate': self.error_rate
+        }
+
+
+class RateGovernor:
+    """Adapts the delay between two requests and the number of
+    concurrent requests for each host using an AIMD strategy:
+    healthy responses decrease the delay additively while errors,
+    slow responses and 429/503 responses multiply it. The delay
+    and the concurrency are kept within the given bounds
+
+    >>> governor = RateGovernor(initial_delay=5, min_delay=1, max_delay=60)
+    ... governor.record_request('http://example.com')
+    ... governor.record_response('http://example.com', latency=0.4)
+    ... governor.get_delay('http://example.com')
+    ... 4.5
+    """
+
+    def __init__(self, *, initial_delay: float = 25, min_delay: float = 1, max_delay: float = 120, initial_concurrency: int = 1, max_concurrency: int = 4, latency_threshold: float = 10, additive_step: float = 0.5, multiplicative_factor: float = 2, successes_before_increase: int = 10, smoothing: float = 0.3):
+        self.min_delay = min_delay
+        self.max_delay = max(max_delay, min_delay)
+        self.initial_delay = min(max(initial_delay, self.min_delay), self.max_delay)
+        self.max_concurrency = max(1, max_concurrency)
+        self.initial_concurrency = min(max(1, initial_concurrency), self.max_concurrency)
+        self.latency_threshold = latency_threshold
+        self.additive_step = additive_step
+        self.multiplicative_factor = multiplicative_factor
+        self.successes_before_increase = successes_before_increase
+        self.smoothing = smoothing
+        self.hosts: dict[str, HostState] = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.hosts)} host(s)>'
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            initial_delay=settings.WAIT_TIME,
+            min_delay=settings.RATE_GOVERNOR_MIN_DELAY,
+            max_delay=settings.RATE_GOVERNOR_MAX_DELAY,
+            initial_concurrency=settings.RATE_GOVERNOR_INITIAL_CONCURRENCY or 1,
+            max_concurrency=settings.RATE_GOVERNOR_MAX_CONCURRENCY,
+            latency_threshold=settings.RATE_GOVERNOR_LATENCY_THRESHOLD
+        )
+
+    @staticmethod
+    def get_host(url: Union[str, URL]) -> str:
+        if not isinstance(url, URL):
+            url = URL(url)
+        return url.url_object.netloc
+
+    def get_state(self, url: Union[str, URL]) -> HostState:
+        host = self.get_host(url)
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostState(
+                host,
+                delay=self.initial_delay,
+                concurrency=self.initial_concurrency
+            )
+            self.hosts[host] = state
+        return state
+
+    def get_delay(self, url: Union[str, URL]) -> float:
+        """Returns the current delay between two
+        requests for the host of the url"""
+        return self.get_state(url).delay
+
+    def get_wait_time(self, url: Union[str, URL]) -> float:
+        """Returns the number of seconds to wait before
+        a new request can be sent to the host of the url"""
+        with self.lock:
+            state = self.get_state(url)
+            return max(0, state.next_request_time - time.monotonic())
+
+    def get_concurrency(self, url: Union[str, URL]) -> int:
+        """Returns the number of pages of the host of
+        the url that can be loaded in the same batch"""
+        with self.lock:
+            return self.get_state(url).concurrency
+
+    def record_request(self, url: Union[str, URL]):
+        with self.lock:
+            state = self.get_state(url)
+            state.in_flight = state.in_flight + 1
+            state.requests_count = state.requests_count + 1
+            return state
+
+    def get_delay_bounds(self, state: HostState) -> tuple[float, float]:
+        # The Crawl-delay of the robots.txt file is
+        # the lowest delay allowed for the host
+        if state.crawl_delay is None:
+            return self.min_delay, self.max_delay
+        min_delay = max(self.min_delay, state.crawl_delay)
+        return min_delay, max(self.max_delay, min_delay)
+
+    def set_crawl_delay(self, url: Union[str, URL], crawl_delay: Optional[float]):
+        """Sets the delay requested by the robots.txt
+        file of the host of the url"""
+        with self.lock:
+            state = self.get_state(url)
+            state.crawl_delay = crawl_delay
+            min_delay, max_delay = self.get_delay_bounds(state)
+            state.delay = min(max(state.delay, min_delay), max_delay)
+            return state
+
+    def decrease(self, state: HostState):
+        min_delay, max_delay = self.get_delay_bounds(state)
+        state.delay = min(
+            max_delay,
+            max(state.delay, min_delay) * self.multiplicative_factor
+        )
+        state.concurrency = max(1, state.concurrency // 2)
+        state.consecutive_successes = 0
+
+    def increase(self, state: HostState):
+        min_delay, _ = self.get_delay_bounds(state)
+        state.delay = max(min_delay, state.delay - self.additive_step)
+        state.consecutive_successes = state.consecutive_successes + 1
+        if state.consecutive_successes >= self.successes_before_increase:
+            state.concurrency = min(self.max_concurrency, state.concurrency + 1)
+            state.consecutive_successes = 0
+
+    def record_response(self, url: Union[str, URL], latency: float, status_code: Optional[int] = None, error: bool = False, retry_after: Optional[float] = None):
+        """Records the outcome of a request and adapts the
+        delay and the concurrency of the host"""
+        with self.lock:
+            state = self.get_state(url)
+            state.in_flight = max(0, state.in_flight - 1)
+
+            if state.latency is None:
+                state.latency = latency
+            else:
+                state.latency = (
+                    self.smoothing * latency +
+                    (1 - self.smoothing) * state.latency
+                )
+
+            is_throttled = status_code in THROTTLING_STATUS_CODES
+            is_error = error or (status_code is not None and status_code >= 500)
+
+            if is_throttled:
+                state.throttled_count = state.throttled_count + 1
+            if is_error:
+                state.errors_count = state.errors_count + 1
+
+            if is_throttled or is_error or state.latency > self.latency_threshold:
+                self.decrease(state)
+            else:
+                self.increase(state)
+
+            delay = state.delay
+            if retry_after is not None:
+                _, max_delay = self.get_delay_bounds(state)
+                delay = min(max_delay, max(delay, retry_after))
+            state.next_request_time = time.monotonic() + delay
+            return state
+
+    def statistics(self):
+        """Returns the state of each host which
+        can be added to the crawl metrics"""
+        with self.lock:
+            return {
+                host: state.json()
+                for host, state in self.hosts.items()
+            }
@@ -0,0 +1,365 @@
+import dataclasses
+import random
+import threading
+import time
+from typing import Any, Iterable, Optional, Union
+from urllib.parse import urlparse
+
+import requests
+
+from kryptone import logger
+from kryptone.conf import settings
+from kryptone.utils.randomizers import load_user_agents
+
+# Status codes returned by websites that
+# block the address of the proxy
+BAN_STATUS_CODES = [403, 407, 429]
+
+
+@dataclasses.dataclass
+class ProxyState:
+    address: str
+    weight: float = 1
+    requests_count: int = 0
+    errors_count: int = 0
+    bans_count: int = 0
+    consecutive_errors: int = 0
+    consecutive_ban_responses: int = 0
+    latency: Optional[float] = None
+    banned_until: float = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.address}>'
+
+    @property
+    def url(self):
+        if '://' in self.address:
+            return self.address
+        return f'http://{self.address}'
+
+    @property
+    def is_banned(self):
+        return time.monotonic() < self.banned_until
+
+    @property
+    def error_rate(self):
+        if self.requests_count == 0:
+            return 0
+        return round(self.errors_count / self.requests_count, 3)
+
+    @property
+    def score(self):
+        """The weight used to choose the proxy which decreases
+        with the error rate and the latency of the proxy"""
+        success_rate = (self.requests_count - self.errors_count + 1) / (self.requests_count + 2)
+        return self.weight * success_rate / (1 + (self.latency or 0))
+
+    def json(self):
+        return {
+            'weight': self.weight,
+            'latency': None if self.latency is None else round(self.latency, 3),
+            'requests_count': self.requests_count,
+            'errors_count': self.errors_count,
+            'bans_count': self.bans_count,
+            'error_rate': self.error_rate,
+            'is_banned': self.is_banned
+        }
+
+
+class ProxyPool:
+    """A pool of proxies that tracks the latency, the errors and
+    the bans of each proxy. Proxies are chosen randomly using a
+    weight that decreases with their error rate and their latency.
+    A proxy that fails `max_errors` times in a row or that returns
+    a ban status code `max_ban_responses` times in a row is not
+    used for `ban_time` seconds. A single 403 or 429 is often
+    specific to one page which is why it does not ban the proxy
+
+    >>> pool = ProxyPool(['192.168.0.1:8080', {'address': '192.168.0.2:8080', 'weight': 2}])
+    ... proxy = pool.choose()
+    ... pool.record_response(proxy, latency=0.4)
+    """
+
+    def __init__(self, proxies: Iterable[Union[str, dict[str, Any]]] = [], *, max_errors: int = 3, max_ban_responses: int = 3, ban_time: float = 300, ban_status_codes: Iterable[int] = BAN_STATUS_CODES, smoothing: float = 0.3):
+        self.max_errors = max(1, max_errors)
+        self.max_ban_responses = max(1, max_ban_responses)
+        self.ban_time = ban_time
+        self.ban_status_codes = set(ban_status_codes)
+        self.smoothing = smoothing
+        self.proxies: dict[str, ProxyState] = {}
+        self.lock = threading.Lock()
+
+        for proxy in proxies:
+            if isinstance(proxy, str):
+                proxy = {'address': proxy}
+            state = ProxyState(**proxy)
+            self.proxies[state.address] = state
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.proxies)} proxies>'
+
+    def __len__(self):
+        return len(self.proxies)
+
+    def __contains__(self, address: str):
+        return address in self.proxies
+
+    @classmethod
+    def from_settings(cls):
+        proxies = list(settings.PROXIES)
+        if not proxies and settings.PROXY_IP_ADDRESS is not None:
+            proxies = [settings.PROXY_IP_ADDRESS]
+
+        return cls(
+            proxies,
+            max_errors=settings.PROXY_MAX_ERRORS,
+            max_ban_responses=settings.PROXY_MAX_BAN_RESPONSES,
+            ban_time=settings.PROXY_BAN_TIME
+        )
+
+    def is_usable(self, address: str) -> bool:
+        state = self.proxies.get(address)
+        return state is not None and not state.is_banned
+
+    def has_usable(self, exclude: Iterable[str] = []) -> bool:
+        """Returns True when a proxy that is not
+        banned and not excluded can be used"""
+        exclude = set(exclude)
+        return any(
+            not state.is_banned and state.address not in exclude
+            for state in self.proxies.values()
+        )
+
+    def choose(self, exclude: Iterable[str] = []) -> Optional[ProxyState]:
+        """Chooses a proxy that is not banned. When all the proxies
+        are banned, the one whose ban ends first is used so that
+        the crawl never stops waiting for a proxy"""
+        if not self.proxies:
+            return None
+
+        exclude = set(exclude)
+        with self.lock:
+            candidates = [
+                state for state in self.proxies.values()
+                if not state.is_banned and state.address not in exclude
+            ]
+            if not candidates:
+                candidates = [
+                    state for state in self.proxies.values()
+                    if not state.is_banned
+                ]
+
+            if not candidates:
+                state = min(self.proxies.values(), key=lambda x: x.banned_until)
+                logger.warning(f'All the proxies are banned. Using {state.address}')
+                return state
+
+            weights = [state.score for state in candidates]
+            return random.choices(candidates, weights=weights)[0]
+
+    def ban(self, address: str, ban_time: Optional[float] = None):
+        state = self.proxies.get(address)
+        if state is None:
+            return
+
+        state.bans_count = state.bans_count + 1
+        state.banned_until = time.monotonic() + (ban_time or self.ban_time)
+        state.consecutive_errors = 0
+        state.consecutive_ban_responses = 0
+        logger.warning(f'Proxy {address} banned for {ban_time or self.ban_time}s')
+
+    def record_response(self, address: str, latency: Optional[float] = None, status_code: Optional[int] = None, error: bool = False):
+        """Records the result of a request sent through the
+        proxy. `error` is used for connection errors and
+        timeouts for which there is no status code"""
+        with self.lock:
+            state = self.proxies.get(address)
+            if state is None:
+                return
+
+            state.requests_count = state.requests_count + 1
+            if latency is not None:
+                if state.latency is None:
+                    state.latency = latency
+                else:
+                    state.latency = (
+                        self.smoothing * latency +
+                        (1 - self.smoothing) * state.latency
+                    )
+
+            if status_code in self.ban_status_codes:
+                state.errors_count = state.errors_count + 1
+                state.consecutive_ban_responses = state.consecutive_ban_responses + 1
+                if state.consecutive_ban_responses >= self.max_ban_responses:
+                    self.ban(address)
+            elif error or (status_code is not None and status_code >= 500):
+                state.errors_count = state.errors_count + 1
+                state.consecutive_errors = state.consecutive_errors + 1
+                if state.consecutive_errors >= self.max_errors:
+                    self.ban(address)
+            else:
+                state.consecutive_errors = 0
+                state.consecutive_ban_responses = 0
+
+    def statistics(self):
+        return {
+            address: state.json()
+            for address, state in self.proxies.items()
+        }
+
+
+@dataclasses.dataclass
+class Identity:
+    """The user agent and the proxy used by
+    a browser or by the HTTP requests"""
+
+    user_agent: str
+    proxy: Optional[str] = None
+    key: Optional[str] = None
+
+    @property
+    def headers(self):
+        return {'User-Agent': self.user_agent}
+
+    @property
+    def proxies(self):
+        """The proxies in the format expected by requests"""
+        if self.proxy is None:
+            return None
+
+        url = self.proxy if '://' in self.proxy else f'http://{self.proxy}'
+        return {'http': url, 'https': url}
+
+
+class IdentityPool:
+    """Assigns a user agent and a proxy to the browsers and
+    to the HTTP requests. With `sticky`, the same identity
+    is returned for a given key (e.g. a domain) until its
+    proxy is banned
+
+    >>> pool = IdentityPool.from_settings()
+    ... identity = pool.get('example.com')
+    ... response = pool.fetch('http://example.com')
+    """
+
+    def __init__(self, user_agents: Optional[Iterable[str]] = None, proxy_pool: Optional[ProxyPool] = None, sticky: bool = True):
+        self.user_agents = tuple(user_agents or load_user_agents())
+        self.proxy_pool = proxy_pool or ProxyPool()
+        self.sticky = sticky
+        self.identities: dict[str, Identity] = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.identities)} identities>'
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            user_agents=settings.USER_AGENTS or None,
+            proxy_pool=ProxyPool.from_settings(),
+            sticky=settings.STICKY_IDENTITIES
+        )
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        return urlparse(str(url)).netloc
+
+    def create(self, key: Optional[str] = None) -> Identity:
+        proxy = self.proxy_pool.choose()
+        return Identity(
+            user_agent=random.choice(self.user_agents),
+            proxy=None if proxy is None else proxy.address,
+            key=key
+        )
+
+    def is_usable(self, identity: Optional[Identity]) -> bool:
+        if identity is None or identity.proxy is None:
+            return True
+        return self.proxy_pool.is_usable(identity.proxy)
+
+    def can_replace(self, identity: Optional[Identity]) -> bool:
+        """Returns True when the proxy of the identity is banned
+        and another proxy can be used instead. When all the
+        proxies are banned, replacing the identity is useless"""
+        if self.is_usable(identity):
+            return False
+        return self.proxy_pool.has_usable(exclude=[identity.proxy])
+
+    def get(self, key: Optional[str] = None) -> Identity:
+        """Returns the identity assigned to the key or a new
+        identity when the key is None, when the identities are
+        not sticky or when the proxy of the identity is banned"""
+        if key is None or not self.sticky:
+            return self.create(key)
+
+        with self.lock:
+            identity = self.identities.get(key)
+            if identity is None or not self.is_usable(identity):
+                identity = self.create(key)
+                self.identities[key] = identity
+            return identity
+
+    def rotate(self, key: str) -> Identity:
+        """Replaces the identity assigned to the key"""
+        with self.lock:
+            self.identities.pop(key, None)
+        return self.get(key)
+
+    def record_response(self, identity: Optional[Identity], latency: Optional[float] = None, status_code: Optional[int] = None, error: bool = False):
+        if identity is None or identity.proxy is None:
+            return
+        self.proxy_pool.record_response(
+            identity.proxy,
+            latency=latency,
+            status_code=status_code,
+            error=error
+        )
+
+    def fetch(self, url: str, method: str = 'GET', identity: Optional[Identity] = None, session: Optional[requests.Session] = None, record: bool = True, **kwargs) -> requests.Response:
+        """Sends a request using the identity assigned to the
+        domain of the url and records the result on the proxy.
+        A session can be given in order to reuse the connections.
+        With `record=False`, the health of the proxy is left
+        untouched e.g. for requests to third-party websites"""
+        if identity is None:
+            identity = self.get(self.get_key(url))
+
+        headers = {**identity.headers, **kwargs.pop('headers', {})}
+        start_time = time.monotonic()
+
+        try:
+            response = (session or requests).request(
+                method,
+                str(url),
+                headers=headers,
+                proxies=identity.proxies,
+                **kwargs
+            )
+        except (requests.exceptions.ProxyError, requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if record:
+                self.record_response(identity, error=True)
+            raise
+
+        if record:
+            self.record_response(
+                identity,
+                latency=time.monotonic() - start_time,
+                status_code=response.status_code
+            )
+        return response
+
+    def statistics(self):
+        return {
+            'identities_count': len(self.identities),
+            'proxies': self.proxy_pool.statistics()
+        }
+
+
+_identity_pool: Optional[IdentityPool] = None
+
+
+def get_identity_pool() -> IdentityPool:
+    global _identity_pool
+    if _identity_pool is None:
+        _identity_pool = IdentityPool.from_settings()
+    return _identity_pool
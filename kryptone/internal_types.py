@@ -22,6 +22,7 @@ class PerformanceAuditProtocol(Protocol):
     duration: int
     count_urls_to_visit: int
     count_visited_urls: int
+    hosts: dict[str, dict[str, Any]]
     def calculate_duration(self) -> None: ...
     def add_error_count(self) -> None: ...
     def add_iteration_count(self) -> None: ...
@@ -38,6 +39,8 @@ class FileProtocol(Protocol):
     @property
     def is_csv(self) -> bool: ...
     @property
+    def is_parquet(self) -> bool: ...
+    @property
     def is_image(self) -> bool: ...
 
     async def read(self) -> dict[str,
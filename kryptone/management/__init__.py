@@ -40,25 +40,48 @@ def collect_commands():
 class Utility:
     """
     This is the main class that encapsulates the logic
-    for creating and using the command parser
+    for creating and using the command parser. The commands
+    are only imported when they are called
     """
-    commands_registry: OrderedDict[str, 'BaseCommand'] = OrderedDict()
 
     def __init__(self):
-        modules_paths = collect_commands()
+        self.commands_registry: OrderedDict[str, 'BaseCommand'] = OrderedDict()
+        self.commands_paths: OrderedDict[str, str] = OrderedDict()
 
-        for path in modules_paths:
+        for path in collect_commands():
             module_name = basename(path)
-            true_name, _ = module_name.split('.')
-            try:
-                module_obj = import_module(
-                    f'kryptone.management.commands.{true_name}')
-            except Exception as e:
-                raise ImportError(
-                    "Could not import module "
-                    f"at {path}. {e.args[0]}"
-                )
-            self.commands_registry[true_name] = module_obj.Command()
+            true_name, extension = os.path.splitext(module_name)
+            if extension != '.py' or true_name.startswith('_'):
+                continue
+            self.commands_paths[true_name] = path
+
+    @property
+    def command_names(self):
+        return list(self.commands_paths.keys() | self.commands_registry.keys())
+
+    def load_command(self, name: str) -> Optional['BaseCommand']:
+        """Imports the module of the command and returns
+        a new instance of the command"""
+        try:
+            return self.commands_registry[name]
+        except KeyError:
+            pass
+
+        path = self.commands_paths.get(name)
+        if path is None:
+            return None
+
+        try:
+            module_obj = import_module(f'kryptone.management.commands.{name}')
+        except Exception as e:
+            raise ImportError(
+                "Could not import module "
+                f"at {path}. {e.args[0]}"
+            )
+
+        instance = module_obj.Command()
+        self.commands_registry[name] = instance
+        return instance
 
     def _parse_incoming_commands(self, args: list[str]):
         if len(args) <= 1:
@@ -71,7 +94,7 @@ class Utility:
         return name, remaining_tokens
 
     def _find_similar_command(self, name):
-        command_names = self.commands_registry.keys()
+        command_names = self.command_names
         commands = list(filter(lambda x: name in x, command_names))
         return ' or '.join(commands)
 
@@ -85,7 +108,7 @@ class Utility:
             return
 
         command_name = tokens.pop(0)
-        command_instance = self.commands_registry.get(command_name, None)
+        command_instance = self.load_command(command_name)
         if command_instance is None:
             message = (
                 f"Command '{command_name}' does not exist. "
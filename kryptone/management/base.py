@@ -2,6 +2,9 @@ from argparse import ArgumentParser, Namespace
 from collections import OrderedDict
 from typing import Optional
 
+from kryptone.conf import settings
+from kryptone.utils.module_loaders import import_from_module
+
 
 class BaseCommand:
     """
@@ -48,3 +51,9 @@ class BaseCommand:
 
 class ProjectCommand(BaseCommand):
     requires_system_checks = True
+
+    def get_storage_class(self):
+        """Returns the class of the default storage of the
+        project which determines where the data of the
+        spider is read from (SQLite, Parquet or JSON)"""
+        return import_from_module(settings.STORAGES['default'])
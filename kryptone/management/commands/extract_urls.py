@@ -1,11 +1,16 @@
+import pathlib
+
 import pandas
+from asgiref.sync import async_to_sync
 
 import kryptone
 from kryptone import logger
 from kryptone.checks.core import checks_registry
 from kryptone.conf import settings
+from kryptone.data_storages import ParquetStorage, SQLiteStorage
 from kryptone.management.base import ProjectCommand
-from kryptone.utils.file_readers import read_json_document
+from kryptone.utils.columnar import iter_parquet_values
+from kryptone.utils.file_readers import get_media_folder, read_json_document
 from kryptone.utils.urls import URLIgnoreTest
 from kryptone.utils.functions import create_filename
 
@@ -23,8 +28,20 @@ class Command(ProjectCommand):
         kryptone.setup()
         checks_registry.run()
 
-        data = read_json_document('cache.json')
-        urls_to_visit = data['urls_to_visit']
+        storage_class = self.get_storage_class()
+        if issubclass(storage_class, SQLiteStorage):
+            database_path = pathlib.Path(get_media_folder(settings.SQLITE_DATABASE_NAME))
+            storage = SQLiteStorage(storage_path=database_path.parent)
+            urls_to_visit = async_to_sync(storage.get_urls_to_visit)()
+            storage.close()
+        elif issubclass(storage_class, ParquetStorage):
+            # Only the urls to visit are read
+            # from the memory mapped file
+            path = pathlib.Path(get_media_folder('cache.parquet'))
+            urls_to_visit = list(iter_parquet_values(path, 'urls_to_visit'))
+        else:
+            data = read_json_document('cache.json')
+            urls_to_visit = data['urls_to_visit']
 
         df = pandas.DataFrame({'urls': urls_to_visit})
         instance = URLIgnoreTest('test_urls', paths=namespace.paths)
@@ -1,10 +1,18 @@
+import pathlib
+
 import pandas
+from asgiref.sync import async_to_sync
 
 import kryptone
 from kryptone import logger
 from kryptone.checks.core import checks_registry
+from kryptone.conf import settings
+from kryptone.data_storages import ParquetStorage, SQLiteStorage
 from kryptone.management.base import ProjectCommand
-from kryptone.utils.file_readers import read_json_document, write_json_document
+from kryptone.utils.columnar import (get_pyarrow, read_parquet_table,
+                                     write_parquet_table)
+from kryptone.utils.file_readers import (get_media_folder, read_json_document,
+                                         write_json_document)
 
 
 class Command(ProjectCommand):
@@ -17,10 +25,43 @@ class Command(ProjectCommand):
             help='Pattern to identify the urls that match'
         )
 
+    def filter_parquet_cache(self, path, pattern):
+        """Moves the matching urls to the visited urls
+        directly on the Arrow table of the cache"""
+        get_pyarrow()
+        from pyarrow import compute
+
+        table = read_parquet_table(path)
+        is_invalid = compute.and_(
+            compute.equal(table.column('key'), 'urls_to_visit'),
+            compute.match_substring(table.column('value'), pattern)
+        )
+
+        if compute.any(is_invalid).as_py():
+            keys = compute.if_else(is_invalid, 'visited_urls', table.column('key'))
+            index = table.schema.get_field_index('key')
+            table = table.set_column(index, 'key', keys)
+            write_parquet_table(path, table)
+
     def execute(self, namespace):
         kryptone.setup()
         checks_registry.run()
 
+        storage_class = self.get_storage_class()
+        if issubclass(storage_class, SQLiteStorage):
+            database_path = pathlib.Path(get_media_folder(settings.SQLITE_DATABASE_NAME))
+            storage = SQLiteStorage(storage_path=database_path.parent)
+            count = async_to_sync(storage.filter_urls_to_visit)(namespace.pattern)
+            storage.close()
+            logger.info(f'The cache was successfully filtered: {count} url(s)')
+            return
+
+        if issubclass(storage_class, ParquetStorage):
+            path = pathlib.Path(get_media_folder('cache.parquet'))
+            self.filter_parquet_cache(path, namespace.pattern)
+            logger.info('The cache file was successfully filtered')
+            return
+
         data = read_json_document('cache.json')
         urls_to_visit = data['urls_to_visit']
         visited_urls = data['visited_urls']
@@ -0,0 +1,129 @@
+import subprocess
+import sys
+
+from kryptone import logger
+from kryptone.management.base import BaseCommand
+
+# Modules that are imported when a command
+# is called using "python manage.py"
+DEFAULT_MODULES = [
+    'kryptone.management',
+    'kryptone.base'
+]
+
+# Libraries that are slow to import and that should
+# only be imported by the functions that use them
+HEAVY_MODULES = [
+    'pandas',
+    'redis',
+    'gspread',
+    'pyairtable',
+    'celery',
+    'sklearn',
+    'matplotlib',
+    'kagglehub',
+    'nltk',
+    'pyarrow'
+]
+
+
+def parse_importtime(output):
+    """Parses the output of "python -X importtime" and
+    returns a list of (module, self, cumulative) tuples
+    where the times are in microseconds
+
+    >>> parse_importtime('import time:       120 |        340 | kryptone')
+    ... [('kryptone', 120, 340)]
+    """
+    results = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        values = line.removeprefix('import time:').split('|')
+        if len(values) != 3:
+            continue
+
+        self_time, cumulative_time, name = values
+        try:
+            results.append((
+                name.strip(),
+                int(self_time.strip()),
+                int(cumulative_time.strip())
+            ))
+        except ValueError:
+            # Header line: self [us] | cumulative | imported package
+            continue
+    return results
+
+
+def measure_import_time(*modules):
+    """Imports the modules in a new interpreter and returns
+    the import times of each module that was loaded and the
+    heavy libraries that were imported"""
+    statements = [f'import {module}' for module in modules]
+    statements.append('import sys')
+    statements.append(
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', '; '.join(statements)],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+
+    heavy_modules = [name for name in result.stdout.strip().split(',') if name]
+    return parse_importtime(result.stderr), heavy_modules
+
+
+class Command(BaseCommand):
+    help_text = 'Reports the time spent importing the Kryptone modules'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'modules',
+            nargs='*',
+            default=DEFAULT_MODULES,
+            help='Modules to import e.g. kryptone.base'
+        )
+        parser.add_argument(
+            '-l',
+            '--limit',
+            type=int,
+            default=15,
+            help='Number of slowest modules to show'
+        )
+        parser.add_argument(
+            '-b',
+            '--budget',
+            type=float,
+            default=None,
+            help='Maximum import time in milliseconds'
+        )
+
+    def execute(self, namespace):
+        times, heavy_modules = measure_import_time(*namespace.modules)
+
+        slowest_modules = sorted(times, key=lambda x: x[1], reverse=True)
+        for name, self_time, cumulative_time in slowest_modules[:namespace.limit]:
+            logger.info(
+                f'{name}: {self_time / 1000:.1f}ms '
+                f'(cumulative {cumulative_time / 1000:.1f}ms)'
+            )
+
+        total_time = sum(self_time for _, self_time, _ in times) / 1000
+        logger.info(f'Total import time: {total_time:.1f}ms')
+
+        if heavy_modules:
+            logger.warning(
+                f"Heavy libraries imported at startup: {', '.join(heavy_modules)}"
+            )
+
+        if namespace.budget is not None and total_time > namespace.budget:
+            raise ValueError(
+                f'Import time of {total_time:.1f}ms exceeds '
+                f'the budget of {namespace.budget}ms'
+            )
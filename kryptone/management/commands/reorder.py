@@ -1,12 +1,19 @@
+import pathlib
 import re
 
 import pandas
+from asgiref.sync import async_to_sync
 
 import kryptone
 from kryptone import logger
 from kryptone.checks.core import checks_registry
+from kryptone.conf import settings
+from kryptone.data_storages import ParquetStorage, SQLiteStorage
 from kryptone.management.base import ProjectCommand
-from kryptone.utils.file_readers import read_json_document, write_json_document
+from kryptone.utils.columnar import (get_pyarrow, read_parquet_table,
+                                     write_parquet_table)
+from kryptone.utils.file_readers import (get_media_folder, read_json_document,
+                                         write_json_document)
 
 
 class Command(ProjectCommand):
@@ -19,10 +26,49 @@ class Command(ProjectCommand):
             help='Regex pattern to identify the urls that match'
         )
 
+    def reorder_parquet_cache(self, path, regex_pattern):
+        """Moves the urls to visit that match the pattern
+        to the top of the Arrow table of the cache. The
+        pattern uses the RE2 syntax of Arrow"""
+        pyarrow, _ = get_pyarrow()
+        from pyarrow import compute
+
+        table = read_parquet_table(path)
+        has_match = compute.and_(
+            compute.equal(table.column('key'), 'urls_to_visit'),
+            compute.match_substring_regex(table.column('value'), regex_pattern)
+        )
+        table = pyarrow.concat_tables([
+            table.filter(has_match),
+            table.filter(compute.invert(has_match))
+        ])
+        write_parquet_table(path, table)
+
     def execute(self, namespace):
         kryptone.setup()
         checks_registry.run()
 
+        storage_class = self.get_storage_class()
+        if issubclass(storage_class, SQLiteStorage):
+            database_path = pathlib.Path(get_media_folder(settings.SQLITE_DATABASE_NAME))
+            storage = SQLiteStorage(storage_path=database_path.parent)
+            async_to_sync(storage.reorder_urls_to_visit)(namespace.regex_pattern)
+            storage.close()
+            logger.info(
+                "The urls were reordered sucessfully "
+                f"using: {namespace.regex_pattern}"
+            )
+            return
+
+        if issubclass(storage_class, ParquetStorage):
+            path = pathlib.Path(get_media_folder('cache.parquet'))
+            self.reorder_parquet_cache(path, namespace.regex_pattern)
+            logger.info(
+                "The urls were reordered sucessfully "
+                f"using: {namespace.regex_pattern}"
+            )
+            return
+
         data = read_json_document('cache.json')
         urls_to_visit = data['urls_to_visit']
 
@@ -41,13 +87,13 @@ class Command(ProjectCommand):
 
         valid_urls_list = valid_urls['urls'].values.tolist()
         invalid_urls_list = invalid_urls['urls'].values.tolist()
-        valid_urls_list.extend(invalid_urls)
+        valid_urls_list.extend(invalid_urls_list)
 
         data['urls_to_visit'] = valid_urls_list
 
         if valid_urls_list or invalid_urls_list:
             write_json_document('cache.json', data)
         logger.info(
-            f"The urls were reordered sucessfully "
-            "using: {namespace.regex_pattern}"
+            "The urls were reordered sucessfully "
+            f"using: {namespace.regex_pattern}"
         )
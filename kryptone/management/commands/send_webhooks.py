@@ -1,3 +1,5 @@
+import pathlib
+
 import kryptone
 from kryptone import logger
 from kryptone.management.base import ProjectCommand
@@ -5,7 +7,9 @@ from kryptone.checks.core import checks_registry
 import pandas
 import asyncio
 from kryptone.conf import settings
-from kryptone.utils.file_readers import read_json_document
+from kryptone.data_storages import ParquetStorage
+from kryptone.utils.columnar import read_parquet_document
+from kryptone.utils.file_readers import get_media_folder, read_json_document
 from kryptone.webhooks import Webhooks
 
 
@@ -19,6 +23,10 @@ class Command(ProjectCommand):
         kryptone.setup()
         checks_registry.run()
 
-        data = read_json_document('products.json')
+        if issubclass(self.get_storage_class(), ParquetStorage):
+            path = pathlib.Path(get_media_folder('products.parquet'))
+            data = read_parquet_document(path)
+        else:
+            data = read_json_document('products.json')
         instance = Webhooks(settings.STORAGE_BACKENDS['webhooks'])
         asyncio.run(instance.resolve(data))
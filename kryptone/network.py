@@ -0,0 +1,197 @@
+import base64
+import dataclasses
+import json
+import re
+from collections import deque
+from functools import cached_property
+from typing import Any, Iterable, Iterator, Optional
+
+from kryptone import logger
+
+# Content types that are captured by default
+JSON_CONTENT_TYPES = ['application/json', 'text/json']
+
+
+def iter_network_events(entries: Iterable[dict[str, Any]]) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Iterates over the DevTools events contained in the
+    performance logs returned by `driver.get_log('performance')`
+
+    >>> for method, params in iter_network_events(driver.get_log('performance')):
+    ...     print(method)
+    ... 'Network.requestWillBeSent'
+    """
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        method = message.get('method', '')
+        if method.startswith('Network.'):
+            yield method, message.get('params', {})
+
+
+@dataclasses.dataclass
+class CapturedResponse:
+    """A response received by the browser
+    while loading the current page"""
+
+    url: str
+    status: int
+    mime_type: str
+    resource_type: Optional[str] = None
+    request_id: Optional[str] = None
+    body: Optional[str] = None
+    # Url of the page that was loaded when
+    # the response was received
+    page_url: Optional[str] = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}[{self.status}]: {self.url}>'
+
+    @cached_property
+    def data(self):
+        """The decoded JSON body of the response
+        or None if it is not valid JSON"""
+        if self.body is None:
+            return None
+
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+class NetworkCapture:
+    """Captures the responses received by the browser that match
+    the url patterns and the content types. The responses of the
+    current page are kept in a bounded buffer that can be read
+    in `current_page_actions`
+
+    >>> class MySpider(SiteCrawler):
+    ...     class Meta:
+    ...         network_capture = NetworkCapture(patterns=[r'/api/products'])
+    ...
+    ...     def current_page_actions(self, current_url, **kwargs):
+    ...         for data in self.network_capture.iter_json(page_url=current_url):
+    ...             self.save_object(data['products'])
+    """
+
+    def __init__(self, *, patterns: Iterable[str] = [], content_types: Iterable[str] = JSON_CONTENT_TYPES, resource_types: Optional[Iterable[str]] = ('XHR', 'Fetch'), max_responses: int = 100, max_body_size: int = 5_000_000):
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+        self.content_types = list(content_types)
+        self.resource_types = None if resource_types is None else set(resource_types)
+        self.max_body_size = max_body_size
+        self.responses: deque[CapturedResponse] = deque(maxlen=max_responses)
+        self.captured_count = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.responses)} response(s)>'
+
+    def __len__(self):
+        return len(self.responses)
+
+    def __iter__(self):
+        return iter(self.responses)
+
+    def match(self, url: str, mime_type: str, resource_type: Optional[str] = None) -> bool:
+        if self.resource_types is not None and resource_type not in self.resource_types:
+            return False
+
+        if self.content_types:
+            mime_type = (mime_type or '').lower()
+            is_json = mime_type.endswith('+json') and any(
+                'json' in content_type for content_type in self.content_types
+            )
+            if not is_json and not any(mime_type.startswith(content_type) for content_type in self.content_types):
+                return False
+
+        if self.patterns:
+            return any(pattern.search(url) for pattern in self.patterns)
+        return True
+
+    def get_response_body(self, driver, request_id: str) -> Optional[str]:
+        try:
+            result = driver.execute_cdp_cmd(
+                'Network.getResponseBody',
+                {'requestId': request_id}
+            )
+        except Exception as e:
+            # The body is no longer available
+            # e.g. the tab was navigated
+            logger.debug(f'Could not read the response body of {request_id}: {e}')
+            return None
+
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        return body
+
+    def process(self, driver, entries: Iterable[dict[str, Any]], page_url: Optional[str] = None) -> list[CapturedResponse]:
+        """Reads the network events of the performance logs and
+        captures the bodies of the responses that match"""
+        pending: dict[str, CapturedResponse] = {}
+        captured = []
+
+        for method, params in iter_network_events(entries):
+            request_id = params.get('requestId')
+
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                url = response.get('url', '')
+                mime_type = response.get('mimeType', '')
+                resource_type = params.get('type')
+
+                if self.match(url, mime_type, resource_type):
+                    pending[request_id] = CapturedResponse(
+                        url=url,
+                        status=response.get('status', 0),
+                        mime_type=mime_type,
+                        resource_type=resource_type,
+                        request_id=request_id,
+                        page_url=page_url
+                    )
+            elif method == 'Network.loadingFinished':
+                response = pending.pop(request_id, None)
+                if response is None:
+                    continue
+
+                if params.get('encodedDataLength', 0) > self.max_body_size:
+                    logger.debug(f'Response body too large to be captured: {response.url}')
+                    continue
+
+                response.body = self.get_response_body(driver, request_id)
+                self.responses.append(response)
+                captured.append(response)
+            elif method == 'Network.loadingFailed':
+                pending.pop(request_id, None)
+
+        self.captured_count = self.captured_count + len(captured)
+        return captured
+
+    def clear(self):
+        self.responses.clear()
+
+    def filter(self, pattern: Optional[str] = None, page_url: Optional[str] = None) -> list[CapturedResponse]:
+        responses = list(self.responses)
+        if page_url is not None:
+            page_url = str(page_url)
+            responses = [
+                response for response in responses
+                if response.page_url == page_url
+            ]
+
+        if pattern is not None:
+            regex = re.compile(pattern)
+            responses = [
+                response for response in responses
+                if regex.search(response.url)
+            ]
+        return responses
+
+    def iter_json(self, pattern: Optional[str] = None, page_url: Optional[str] = None) -> Iterator[Any]:
+        """Iterates over the decoded JSON bodies of the
+        captured responses whose url matches the pattern"""
+        for response in self.filter(pattern, page_url=page_url):
+            if response.data is not None:
+                yield response.data
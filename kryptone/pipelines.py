@@ -0,0 +1,431 @@
+import csv
+import dataclasses
+import hashlib
+import json
+import pathlib
+import sqlite3
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Optional, Union
+
+from kryptone import logger
+from kryptone.conf import settings
+from kryptone.utils.columnar import get_pyarrow
+from kryptone.utils.encoders import DefaultJsonEncoder
+
+
+class ModelCleaner:
+    """Builds the instances of a dataclass model and runs the
+    `clean_<field>` methods of the model. The cleaning methods
+    are looked up once when the cleaner is created instead of
+    for every field of every item
+
+    >>> @dataclasses.dataclass
+    ... class Product:
+    ...     name: str
+    ...
+    ...     def clean_name(self, value):
+    ...         return value.strip()
+    ...
+    ... cleaner = ModelCleaner(Product)
+    ... cleaner({'name': ' Kendall '})
+    ... Product(name='Kendall')
+    """
+
+    def __init__(self, model):
+        if model is None:
+            raise ValueError(
+                "You need to implement a dataclass model "
+                "on the spider when trying to use save"
+            )
+
+        if not dataclasses.is_dataclass(model):
+            raise ValueError(
+                "Your model should be an instance of "
+                "of a dataclass"
+            )
+
+        self.model = model
+        self.field_names = [field.name for field in dataclasses.fields(model)]
+        self.cleaners: list[tuple[str, Callable[[Any, Any], Any]]] = []
+
+        for name in self.field_names:
+            func = getattr(model, f'clean_{name}', None)
+            if callable(func):
+                self.cleaners.append((name, func))
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.model.__name__}>'
+
+    def __call__(self, data: Union[dict[str, Any], Any]):
+        if isinstance(data, self.model):
+            instance = data
+        else:
+            try:
+                instance = self.model(**data)
+            except TypeError as e:
+                raise TypeError(
+                    f"Could not create {self.model.__name__} "
+                    f"from {data}: {e.args[0]}"
+                )
+
+        for name, func in self.cleaners:
+            setattr(instance, name, func(instance, getattr(instance, name)))
+        return instance
+
+
+class BaseStage:
+    """A stage receives a cleaned item and either
+    returns it or returns None to drop the item"""
+
+    def __call__(self, item):
+        return item
+
+    def reset(self):
+        pass
+
+
+class ValidationStage(BaseStage):
+    """Drops the items for which one of the
+    required fields is None or empty
+
+    >>> ValidationStage(['name', 'price'])
+    """
+
+    def __init__(self, required_fields: list[str]):
+        self.required_fields = list(required_fields)
+        self.dropped_count = 0
+
+    def __call__(self, item):
+        for name in self.required_fields:
+            if getattr(item, name, None) in (None, ''):
+                self.dropped_count = self.dropped_count + 1
+                return None
+        return item
+
+
+class DeduplicationStage(BaseStage):
+    """Drops the items that were already saved. Only the
+    fingerprints of the last `max_size` items are kept in
+    order to bound the memory used by long crawls
+
+    >>> DeduplicationStage(fields=['url'])
+    """
+
+    def __init__(self, fields: Optional[list[str]] = None, max_size: int = 100_000):
+        self.fields = fields
+        self.max_size = max_size
+        self.fingerprints: OrderedDict[bytes, None] = OrderedDict()
+        self.dropped_count = 0
+
+    def get_fingerprint(self, item):
+        names = self.fields or [
+            field.name for field in dataclasses.fields(item)
+        ]
+        values = [getattr(item, name) for name in names]
+        # A digest is used instead of hash() which is salted
+        # per process and can collide for different items
+        data = json.dumps(values, sort_keys=True, cls=DefaultJsonEncoder)
+        return hashlib.blake2b(data.encode('utf-8'), digest_size=16).digest()
+
+    def __call__(self, item):
+        fingerprint = self.get_fingerprint(item)
+        if fingerprint in self.fingerprints:
+            self.dropped_count = self.dropped_count + 1
+            return None
+
+        self.fingerprints[fingerprint] = None
+        if len(self.fingerprints) > self.max_size:
+            self.fingerprints.popitem(last=False)
+        return item
+
+    def reset(self):
+        self.fingerprints.clear()
+
+
+class BaseSink:
+    """A sink writes the batches of items
+    produced by the pipeline"""
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}>'
+
+    @staticmethod
+    def as_dict(item):
+        if dataclasses.is_dataclass(item):
+            return dataclasses.asdict(item)
+        return dict(item)
+
+    def write(self, batch: list[Any]):
+        return NotImplemented
+
+    def close(self):
+        pass
+
+
+class MemorySink(BaseSink):
+    """Keeps the last `max_size` items in memory"""
+
+    def __init__(self, max_size: int = 1000):
+        self.items = deque(maxlen=max_size)
+
+    def __len__(self):
+        return len(self.items)
+
+    def write(self, batch):
+        self.items.extend(batch)
+
+
+class JSONLinesSink(BaseSink):
+    """Appends the items to a JSON lines file"""
+
+    def __init__(self, path: Union[str, pathlib.Path]):
+        self.path = pathlib.Path(path)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.path}>'
+
+    def write(self, batch):
+        lines = [
+            json.dumps(self.as_dict(item), ensure_ascii=False, cls=DefaultJsonEncoder)
+            for item in batch
+        ]
+        with open(self.path, mode='a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+class CSVSink(BaseSink):
+    """Appends the items to a csv file. The header
+    is written when the file is created"""
+
+    def __init__(self, path: Union[str, pathlib.Path]):
+        self.path = pathlib.Path(path)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.path}>'
+
+    @staticmethod
+    def convert_value(value):
+        if isinstance(value, (list, tuple, dict)):
+            return json.dumps(value, ensure_ascii=False, cls=DefaultJsonEncoder)
+        return value
+
+    def write(self, batch):
+        rows = [self.as_dict(item) for item in batch]
+        is_new_file = not self.path.exists() or self.path.stat().st_size == 0
+
+        with open(self.path, mode='a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            if is_new_file:
+                writer.writeheader()
+
+            for row in rows:
+                writer.writerow({
+                    key: self.convert_value(value)
+                    for key, value in row.items()
+                })
+
+
+class ParquetSink(BaseSink):
+    """Writes each batch of items as a row group
+    of a Parquet file. Requires pyarrow"""
+
+    def __init__(self, path: Union[str, pathlib.Path]):
+        self.path = pathlib.Path(path)
+        self.writer = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.path}>'
+
+    def write(self, batch):
+        pyarrow, parquet = get_pyarrow()
+
+        table = pyarrow.Table.from_pylist([self.as_dict(item) for item in batch])
+        if self.writer is None:
+            self.writer = parquet.ParquetWriter(
+                self.path,
+                table.schema,
+                compression=settings.PARQUET_COMPRESSION
+            )
+        else:
+            table = table.cast(self.writer.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class SQLiteSink(BaseSink):
+    """Inserts the items in a SQLite table using one
+    transaction per batch. The table is created using
+    the fields of the first item"""
+
+    def __init__(self, path: Union[str, pathlib.Path], table: str = 'items'):
+        self.path = pathlib.Path(path)
+        self.table = table
+        self.connection = None
+        self.columns = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.path}>'
+
+    @staticmethod
+    def convert_value(value):
+        if value is None or isinstance(value, (int, float, str, bytes)):
+            return value
+        return json.dumps(value, ensure_ascii=False, cls=DefaultJsonEncoder)
+
+    def write(self, batch):
+        rows = [self.as_dict(item) for item in batch]
+
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path)
+            self.columns = list(rows[0].keys())
+            columns = ', '.join(f'"{name}"' for name in self.columns)
+            self.connection.execute(
+                f'create table if not exists "{self.table}" ({columns})'
+            )
+
+        columns = ', '.join(f'"{name}"' for name in self.columns)
+        placeholders = ', '.join('?' for _ in self.columns)
+        values = [
+            tuple(self.convert_value(row.get(name)) for name in self.columns)
+            for row in rows
+        ]
+        with self.connection:
+            self.connection.executemany(
+                f'insert into "{self.table}" ({columns}) values ({placeholders})',
+                values
+            )
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class ItemPipeline:
+    """Processes the items saved by the spider. Each item is built
+    from the model, cleaned and passed through the stages. The items
+    that were kept are buffered and written to the sinks in batches
+    once the buffer is full or when `flush_interval` seconds have
+    passed since the last flush
+
+    >>> class MySpider(SiteCrawler):
+    ...     model = Product
+    ...
+    ...     class Meta:
+    ...         pipeline = ItemPipeline(
+    ...             stages=[ValidationStage(['name']), DeduplicationStage(fields=['url'])],
+    ...             sinks=[JSONLinesSink('products.jsonl'), SQLiteSink('products.sqlite')]
+    ...         )
+    """
+
+    def __init__(self, *, stages: list[BaseStage] = [], sinks: list[BaseSink] = [], batch_size: int = 100, flush_interval: Optional[float] = 30):
+        self.cleaner: Optional[ModelCleaner] = None
+        self.stages = list(stages)
+        self.sinks = list(sinks)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.buffer: list[Any] = []
+        self.last_flush = time.monotonic()
+        self.callbacks: list[Callable[[list[Any]], Any]] = []
+        self.items_count = 0
+        self.dropped_count = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.sinks}>'
+
+    def bind(self, model):
+        """Sets the model used to build the items"""
+        if self.cleaner is None or self.cleaner.model is not model:
+            self.cleaner = ModelCleaner(model)
+
+    def connect(self, callback: Callable[[list[Any]], Any]):
+        """Registers a function called with each
+        batch after it was written to the sinks"""
+        if callback not in self.callbacks:
+            self.callbacks.append(callback)
+
+    def disconnect(self, callback: Callable[[list[Any]], Any]):
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    @property
+    def should_flush(self):
+        if len(self.buffer) >= self.batch_size:
+            return True
+
+        if self.flush_interval is not None and self.buffer:
+            return (time.monotonic() - self.last_flush) >= self.flush_interval
+        return False
+
+    def process_item(self, data, required_fields: list[str] = []):
+        item = self.cleaner(data)
+        for name in required_fields:
+            if getattr(item, name) is None:
+                self.dropped_count = self.dropped_count + 1
+                return None
+
+        for stage in self.stages:
+            item = stage(item)
+            if item is None:
+                self.dropped_count = self.dropped_count + 1
+                return None
+        return item
+
+    def process(self, data: Union[dict[str, Any], list[dict[str, Any]]], required_fields: list[str] = []):
+        """Processes the items and returns the ones that were
+        kept by the stages. The items for which one of the
+        `required_fields` is None are dropped"""
+        if self.cleaner is None:
+            raise ValueError(
+                "The pipeline needs to be bound to "
+                "a model before processing items"
+            )
+
+        if not isinstance(data, (list, tuple)):
+            data = [data]
+
+        items = []
+        for value in data:
+            item = self.process_item(value, required_fields=required_fields)
+            if item is not None:
+                items.append(item)
+
+        self.items_count = self.items_count + len(items)
+        self.buffer.extend(items)
+
+        if self.should_flush:
+            self.flush()
+        return items
+
+    def flush(self):
+        """Writes the buffered items to the sinks"""
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return []
+
+        batch = self.buffer
+        self.buffer = []
+
+        for sink in self.sinks:
+            try:
+                sink.write(batch)
+            except Exception as e:
+                logger.error(f'Failed to write {len(batch)} item(s) to {sink}: {e}')
+
+        logger.info(f'Saved {len(batch)} item(s)')
+
+        for callback in self.callbacks:
+            callback(batch)
+        return batch
+
+    def close(self):
+        """Flushes the remaining items and closes the sinks"""
+        batch = self.flush()
+        for sink in self.sinks:
+            sink.close()
+        return batch
@@ -0,0 +1,282 @@
+import dataclasses
+import time
+from collections import defaultdict
+from typing import Any
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from kryptone import logger
+from kryptone.conf import settings
+
+# Counts the fetch and XHR requests that are in flight. The
+# script is registered with the DevTools Protocol so that it
+# runs before the scripts of the page
+NETWORK_TRACKER_SCRIPT = """
+(() => {
+    if (window.__kryptoneNetwork) return
+    const state = window.__kryptoneNetwork = { inflight: 0, last: performance.now() }
+    const start = () => { state.inflight++; state.last = performance.now() }
+    const end = () => { state.inflight = Math.max(0, state.inflight - 1); state.last = performance.now() }
+
+    const originalFetch = window.fetch
+    if (originalFetch) {
+        window.fetch = function (...args) {
+            start()
+            return originalFetch.apply(this, args).finally(end)
+        }
+    }
+
+    const originalSend = XMLHttpRequest.prototype.send
+    XMLHttpRequest.prototype.send = function (...args) {
+        start()
+        this.addEventListener('loadend', end, { once: true })
+        return originalSend.apply(this, args)
+    }
+})()
+"""
+
+# Returns the number of requests in flight and the number of
+# milliseconds since the last network activity. The resource
+# timings are used when the tracker could not be registered
+NETWORK_IDLE_SCRIPT = """
+const state = window.__kryptoneNetwork
+let last = 0
+for (const entry of performance.getEntriesByType('resource')) {
+    last = Math.max(last, entry.responseEnd)
+}
+if (state) last = Math.max(last, state.last)
+return [state ? state.inflight : 0, performance.now() - last]
+"""
+
+# Returns the number of milliseconds since the last mutation
+# of the DOM. The observer is created on the first call
+DOM_QUIESCENCE_SCRIPT = """
+if (!window.__kryptoneMutations) {
+    const state = window.__kryptoneMutations = { last: performance.now() }
+    const observer = new MutationObserver(() => { state.last = performance.now() })
+    observer.observe(document, { childList: true, subtree: true, attributes: true, characterData: true })
+}
+return performance.now() - window.__kryptoneMutations.last
+"""
+
+
+class BaseCondition:
+    """A condition that the page should fulfill
+    before the spider can use it"""
+
+    name = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}>'
+
+    def __call__(self, driver) -> bool:
+        return NotImplemented
+
+    def setup(self, driver):
+        """Prepares the browser before
+        navigating to the page"""
+        pass
+
+
+class DocumentReady(BaseCondition):
+    """The document has reached the given `document.readyState`
+    which is useful with the "eager" and "none" strategies"""
+
+    name = 'document_ready'
+
+    def __init__(self, state: str = 'interactive'):
+        if state not in ('interactive', 'complete'):
+            raise ValueError("State should be 'interactive' or 'complete'")
+        self.state = state
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.state}>'
+
+    def __call__(self, driver):
+        ready_state = driver.execute_script('return document.readyState')
+        if self.state == 'interactive':
+            return ready_state in ('interactive', 'complete')
+        return ready_state == 'complete'
+
+
+class SelectorPresent(BaseCondition):
+    """An element matching the css selector exists in the page"""
+
+    name = 'selector_present'
+
+    def __init__(self, css_selector: str, visible: bool = False):
+        self.css_selector = css_selector
+        self.visible = visible
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.css_selector}>'
+
+    def __call__(self, driver):
+        elements = driver.find_elements(By.CSS_SELECTOR, self.css_selector)
+        if not elements:
+            return False
+
+        if self.visible:
+            return any(element.is_displayed() for element in elements)
+        return True
+
+
+class NetworkIdle(BaseCondition):
+    """No more than `max_inflight` requests were in flight and
+    there was no network activity for `idle_time` seconds"""
+
+    name = 'network_idle'
+
+    def __init__(self, idle_time: float = 0.5, max_inflight: int = 0):
+        self.idle_time = idle_time
+        self.max_inflight = max_inflight
+        # Tabs in which the tracker is registered
+        self.tabs = set()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.idle_time}s>'
+
+    def setup(self, driver):
+        execute_cdp_cmd = getattr(driver, 'execute_cdp_cmd', None)
+        if execute_cdp_cmd is None:
+            return
+
+        try:
+            key = (driver.session_id, driver.current_window_handle)
+            if key in self.tabs:
+                return
+
+            execute_cdp_cmd(
+                'Page.addScriptToEvaluateOnNewDocument',
+                {'source': NETWORK_TRACKER_SCRIPT}
+            )
+            self.tabs.add(key)
+        except Exception as e:
+            logger.debug(f'Could not register the network tracker: {e}')
+
+    def __call__(self, driver):
+        inflight, elapsed_time = driver.execute_script(NETWORK_IDLE_SCRIPT)
+        return inflight <= self.max_inflight and elapsed_time >= self.idle_time * 1000
+
+
+class DOMQuiescence(BaseCondition):
+    """The DOM did not change for `quiet_time` seconds"""
+
+    name = 'dom_quiescence'
+
+    def __init__(self, quiet_time: float = 0.5):
+        self.quiet_time = quiet_time
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.quiet_time}s>'
+
+    def __call__(self, driver):
+        elapsed_time = driver.execute_script(DOM_QUIESCENCE_SCRIPT)
+        return elapsed_time >= self.quiet_time * 1000
+
+
+@dataclasses.dataclass
+class ReadinessResult:
+    is_ready: bool
+    waited: float
+    pending_conditions: list[str] = dataclasses.field(default_factory=list)
+
+
+def wait_for(driver, conditions: list[BaseCondition], timeout: float = 5, poll_frequency: float = 0.1) -> ReadinessResult:
+    """Waits until all the conditions are fulfilled and returns
+    as soon as they are or when the timeout is reached
+
+    >>> result = wait_for(driver, [SelectorPresent('#products'), DOMQuiescence()])
+    ... result.waited
+    ... 0.42
+    """
+    start_time = time.monotonic()
+    pending_conditions = list(conditions)
+
+    def is_ready(driver):
+        while pending_conditions:
+            try:
+                if not pending_conditions[0](driver):
+                    return False
+            except Exception:
+                return False
+            # Conditions that are fulfilled
+            # are not tested again
+            pending_conditions.pop(0)
+        return True
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(is_ready)
+    except TimeoutException:
+        pass
+
+    return ReadinessResult(
+        is_ready=not pending_conditions,
+        waited=time.monotonic() - start_time,
+        pending_conditions=[
+            condition.name or condition.__class__.__name__
+            for condition in pending_conditions
+        ]
+    )
+
+
+class ReadinessPolicy:
+    """Defines when a page is ready to be used by the spider. The
+    policy can be set on the spider or on a route in which case it
+    replaces the policy of the spider
+
+    >>> class MySpider(SiteCrawler):
+    ...     class Meta:
+    ...         readiness = ReadinessPolicy(
+    ...             conditions=[SelectorPresent('.product'), NetworkIdle()],
+    ...             timeout=10
+    ...         )
+    """
+
+    def __init__(self, *, conditions: list[BaseCondition] = [], timeout: float = 5, poll_frequency: float = 0.1):
+        self.conditions = list(conditions) or [SelectorPresent('body')]
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.totals: dict[str, Any] = defaultdict(int)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.conditions}>'
+
+    @classmethod
+    def from_settings(cls):
+        conditions: list[BaseCondition] = [SelectorPresent('body')]
+        if settings.PAGE_LOAD_STRATEGY == 'none':
+            # The navigation returns immediately
+            # with the "none" strategy
+            conditions.insert(0, DocumentReady('interactive'))
+        return cls(conditions=conditions, timeout=settings.READINESS_TIMEOUT)
+
+    def setup(self, driver):
+        for condition in self.conditions:
+            condition.setup(driver)
+
+    def wait(self, driver) -> ReadinessResult:
+        result = wait_for(
+            driver,
+            self.conditions,
+            timeout=self.timeout,
+            poll_frequency=self.poll_frequency
+        )
+
+        self.totals['pages_count'] += 1
+        self.totals['total_wait_time'] += result.waited
+        if not result.is_ready:
+            self.totals['timeouts_count'] += 1
+        return result
+
+    def statistics(self):
+        statistics = dict(self.totals)
+        pages_count = statistics.get('pages_count', 0)
+        if pages_count > 0:
+            statistics['average_wait_time'] = round(
+                statistics['total_wait_time'] / pages_count,
+                3
+            )
+        return statistics
@@ -0,0 +1,278 @@
+import dataclasses
+from collections import OrderedDict, defaultdict
+from typing import Any, Iterable, Optional
+from urllib.parse import urlparse
+
+from kryptone import logger
+from kryptone.conf import settings
+from kryptone.network import iter_network_events
+
+# File extensions of the resource types that can be blocked.
+# `Network.setBlockedURLs` only accepts url patterns, so the
+# types are translated to patterns using these extensions
+RESOURCE_TYPE_EXTENSIONS = {
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'media': ['mp4', 'webm', 'ogg', 'ogv', 'mp3', 'wav', 'm4a', 'mov', 'avi', 'm3u8'],
+    'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'],
+    'stylesheet': ['css']
+}
+
+# Analytics, advertising and tracking domains that
+# are blocked when `block_trackers` is enabled. Consent
+# managers are not blocked since `click_consent_button`
+# needs their banner to be loaded
+DEFAULT_BLOCKLIST = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googletagservices.com',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'adservice.google.com',
+    'connect.facebook.net',
+    'analytics.tiktok.com',
+    'bat.bing.com',
+    'clarity.ms',
+    'hotjar.com',
+    'segment.com',
+    'segment.io',
+    'mixpanel.com',
+    'amplitude.com',
+    'fullstory.com',
+    'newrelic.com',
+    'nr-data.net',
+    'criteo.com',
+    'criteo.net',
+    'taboola.com',
+    'outbrain.com',
+    'adnxs.com',
+    'amazon-adsystem.com',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'pinimg.com',
+    'ads-twitter.com',
+    'snap.licdn.com'
+]
+
+# Number of resources whose size is kept in
+# order to estimate the bytes saved by blocking
+MAX_KNOWN_RESOURCES = 1000
+
+
+@dataclasses.dataclass
+class ResourceStatistics:
+    """Requests made by the browser while loading a page"""
+
+    url: Optional[str] = None
+    requests_count: int = 0
+    blocked_count: int = 0
+    bytes_loaded: int = 0
+    # Estimated from the size of the resource, or of the
+    # resources of the same type, on the previous pages
+    bytes_saved: int = 0
+    oversized_urls: list[str] = dataclasses.field(default_factory=list)
+
+    def json(self):
+        return dataclasses.asdict(self)
+
+
+def set_blocked_urls(driver, patterns: list[str]) -> bool:
+    """Blocks the requests of the current tab of the browser
+    matching the patterns. Returns False when the browser
+    does not support the DevTools Protocol"""
+    execute_cdp_cmd = getattr(driver, 'execute_cdp_cmd', None)
+    if execute_cdp_cmd is None:
+        return False
+
+    try:
+        execute_cdp_cmd('Network.enable', {})
+        execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except Exception as e:
+        logger.warning(f'Could not block the resources of the page: {e}')
+        return False
+    return True
+
+
+def get_resource_pattern(url: str) -> str:
+    """Returns the pattern matching the url whatever
+    its query string or its fragment"""
+    result = urlparse(url)
+    return f'{result.scheme}://{result.netloc}{result.path}*'
+
+
+class ResourcePolicy:
+    """Blocks the resources that are not needed to scrape a
+    page (fonts, media, trackers...) using the DevTools
+    Protocol. The policy can be set on the spider or on a
+    route in which case it replaces the policy of the spider
+
+    >>> class MySpider(SiteCrawler):
+    ...     class Meta:
+    ...         resource_policy = ResourcePolicy(
+    ...             resource_types=['font', 'media'],
+    ...             block_trackers=True
+    ...         )
+
+    Resources larger than `max_size` bytes cannot be known before
+    they are downloaded. Once such a resource was loaded on a page,
+    it is blocked on the next pages. Only the last `max_oversized`
+    resources are blocked in order to keep the list of patterns
+    sent to the browser short
+    """
+
+    def __init__(self, *, resource_types: Iterable[str] = [], domains: Iterable[str] = [], patterns: Iterable[str] = [], block_trackers: bool = False, max_size: Optional[int] = None, max_oversized: int = 100, allowed_domains: Iterable[str] = []):
+        invalid_types = set(resource_types) - set(RESOURCE_TYPE_EXTENSIONS)
+        if invalid_types:
+            raise ValueError(
+                f'Invalid resource types: {", ".join(sorted(invalid_types))}. '
+                f'Valid types are: {", ".join(RESOURCE_TYPE_EXTENSIONS)}'
+            )
+
+        self.resource_types = list(resource_types)
+        self.allowed_domains = set(allowed_domains)
+        self.domains = [
+            domain for domain in domains
+            if domain not in self.allowed_domains
+        ]
+        if block_trackers:
+            self.domains.extend(
+                domain for domain in DEFAULT_BLOCKLIST
+                if domain not in self.allowed_domains
+            )
+
+        self.patterns = list(patterns)
+        self.max_size = max_size
+        self.max_oversized = max(1, max_oversized)
+        # pattern -> size of the resources that
+        # were larger than the maximum size
+        self.oversized_resources: OrderedDict[str, int] = OrderedDict()
+        # pattern -> size of the last loaded resources
+        # and resource type -> (total size, count)
+        self.resource_sizes: OrderedDict[str, int] = OrderedDict()
+        self.type_sizes: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+        self.totals: dict[str, int] = defaultdict(int)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.get_blocked_patterns())} pattern(s)>'
+
+    @classmethod
+    def from_settings(cls) -> Optional['ResourcePolicy']:
+        """Returns the policy defined in the settings
+        or None if no resource should be blocked"""
+        is_empty = not any([
+            settings.BLOCKED_RESOURCE_TYPES,
+            settings.BLOCKED_DOMAINS,
+            settings.BLOCK_TRACKERS,
+            settings.MAX_RESOURCE_SIZE
+        ])
+        if is_empty:
+            return None
+
+        return cls(
+            resource_types=settings.BLOCKED_RESOURCE_TYPES,
+            domains=settings.BLOCKED_DOMAINS,
+            block_trackers=settings.BLOCK_TRACKERS,
+            max_size=settings.MAX_RESOURCE_SIZE
+        )
+
+    def get_blocked_patterns(self) -> list[str]:
+        patterns = []
+        for resource_type in self.resource_types:
+            for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+                patterns.append(f'*.{extension}')
+                patterns.append(f'*.{extension}?*')
+
+        for domain in self.domains:
+            patterns.append(f'*://{domain}/*')
+            patterns.append(f'*://*.{domain}/*')
+
+        patterns.extend(self.patterns)
+        patterns.extend(self.oversized_resources)
+        return patterns
+
+    def apply(self, driver) -> bool:
+        return set_blocked_urls(driver, self.get_blocked_patterns())
+
+    def learn_size(self, url: str, resource_type: Optional[str], size: int):
+        pattern = get_resource_pattern(url)
+        self.resource_sizes[pattern] = size
+        self.resource_sizes.move_to_end(pattern)
+        if len(self.resource_sizes) > MAX_KNOWN_RESOURCES:
+            self.resource_sizes.popitem(last=False)
+
+        if resource_type is not None:
+            self.type_sizes[resource_type][0] += size
+            self.type_sizes[resource_type][1] += 1
+
+    def estimate_size(self, url: str, resource_type: Optional[str]) -> int:
+        """Returns the size of the resource when it was loaded
+        before or the average size of the resources of the
+        same type. Resources that were never loaded and of
+        which no similar resource was loaded count as 0"""
+        pattern = get_resource_pattern(url)
+        for sizes in (self.oversized_resources, self.resource_sizes):
+            if pattern in sizes:
+                return sizes[pattern]
+
+        total, count = self.type_sizes.get(resource_type, (0, 0))
+        return total // count if count else 0
+
+    def add_oversized_resource(self, url: str, size: int):
+        pattern = get_resource_pattern(url)
+        self.oversized_resources[pattern] = size
+        self.oversized_resources.move_to_end(pattern)
+        if len(self.oversized_resources) > self.max_oversized:
+            self.oversized_resources.popitem(last=False)
+
+    def collect(self, entries: Iterable[dict[str, Any]], page_url: Optional[str] = None) -> ResourceStatistics:
+        """Computes the statistics of the page from the performance
+        logs of the browser and learns the oversized resources"""
+        statistics = ResourceStatistics(url=page_url)
+        request_urls: dict[str, str] = {}
+        request_types: dict[str, Optional[str]] = {}
+
+        for method, params in iter_network_events(entries):
+            request_id = params.get('requestId')
+
+            if method == 'Network.requestWillBeSent':
+                statistics.requests_count = statistics.requests_count + 1
+                request_urls[request_id] = params.get('request', {}).get('url', '')
+                request_types[request_id] = params.get('type')
+            elif method == 'Network.loadingFailed':
+                if params.get('blockedReason') is None:
+                    continue
+
+                statistics.blocked_count = statistics.blocked_count + 1
+                statistics.bytes_saved = (
+                    statistics.bytes_saved +
+                    self.estimate_size(
+                        request_urls.get(request_id, ''),
+                        params.get('type') or request_types.get(request_id)
+                    )
+                )
+            elif method == 'Network.loadingFinished':
+                size = int(params.get('encodedDataLength', 0))
+                statistics.bytes_loaded = statistics.bytes_loaded + size
+
+                url = request_urls.get(request_id)
+                if url is None or url.startswith('data:'):
+                    continue
+
+                self.learn_size(url, request_types.get(request_id), size)
+
+                # The document of the page
+                # itself is never blocked
+                if self.max_size is None or size <= self.max_size or url == page_url:
+                    continue
+
+                statistics.oversized_urls.append(url)
+                self.add_oversized_resource(url, size)
+
+        self.totals['requests_count'] += statistics.requests_count
+        self.totals['blocked_count'] += statistics.blocked_count
+        self.totals['bytes_loaded'] += statistics.bytes_loaded
+        self.totals['bytes_saved'] += statistics.bytes_saved
+        return statistics
+
+    def statistics(self):
+        return dict(self.totals)
@@ -1,16 +1,46 @@
+import re
 from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
 
 from kryptone import logger
 from kryptone.utils.urls import URL
 
 
+@dataclass
+class RouteMatch:
+    route: 'Route'
+    params: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def name(self):
+        return self.route.name
+
+
 class Route:
-    """Points to a specific function on the crawler for a 
+    """Points to a specific function on the crawler for a
     route that matches the specific path
 
     >>> router = Router([
     ...    route('logic_for_first_url', regex='\/products', name='products')
     ... ])
+
+    The named groups of the regex are passed as keyword
+    arguments to the function
+
+    >>> route('product_page', regex=r'\/products\/(?P<slug>[a-z\-]+)$')
+
+    A `ResourcePolicy` can be used to block resources
+    on the pages of the route instead of the policy
+    of the spider
+
+    >>> route('product_page', path='/product', resource_policy=ResourcePolicy(resource_types=['media']))
+
+    In the same way, a `ReadinessPolicy` defines when the
+    pages of the route are ready to be used
+
+    >>> route('product_page', path='/product', readiness=ReadinessPolicy(conditions=[SelectorPresent('.price')]))
     """
 
     def __init__(self):
@@ -18,52 +48,36 @@ class Route:
         self.regex = None
         self.name = None
         self.function_name = None
+        self.compiled_regex = None
+        self.resource_policy = None
+        self.readiness = None
         self.matched_urls = deque()
 
     def __repr__(self):
         return f'<Route <{self.path or self.regex}> name={self.name}>'
 
-    def __call__(self, function_name, *, path=None, regex=None, name=None):
+    def __call__(self, function_name, *, path=None, regex=None, name=None, resource_policy=None, readiness=None):
         self.name = name
+        self.resource_policy = resource_policy
+        self.readiness = readiness
         self.function_name = function_name
         self.path = path
         self.regex = regex
 
+        if regex is not None:
+            self.compiled_regex = re.compile(regex)
+
         def wrapper(current_url, spider_instance):
             if isinstance(current_url, str):
                 current_url = URL(current_url)
 
-            result = False
             if path is None and regex is None:
                 raise ValueError('Both url path and regex cannot be None')
 
-            if path is not None:
-                # Make an exact match on the path ?
-                result = current_url.url_object.path == path
-
-            if regex is not None:
-                result = current_url.test_path(regex)
-
-            if result:
-                func = getattr(spider_instance, function_name, False)
-                if not func:
-                    # Silently fail if we got no corresponding
-                    # functions on the spider class
-                    logger.warning(
-                        f'Routing failed for: {current_url}. '
-                        'No corresponding function found'
-                    )
-                    return False
-
-                func(current_url, route=self)
-                if result:
-                    logger.info(
-                        f"Routing sucessful for {current_url} "
-                        f"to '{self.function_name}'"
-                    )
-                    self.matched_urls.appendleft(current_url)
-                return result
-            return result
+            params = self.match(current_url.url_object.path)
+            if params is None:
+                return False
+            return self.dispatch(current_url, spider_instance, params)
         return self, wrapper
 
     @classmethod
@@ -71,47 +85,105 @@ class Route:
         instance = cls()
         return instance
 
+    def match(self, path):
+        """Returns the parameters captured on the path
+        or None if the route does not match the path"""
+        if self.compiled_regex is not None:
+            result = self.compiled_regex.search(path)
+            if result is None:
+                return None
+            return result.groupdict()
+
+        if self.path is not None and path == self.path:
+            return {}
+        return None
 
-def route(function_name, *, path=None, regex=None, name=None):
+    def dispatch(self, current_url, spider_instance, params):
+        func = getattr(spider_instance, self.function_name, False)
+        if not func:
+            # Silently fail if we got no corresponding
+            # functions on the spider class
+            logger.warning(
+                f'Routing failed for: {current_url}. '
+                'No corresponding function found'
+            )
+            return False
+
+        func(current_url, route=self, **params)
+        logger.info(
+            f"Routing sucessful for {current_url} "
+            f"to '{self.function_name}'"
+        )
+        self.matched_urls.appendleft(current_url)
+        return True
+
+
+def route(function_name, *, path=None, regex=None, name=None, resource_policy=None, readiness=None):
     """Function that calls a new `Route` instance that uses
     extra functionnalities to better identify the route"""
+    if path is None and regex is None:
+        raise ValueError('Both url path and regex cannot be None')
+
     instance = Route.new()
-    return instance(function_name, path=path, regex=regex, name=name)
+    return instance(
+        function_name,
+        path=path,
+        regex=regex,
+        name=name,
+        resource_policy=resource_policy,
+        readiness=readiness
+    )
 
 
 class Router:
-    """Manages a collection of routes and resolves URL matches by invoking 
-    specific functions on a web crawler. The router enables the execution of 
+    """Manages a collection of routes and resolves URL matches by invoking
+    specific functions on a web crawler. The router enables the execution of
     different logic for different URL patterns.
 
     >>> class MySpider:
     ...     start_url = 'http://example.com'
-    ...     
+    ...
     ...     class Meta:
     ...        router = Router([
     ...            route('logic_for_first_url', regex='\/products', name='products'),
     ...            route('logic_for_first_url', path='/product', name='product')
     ...        ])
-    ...     
+    ...
     ...     def logic_for_first_url(self, current_url, route=None, **kwargs):
     ...         pass
-    ...         
+    ...
     ...     def logic_for_second_url(self, current_url, route=None, **kwargs):
     ...         pass
+
+    The routes are indexed when the router is created: exact paths are
+    stored in a dictionnary and all the regexes are compiled into one
+    single pattern so that an url is resolved in one pass. The first
+    route that matches the url, in the order of declaration, is used
     """
 
-    routes = OrderedDict()
+    def __init__(self, routes, cache_size=10_000):
+        self.routes: OrderedDict[str, Route] = OrderedDict()
+        self.wrappers = OrderedDict()
 
-    def __init__(self, routes):
         for i, route in enumerate(routes):
             instance, wrapper = route
             if not callable(wrapper):
-                raise
+                raise ValueError(f'Route {instance} is not callable')
             if instance.name is not None:
                 name = instance.name
             else:
                 name = f'route_{i}'
-            self.routes[name] = wrapper
+                instance.name = name
+            self.routes[name] = instance
+            self.wrappers[name] = wrapper
+
+        self.ordered_routes = list(self.routes.values())
+        self.paths: dict[str, int] = {}
+        self.combined_regex = None
+        self.regex_groups: dict[str, int] = {}
+        self.build_index()
+
+        self.match_path = lru_cache(maxsize=cache_size)(self._match_path)
 
     def __repr__(self):
         return f'<Router: {list(self.routes.keys())}>'
@@ -120,12 +192,86 @@ class Router:
     def has_routes(self):
         return len(self.routes.keys()) > 0
 
+    def build_index(self):
+        patterns = []
+        for i, instance in enumerate(self.ordered_routes):
+            if instance.compiled_regex is not None:
+                group_name = f'_route_{i}'
+                self.regex_groups[group_name] = i
+                # Each regex is wrapped in a lookahead so that
+                # the alternatives are tested in the order in
+                # which the routes were declared while keeping
+                # the search semantics of the original regex
+                patterns.append(
+                    f'(?=[\\s\\S]*?(?P<{group_name}>{instance.regex}))'
+                )
+            elif instance.path is not None:
+                self.paths.setdefault(instance.path, i)
+
+        if patterns:
+            try:
+                self.combined_regex = re.compile(f"^(?:{'|'.join(patterns)})")
+            except re.error:
+                # The regexes use group names that conflict
+                # with each other, in which case the routes
+                # are tested one by one
+                self.combined_regex = None
+                self.regex_groups = {}
+
+    def _match_path(self, path: str) -> Optional[RouteMatch]:
+        candidates = []
+
+        index = self.paths.get(path)
+        if index is not None:
+            candidates.append(index)
+
+        if self.combined_regex is not None:
+            result = self.combined_regex.match(path)
+            if result is not None:
+                candidates.append(self.regex_groups[result.lastgroup])
+        else:
+            for i, instance in enumerate(self.ordered_routes):
+                if instance.compiled_regex is not None:
+                    if instance.compiled_regex.search(path):
+                        candidates.append(i)
+                        break
+
+        if not candidates:
+            return None
+
+        instance = self.ordered_routes[min(candidates)]
+        return RouteMatch(instance, instance.match(path) or {})
+
+    def match(self, current_url) -> Optional[RouteMatch]:
+        """Returns the route matching the given url. The
+        resolution is cached per path"""
+        if isinstance(current_url, str):
+            current_url = URL(current_url)
+        return self.match_path(current_url.url_object.path)
+
+    def classify(self, current_url) -> Optional[str]:
+        """Returns the name of the route matching the url
+        which can be used to prioritize or group urls
+        without visiting them
+
+        >>> router.classify('http://example.com/products/1')
+        ... 'products'
+        """
+        result = self.match(current_url)
+        if result is None:
+            return None
+        return result.name
+
     def resolve(self, current_url, spider_instance):
-        """Resolves the given URL by matching it against the router's 
-        routes and invoking the corresponding function on the spider 
+        """Resolves the given URL by matching it against the router's
+        routes and invoking the corresponding function on the spider
         instance"""
-        resolution_states = []
-        for route in self.routes.values():
-            state = route(current_url, spider_instance)
-            resolution_states.append(state)
-        return resolution_states
+        if isinstance(current_url, str):
+            current_url = URL(current_url)
+
+        result = self.match(current_url)
+        if result is None:
+            return None
+
+        result.route.dispatch(current_url, spider_instance, result.params)
+        return result
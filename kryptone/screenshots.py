@@ -0,0 +1,239 @@
+import base64
+import dataclasses
+import hashlib
+import io
+import pathlib
+import queue
+import threading
+from typing import Any, Optional, Union
+
+from kryptone import logger
+from kryptone.conf import settings
+
+# Extensions of the files written
+# for each of the image formats
+IMAGE_FORMATS = {
+    'webp': 'webp',
+    'jpeg': 'jpg',
+    'png': 'png'
+}
+
+
+@dataclasses.dataclass
+class Screenshot:
+    hash: str
+    path: pathlib.Path
+    size: int
+    page_url: Optional[str] = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.path.name}>'
+
+
+def capture_png(driver, full_page: bool = False) -> bytes:
+    """Returns the screenshot of the page as PNG bytes. With
+    `full_page`, the whole page is captured using the DevTools
+    Protocol instead of only the visible part of the page"""
+    execute_cdp_cmd = getattr(driver, 'execute_cdp_cmd', None)
+    if full_page and execute_cdp_cmd is not None:
+        try:
+            metrics = execute_cdp_cmd('Page.getLayoutMetrics', {})
+            content_size = metrics.get('cssContentSize') or metrics['contentSize']
+            result = execute_cdp_cmd('Page.captureScreenshot', {
+                'format': 'png',
+                'captureBeyondViewport': True,
+                'clip': {
+                    'x': 0,
+                    'y': 0,
+                    'width': content_size['width'],
+                    'height': content_size['height'],
+                    'scale': 1
+                }
+            })
+            return base64.b64decode(result['data'])
+        except Exception as e:
+            logger.debug(f'Could not capture the full page: {e}')
+    return driver.get_screenshot_as_png()
+
+
+class ScreenshotService:
+    """Saves the screenshots of the pages without blocking the
+    spider. Only the capture of the PNG bytes happens on the
+    thread of the spider, the encoding to WebP or JPEG, the
+    deduplication and the writing to disk being done by a
+    background worker. Screenshots are no longer saved once
+    `max_disk_usage` megabytes were written
+
+    >>> service = ScreenshotService('media/screenshots', image_format='webp')
+    ... service.capture(driver, name='h1', page_url='http://example.com')
+    ... service.close()
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], *, image_format: str = 'webp', quality: int = 80, full_page: bool = False, max_disk_usage: Optional[float] = None, max_queue_size: int = 20):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Image format should be one of {', '.join(IMAGE_FORMATS)}")
+
+        self.directory = pathlib.Path(directory)
+        self.image_format = image_format
+        self.quality = quality
+        self.full_page = full_page
+        self.max_disk_usage = None if max_disk_usage is None else max_disk_usage * 1024 * 1024
+        self.screenshots: dict[str, Screenshot] = {}
+        self.pages: dict[str, Screenshot] = {}
+        self.disk_usage = 0
+        self.totals = dict.fromkeys([
+            'captured_count',
+            'saved_count',
+            'duplicates_count',
+            'dropped_count',
+            'skipped_count'
+        ], 0)
+
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self.worker: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.is_closed = False
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.screenshots)} screenshot(s)>'
+
+    def __len__(self):
+        return len(self.screenshots)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            pathlib.Path(settings.MEDIA_FOLDER).joinpath('screenshots'),
+            image_format=settings.SCREENSHOT_FORMAT,
+            quality=settings.SCREENSHOT_QUALITY,
+            full_page=settings.SCREENSHOT_FULL_PAGE,
+            max_disk_usage=settings.SCREENSHOT_MAX_DISK_USAGE
+        )
+
+    @property
+    def extension(self):
+        return IMAGE_FORMATS[self.image_format]
+
+    def start(self):
+        with self.lock:
+            if self.worker is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self.worker = threading.Thread(
+                    target=self.run,
+                    name='screenshots',
+                    daemon=True
+                )
+                self.worker.start()
+
+    def capture(self, driver, name: Optional[str] = None, page_url: Optional[str] = None, full_page: Optional[bool] = None) -> bool:
+        """Captures the page and queues the screenshot to be saved.
+        Returns False when the screenshot was dropped because the
+        worker is late or the disk usage limit was reached"""
+        if self.is_closed or self.has_reached_limit:
+            self.totals['skipped_count'] += 1
+            return False
+
+        if full_page is None:
+            full_page = self.full_page
+
+        try:
+            data = capture_png(driver, full_page=full_page)
+        except Exception as e:
+            logger.warning(f'Could not take the screenshot: {e}')
+            return False
+
+        self.totals['captured_count'] += 1
+        self.start()
+
+        try:
+            self.queue.put_nowait((data, name, page_url))
+        except queue.Full:
+            # Dropping the screenshot is preferred
+            # to blocking the navigation
+            self.totals['dropped_count'] += 1
+            logger.warning('Screenshot dropped, the screenshot queue is full')
+            return False
+        return True
+
+    @property
+    def has_reached_limit(self):
+        return self.max_disk_usage is not None and self.disk_usage >= self.max_disk_usage
+
+    def encode(self, data: bytes) -> bytes:
+        if self.image_format == 'png':
+            return data
+
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.warning('Pillow is required to compress the screenshots')
+            self.image_format = 'png'
+            return data
+
+        image = Image.open(io.BytesIO(data))
+        if self.image_format == 'jpeg':
+            image = image.convert('RGB')
+
+        buffer = io.BytesIO()
+        image.save(buffer, format=self.image_format.upper(), quality=self.quality)
+        return buffer.getvalue()
+
+    def save(self, data: bytes, name: Optional[str] = None, page_url: Optional[str] = None) -> Optional[Screenshot]:
+        """Encodes the PNG bytes and writes the screenshot
+        unless an identical screenshot was already saved"""
+        digest = hashlib.sha1(data).hexdigest()
+
+        screenshot = self.screenshots.get(digest)
+        if screenshot is not None:
+            self.totals['duplicates_count'] += 1
+        else:
+            content = self.encode(data)
+            if self.max_disk_usage is not None and self.disk_usage + len(content) > self.max_disk_usage:
+                self.totals['skipped_count'] += 1
+                logger.warning('Screenshot not saved, the disk usage limit was reached')
+                return None
+
+            filename = digest[:16] if name is None else f'{name}_{digest[:16]}'
+            path = self.directory.joinpath(f'{filename}.{self.extension}')
+            path.write_bytes(content)
+
+            screenshot = Screenshot(digest, path, len(content), page_url=page_url)
+            self.screenshots[digest] = screenshot
+            self.disk_usage = self.disk_usage + len(content)
+            self.totals['saved_count'] += 1
+
+        if page_url is not None:
+            self.pages[page_url] = screenshot
+        return screenshot
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self.save(*item)
+            except Exception as e:
+                logger.error(f'Could not save the screenshot: {e}')
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Waits for the queued screenshots to be saved"""
+        if self.worker is not None:
+            self.queue.join()
+
+    def close(self):
+        if self.is_closed:
+            return
+
+        self.is_closed = True
+        if self.worker is not None:
+            self.queue.put(None)
+            self.worker.join()
+
+    def statistics(self) -> dict[str, Any]:
+        return {
+            **self.totals,
+            'disk_usage': self.disk_usage
+        }
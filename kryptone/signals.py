@@ -1,13 +1,14 @@
+import asyncio
 import inspect
 import threading
-import time
 import weakref
-from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync, sync_to_async
 
 NO_RECEIVERS = object()
 
 
-@lru_cache(maxsize=512)
 def get_function_parameters(func, remove_first):
     """Returns the callable parameters removing
     "self" from the parameters if the method is 
@@ -48,17 +49,29 @@ NONE_ID = make_id(None)
 
 class Signal:
     """Base class for creating a signal by connecting
-    a receiver to a sender function"""
+    a receiver to a sender function
+
+    The live receivers of each sender are cached and the
+    cache is invalidated when a receiver is connected,
+    disconnected or garbage collected. Coroutine receivers
+    are supported and can be run concurrently using `asend`
+    """
 
-    def __init__(self):
+    def __init__(self, use_caching=True):
         self.receivers = []
         self.lock = threading.Lock()
-        # self.sender_receivers_cache = weakref.WeakKeyDictionary() if use_caching else {}
-        self.sender_receivers_cache = {}
+        self.use_caching = use_caching
+        # Maps a sender to the list of (receiver, is_async)
+        # that should be called. The senders are weakly
+        # referenced so that the cache does not keep them
+        # alive or get reused by a new object with the same id
+        self.sender_receivers_cache = weakref.WeakKeyDictionary()
         self._has_dead_receivers = False
+        self._executor = None
 
     def _remove_receiver(self):
         self._has_dead_receivers = True
+        self.sender_receivers_cache.clear()
 
     def _clear_dead_receivers(self):
         # Note: caller is assumed to hold self.lock.
@@ -69,31 +82,61 @@ class Signal:
                 if not (isinstance(item[1], weakref.ReferenceType) and item[1]() is None)
             ]
 
+    def _get_cached_receivers(self, sender):
+        try:
+            return self.sender_receivers_cache.get(sender)
+        except TypeError:
+            # Senders that cannot be weakly
+            # referenced are never cached
+            return None
+
+    def _cache_receivers(self, sender, receivers):
+        try:
+            self.sender_receivers_cache[sender] = receivers
+        except TypeError:
+            pass
+
     def _live_receivers(self, sender):
-        receivers = []
+        """Returns two lists containing the synchronous
+        and the asynchronous receivers for the sender"""
+        incoming_sender_key = make_id(sender)
+        receivers = None
 
-        if not receivers:
+        if self.use_caching:
+            receivers = self._get_cached_receivers(sender)
+            if receivers is NO_RECEIVERS:
+                return [], []
+
+        if receivers is None:
             with self.lock:
                 self._clear_dead_receivers()
-                incoming_sender_key = make_id(sender)
-                for (receiver_key, sender_key), receiver in self.receivers:
+                receivers = []
+                for (receiver_key, sender_key), receiver, is_async in self.receivers:
                     if sender_key == NONE_ID or sender_key == incoming_sender_key:
-                        receivers.append(receiver)
+                        receivers.append((receiver, is_async))
+
+                if self.use_caching:
+                    self._cache_receivers(sender, receivers or NO_RECEIVERS)
 
-        non_weak_receivers = []
+        sync_receivers = []
+        async_receivers = []
 
-        for receiver in receivers:
+        for receiver, is_async in receivers:
             if isinstance(receiver, weakref.ReferenceType):
                 # Dereference the weak reference.
                 receiver = receiver()
-                if receiver is not None:
-                    non_weak_receivers.append(receiver)
+                if receiver is None:
+                    continue
+
+            if is_async:
+                async_receivers.append(receiver)
             else:
-                non_weak_receivers.append(receiver)
-        return non_weak_receivers
+                sync_receivers.append(receiver)
+        return sync_receivers, async_receivers
 
     def has_listeners(self, sender=None):
-        return bool(self._live_receivers(sender))
+        sync_receivers, async_receivers = self._live_receivers(sender)
+        return bool(sync_receivers or async_receivers)
 
     def connect(self, receiver, sender=None, weak=True, uid=None):
         """Connect a receiver to a sender for a signal
@@ -115,11 +158,13 @@ class Signal:
         if not test_function_accept_kwargs(receiver):
             raise TypeError("A receiver should receive keyword arguments")
 
+        is_async = inspect.iscoroutinefunction(receiver)
+
         if uid is None:
             uid = make_id(receiver)
         # Create the tuple that links
         # the receiver to the sender
-        key = (make_id(uid), make_id(sender))
+        key = (uid, make_id(sender))
 
         if weak:
             reference = weakref.ref
@@ -134,8 +179,8 @@ class Signal:
 
         with self.lock:
             self._clear_dead_receivers()
-            if not any(r_key == key for r_key, _ in self.receivers):
-                self.receivers.append((key, receiver))
+            if not any(r_key == key for r_key, _, _ in self.receivers):
+                self.receivers.append((key, receiver, is_async))
             self.sender_receivers_cache.clear()
 
     def disconnect(self, receiver=None, sender=None, uid=None):
@@ -149,7 +194,7 @@ class Signal:
         with self.lock:
             self._clear_dead_receivers()
             for i in range(len(self.receivers)):
-                receiver_key, _ = self.receivers[i]
+                receiver_key, _, _ = self.receivers[i]
                 if receiver_key == lookup_key:
                     del self.receivers[i]
                     disconnected = True
@@ -157,6 +202,11 @@ class Signal:
             self.sender_receivers_cache.clear()
         return disconnected
 
+    def _has_no_receivers(self, sender):
+        if not self.receivers:
+            return True
+        return self._get_cached_receivers(sender) is NO_RECEIVERS
+
     def send(self, sender, **named):
         """
         Send signal from a sender to all connected receivers.
@@ -164,38 +214,122 @@ class Signal:
         If any receiver raises an error, the error propagates back through send,
         terminating the dispatch loop. So it's possible that all receivers
         won't be called if an error is raised.
-        """
-        logic = [
-            not self.receivers,
-            self.sender_receivers_cache.get(sender) is NO_RECEIVERS
-        ]
 
-        if any(logic):
+        Coroutine receivers are run concurrently once the
+        synchronous receivers were called
+        """
+        if self._has_no_receivers(sender):
             return []
 
-        return [
+        sync_receivers, async_receivers = self._live_receivers(sender)
+        responses = [
             (receiver, receiver(signal=self, sender=sender, **named))
-            for receiver in self._live_receivers(sender)
+            for receiver in sync_receivers
         ]
 
+        if async_receivers:
+            async def gather():
+                return await asyncio.gather(*[
+                    receiver(signal=self, sender=sender, **named)
+                    for receiver in async_receivers
+                ])
+
+            results = async_to_sync(gather)()
+            responses.extend(zip(async_receivers, results))
+        return responses
+
+    async def asend(self, sender, **named):
+        """Send signal from a sender to all connected receivers
+        from an asynchronous context. The coroutine receivers
+        are run concurrently while the synchronous ones are
+        run in a thread
+
+        >>> await signal.asend(my_send_function, a=1)
+        """
+        if self._has_no_receivers(sender):
+            return []
+
+        sync_receivers, async_receivers = self._live_receivers(sender)
+
+        def call_sync_receivers():
+            return [
+                (receiver, receiver(signal=self, sender=sender, **named))
+                for receiver in sync_receivers
+            ]
+
+        async def no_sync_receivers():
+            return []
+
+        if sync_receivers:
+            sync_responses = sync_to_async(call_sync_receivers)()
+        else:
+            sync_responses = no_sync_receivers()
+
+        results = await asyncio.gather(
+            sync_responses,
+            *[
+                receiver(signal=self, sender=sender, **named)
+                for receiver in async_receivers
+            ]
+        )
+        responses = list(results[0])
+        responses.extend(zip(async_receivers, results[1:]))
+        return responses
+
     def send_to_all(self, sender, **named):
-        logic = [
-            not self.receivers,
-            self.sender_receivers_cache.get(sender) is NO_RECEIVERS
-        ]
-        if not any(logic):
+        """Send signal from a sender to all connected receivers
+        catching the errors. The exception is returned as the
+        response of the receiver that raised it"""
+        if self._has_no_receivers(sender):
             return []
 
+        sync_receivers, async_receivers = self._live_receivers(sender)
+
         responses = []
-        for receiver in self._live_receivers(sender):
+        for receiver in sync_receivers:
             try:
                 response = receiver(signal=self, sender=sender, **named)
             except Exception as e:
                 responses.append((receiver, e))
             else:
                 responses.append((receiver, response))
+
+        if async_receivers:
+            async def gather():
+                return await asyncio.gather(
+                    *[
+                        receiver(signal=self, sender=sender, **named)
+                        for receiver in async_receivers
+                    ],
+                    return_exceptions=True
+                )
+
+            results = async_to_sync(gather)()
+            responses.extend(zip(async_receivers, results))
         return responses
 
+    def send_in_thread(self, sender, **named) -> Future:
+        """Dispatches the signal from a background thread so that
+        the receivers do not block the spider. The receivers of a
+        signal are called in the order in which the signal was sent.
+        Errors are returned in the result of the future
+
+        >>> future = signal.send_in_thread(spider, current_url=url)
+        """
+        if self._has_no_receivers(sender):
+            future = Future()
+            future.set_result([])
+            return future
+
+        if self._executor is None:
+            with self.lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1,
+                        thread_name_prefix='kryptone-signal'
+                    )
+        return self._executor.submit(self.send_to_all, sender, **named)
+
 
 def function_to_receiver(signal, **kwargs):
     """Transform a function to a signal receiver
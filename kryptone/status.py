@@ -0,0 +1,241 @@
+import asyncio
+import dataclasses
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional, Union
+from urllib.parse import urldefrag
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from kryptone import logger
+from kryptone.conf import settings
+from kryptone.identities import IdentityPool, get_identity_pool
+from kryptone.network import iter_network_events
+
+# Status of the response of the main document using
+# the Navigation Timing API (Chrome 109+) which does
+# not require the performance logs
+NAVIGATION_STATUS_SCRIPT = """
+const entry = performance.getEntriesByType('navigation')[0]
+return entry && entry.responseStatus ? entry.responseStatus : null
+"""
+
+# Status codes returned by servers that
+# do not implement the HEAD method
+HEAD_NOT_ALLOWED_STATUS_CODES = {403, 405, 501}
+
+
+def get_document_status(entries: Iterable[dict[str, Any]], url: Optional[str] = None) -> Optional[int]:
+    """Returns the status of the main document from the network
+    events of the performance logs. The response of the given
+    url is preferred over the first document (e.g. iframes)"""
+    first_status = None
+    url = None if url is None else urldefrag(str(url)).url
+
+    for method, params in iter_network_events(entries):
+        if method != 'Network.responseReceived' or params.get('type') != 'Document':
+            continue
+
+        response = params.get('response', {})
+        status = response.get('status')
+        if url is not None and urldefrag(response.get('url', '')).url == url:
+            return status
+
+        if first_status is None:
+            first_status = status
+    return first_status
+
+
+@dataclasses.dataclass
+class URLStatus:
+    url: str
+    status_code: int
+    # Either HEAD, GET or "browser" when the status
+    # was read from the response of the browser
+    method: str
+    final_url: Optional[str] = None
+    elapsed: float = 0
+    error: Optional[str] = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}[{self.status_code}]: {self.url}>'
+
+    @property
+    def is_broken(self):
+        return self.status_code == 0 or self.status_code >= 400
+
+    def json(self):
+        return dataclasses.asdict(self)
+
+
+class StatusChecker:
+    """Checks the status code of urls. The status of the pages
+    loaded by the browser is read from the browser itself and
+    the other urls are requested with HEAD, falling back to GET,
+    using a pool of keep-alive connections. Lists of urls are
+    checked concurrently
+
+    >>> checker = StatusChecker(max_workers=10, timeout=5)
+    ... statuses = checker.check_many(['http://example.com/a', 'http://example.com/b'])
+    ... statuses['http://example.com/a'].status_code
+    ... 200
+    """
+
+    def __init__(self, *, max_workers: int = 10, timeout: float = 10, head_first: bool = True, identity_pool: Optional[IdentityPool] = None):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.head_first = head_first
+        self.identity_pool = identity_pool or get_identity_pool()
+        self.statuses: dict[str, URLStatus] = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.statuses)} url(s)>'
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_workers=settings.STATUS_CHECK_MAX_WORKERS,
+            timeout=settings.STATUS_CHECK_TIMEOUT
+        )
+
+    @staticmethod
+    def get_key(url: Union[str, Any]) -> str:
+        return urldefrag(str(url)).url
+
+    def record(self, url: Union[str, Any], status_code: int) -> URLStatus:
+        """Records the status of a page that was
+        loaded by the browser"""
+        status = URLStatus(str(url), status_code, method='browser')
+        self.statuses[self.get_key(url)] = status
+        return status
+
+    def get_page_status(self, driver, url: Union[str, Any]) -> URLStatus:
+        """Returns the status of the page loaded in the browser
+        and only sends a request when it cannot be read from
+        the performance logs or the Navigation Timing API"""
+        status = self.statuses.get(self.get_key(url))
+        if status is not None:
+            return status
+
+        try:
+            status_code = driver.execute_script(NAVIGATION_STATUS_SCRIPT)
+        except Exception:
+            status_code = None
+
+        if status_code:
+            return self.record(url, status_code)
+        return self.check(url)
+
+    def request(self, url: str, method: str) -> requests.Response:
+        # The responses are not recorded on the proxies: a HEAD
+        # rejected with a 403 or a third-party link returning
+        # a 429 says nothing about the health of the proxy
+        response = self.identity_pool.fetch(
+            url,
+            method=method,
+            session=self.session,
+            record=False,
+            timeout=self.timeout,
+            allow_redirects=True,
+            stream=True
+        )
+        # The body is never read which allows
+        # the connection to be reused
+        response.close()
+        return response
+
+    def check(self, url: Union[str, Any], use_cache: bool = True) -> URLStatus:
+        key = self.get_key(url)
+        if use_cache and key in self.statuses:
+            return self.statuses[key]
+
+        start_time = time.monotonic()
+        method = 'HEAD' if self.head_first else 'GET'
+        try:
+            response = self.request(str(url), method)
+            if method == 'HEAD' and response.status_code in HEAD_NOT_ALLOWED_STATUS_CODES:
+                method = 'GET'
+                response = self.request(str(url), method)
+        except requests.RequestException as e:
+            status = URLStatus(
+                str(url),
+                0,
+                method=method,
+                elapsed=time.monotonic() - start_time,
+                error=e.__class__.__name__
+            )
+        else:
+            status = URLStatus(
+                str(url),
+                response.status_code,
+                method=method,
+                final_url=response.url,
+                elapsed=time.monotonic() - start_time
+            )
+
+        self.statuses[key] = status
+        return status
+
+    def check_many(self, urls: Iterable[Union[str, Any]]) -> dict[str, URLStatus]:
+        """Checks the urls concurrently. Each url
+        is only requested once"""
+        urls = list({self.get_key(url): str(url) for url in urls}.values())
+        if not urls:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            statuses = list(executor.map(self.check, urls))
+        return dict(zip(urls, statuses))
+
+    async def acheck(self, url: Union[str, Any]) -> URLStatus:
+        return await asyncio.to_thread(self.check, url)
+
+    async def acheck_many(self, urls: Iterable[Union[str, Any]]) -> dict[str, URLStatus]:
+        return await asyncio.to_thread(self.check_many, list(urls))
+
+    def broken_links(self, url_distribution: dict[str, Iterable[Union[str, Any]]]) -> dict[str, list[URLStatus]]:
+        """Checks all the links found on the pages and returns
+        the broken links of each page
+
+        >>> checker.broken_links(self.url_distribution)
+        ... {'http://example.com': [<URLStatus[404]: http://example.com/a>]}
+        """
+        statuses = self.check_many(
+            url for urls in url_distribution.values()
+            for url in urls
+        )
+        logger.info(f'Checked the status of {len(statuses)} link(s)')
+
+        report = {}
+        for page, urls in url_distribution.items():
+            broken = []
+            for url in dict.fromkeys(str(url) for url in urls):
+                status = self.statuses.get(self.get_key(url))
+                if status is not None and status.is_broken:
+                    broken.append(status)
+
+            if broken:
+                report[page] = broken
+        return report
+
+    def close(self):
+        self.session.close()
+
+
+_status_checker: Optional[StatusChecker] = None
+
+
+def get_status_checker() -> StatusChecker:
+    global _status_checker
+    if _status_checker is None:
+        _status_checker = StatusChecker.from_settings()
+    return _status_checker
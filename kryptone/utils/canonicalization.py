@@ -0,0 +1,249 @@
+import copy
+import re
+from fnmatch import fnmatchcase
+from typing import Final, Optional, Union
+from urllib.parse import (parse_qsl, urlencode, urljoin, urlsplit,
+                          urlunsplit)
+
+from kryptone.utils.urls import URL
+
+DEFAULT_PORTS: Final[dict[str, int]] = {
+    'http': 80,
+    'https': 443
+}
+
+# Query parameters that are used for tracking or
+# session purposes and that never change the content
+# of the page that is returned by the server
+DEFAULT_IGNORED_QUERY_PARAMS: Final[tuple[str, ...]] = (
+    'utm_*',
+    'gclid',
+    'gclsrc',
+    'dclid',
+    'fbclid',
+    'msclkid',
+    'yclid',
+    'mc_cid',
+    'mc_eid',
+    '_ga',
+    '_gl',
+    '_hsenc',
+    '_hsmi',
+    'igshid',
+    'sessionid',
+    'session_id',
+    'sid',
+    'phpsessid',
+    'jsessionid',
+    'aspsessionid*',
+    'cfid',
+    'cftoken'
+)
+
+PERCENT_ENCODING = re.compile(r'%([0-9a-fA-F]{2})')
+
+PATH_SESSION_PARAMS = re.compile(
+    r';(?:jsessionid|phpsessid|sid)=[^/?#]*',
+    re.IGNORECASE
+)
+
+UNRESERVED_CHARACTERS: Final[frozenset[str]] = frozenset(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~'
+)
+
+
+def normalize_percent_encoding(value: str) -> str:
+    """Decodes the percent encoded characters that do not
+    need to be encoded and uppercases the remaining ones
+    so that `%7e`, `%7E` and `~` are considered the same
+
+    >>> normalize_percent_encoding('/%7euser/a%2fb')
+    ... '/~user/a%2Fb'
+    """
+    def replace(match: re.Match) -> str:
+        character = chr(int(match.group(1), 16))
+        if character in UNRESERVED_CHARACTERS:
+            return character
+        return f'%{match.group(1).upper()}'
+    return PERCENT_ENCODING.sub(replace, value)
+
+
+class URLCanonicalizer:
+    """Collapses equivalent urls to one single canonical
+    string before they are deduplicated by the spider. The
+    scheme and the host are lowercased, default ports and
+    fragments are removed, tracking or session query parameters
+    are dropped and the remaining ones are sorted
+
+    >>> canonicalizer = URLCanonicalizer(ignored_params=['sort'])
+    ... canonicalizer('HTTP://Example.com:80/a/?b=2&a=1&utm_source=x')
+    ... 'http://example.com/a/?a=1&b=2'
+
+    Trailing slashes are kept by default since `/a` and `/a/` can
+    be different pages: use `remove_trailing_slash` to remove them
+
+    The results are memoized per raw url so that links that appear
+    on every page of a website are only processed once
+    """
+
+    def __init__(self, *, allowed_params: Optional[list[str]] = None, ignored_params: Optional[list[str]] = None, ignore_queries: bool = False, remove_trailing_slash: bool = False, use_default_ignored_params: bool = True, use_canonical_links: bool = True, cache_size: int = 50_000):
+        # When provided, only the query parameters that
+        # match these patterns are kept on the url
+        self.allowed_params = [
+            param.lower() for param in allowed_params or []
+        ]
+
+        ignored = list(ignored_params or [])
+        if use_default_ignored_params:
+            ignored.extend(DEFAULT_IGNORED_QUERY_PARAMS)
+        self.ignored_params = [param.lower() for param in ignored]
+
+        self.ignore_queries = ignore_queries
+        self.remove_trailing_slash = remove_trailing_slash
+        self.use_canonical_links = use_canonical_links
+        self.cache_size = cache_size
+        self.cache: dict[tuple[str, Optional[str]], str] = {}
+        # Maps the canonical url of a page to the url
+        # declared in its <link rel="canonical"> tag
+        self.aliases: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.cache)}>'
+
+    def __call__(self, url: Union[str, URL], base: Optional[str] = None) -> str:
+        return self.canonicalize(url, base=base)
+
+    def is_ignored_param(self, name: str) -> bool:
+        name = name.lower()
+        if self.allowed_params:
+            if not any(fnmatchcase(name, pattern) for pattern in self.allowed_params):
+                return True
+        return any(fnmatchcase(name, pattern) for pattern in self.ignored_params)
+
+    def normalize_netloc(self, scheme: str, netloc: str) -> str:
+        userinfo, _, host = netloc.rpartition('@')
+
+        port = None
+        if host.startswith('['):
+            # IPv6 addresses e.g. [::1]:8080
+            end = host.find(']')
+            host, remainder = host[:end + 1], host[end + 1:]
+            if remainder.startswith(':'):
+                port = remainder[1:]
+        elif ':' in host:
+            host, port = host.rsplit(':', maxsplit=1)
+
+        host = host.lower().rstrip('.')
+        if port == '' or (port is not None and port.isdigit() and int(port) == DEFAULT_PORTS.get(scheme)):
+            port = None
+
+        if port is not None:
+            host = f'{host}:{port}'
+
+        if userinfo:
+            return f'{userinfo}@{host}'
+        return host
+
+    def normalize_path(self, path: str) -> str:
+        path = PATH_SESSION_PARAMS.sub('', path)
+        path = normalize_percent_encoding(path)
+
+        if path == '':
+            return '/'
+
+        if self.remove_trailing_slash and path != '/':
+            path = path.rstrip('/') or '/'
+        return path
+
+    def normalize_query(self, query: str) -> str:
+        if self.ignore_queries or query == '':
+            return ''
+
+        items = parse_qsl(query, keep_blank_values=True)
+        items = [item for item in items if not self.is_ignored_param(item[0])]
+        # The sort is stable which means that repeated
+        # parameters keep their original relative order
+        items.sort(key=lambda item: item[0])
+        return urlencode(items)
+
+    def _canonicalize(self, raw_url: str, base: Optional[str] = None) -> str:
+        if base and raw_url.startswith('/') and not raw_url.startswith('//'):
+            raw_url = urljoin(base, raw_url)
+
+        try:
+            parts = urlsplit(raw_url)
+        except ValueError:
+            return raw_url
+
+        scheme = parts.scheme.lower()
+        # Do not try to normalize urls such as
+        # mailto:, tel: or javascript:
+        if scheme not in DEFAULT_PORTS or not parts.netloc:
+            return raw_url
+
+        return urlunsplit((
+            scheme,
+            self.normalize_netloc(scheme, parts.netloc),
+            self.normalize_path(parts.path),
+            self.normalize_query(parts.query),
+            ''
+        ))
+
+    def canonicalize(self, url: Union[str, URL], base: Optional[str] = None) -> str:
+        """Returns the canonical string for the given url. Relative
+        paths are joined to `base` before being normalized"""
+        raw_url = str(url).strip()
+        key = (raw_url, base)
+
+        try:
+            result = self.cache[key]
+        except KeyError:
+            self.misses = self.misses + 1
+        else:
+            self.hits = self.hits + 1
+            return self.aliases.get(result, result)
+
+        result = self._canonicalize(raw_url, base=base)
+
+        if len(self.cache) >= self.cache_size:
+            # Drop the oldest half of the cache instead
+            # of clearing it completly so that the links
+            # present on every page stay memoized
+            for old_key in list(self.cache)[:self.cache_size // 2]:
+                del self.cache[old_key]
+        self.cache[key] = result
+        return self.aliases.get(result, result)
+
+    def register_alias(self, url: Union[str, URL], canonical_url: Union[str, URL]) -> str:
+        """Registers the `<link rel="canonical">` of a page so that
+        any future link pointing to `url` resolves to the canonical
+        url declared by the website"""
+        canonical = self.canonicalize(canonical_url)
+        current = self.canonicalize(url)
+        if current != canonical:
+            self.aliases[current] = canonical
+        return canonical
+
+    def copy(self, **options) -> 'URLCanonicalizer':
+        """Returns a copy of the canonicalizer with its own
+        cache and aliases, optionally changing some options
+
+        >>> canonicalizer.copy(ignore_queries=True)
+        """
+        instance = copy.copy(self)
+        for name, value in options.items():
+            setattr(instance, name, value)
+
+        instance.cache = {}
+        instance.aliases = {}
+        instance.hits = 0
+        instance.misses = 0
+        return instance
+
+    def clear(self):
+        self.cache.clear()
+        self.aliases.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,190 @@
+import dataclasses
+import json
+import os
+import pathlib
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Union
+
+from kryptone.conf import settings
+from kryptone.utils.encoders import DefaultJsonEncoder
+
+if TYPE_CHECKING:
+    import pyarrow
+
+# Key of the schema metadata used to store the
+# information required to rebuild the original data
+METADATA_KEY = b'kryptone'
+
+
+def get_pyarrow():
+    try:
+        import pyarrow
+        from pyarrow import parquet
+    except ImportError:
+        raise ImportError(
+            "pyarrow library is required to use Parquet files. "
+            "Please install it via 'pip install pyarrow'"
+        )
+    return pyarrow, parquet
+
+
+def normalize_value(value: Any):
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+
+    if isinstance(value, (set, tuple)):
+        return list(value)
+
+    if not isinstance(value, (str, int, float, bool, list, dict)) and value is not None:
+        # URL, UUID, dates...
+        return str(value)
+    return value
+
+
+def to_arrow_table(data: Union[list[Any], dict[str, Any], Any]) -> 'pyarrow.Table':
+    """Converts the data saved by the spider to an Arrow table.
+    There are three layouts:
+
+    * records: a list of dicts or dataclasses (e.g. products)
+      where each key becomes a column
+    * values: a list of scalars (e.g. seen urls) stored in
+      a single `value` column
+    * mapping: a dict (e.g. cache, url distribution) where the
+      lists of strings are stored as `key`/`value` rows and the
+      other entries are kept in the metadata of the schema
+
+    >>> table = to_arrow_table({'spider': 'MySpider', 'urls_to_visit': ['http://example.com']})
+    ... table.column('value')
+    """
+    pyarrow, _ = get_pyarrow()
+
+    if isinstance(data, dict):
+        keys, values, extra = [], [], {}
+        for key, value in data.items():
+            value = normalize_value(value)
+            if isinstance(value, list):
+                items = [normalize_value(item) for item in value]
+                if all(isinstance(item, str) for item in items):
+                    keys.extend([str(key)] * len(items))
+                    values.extend(items)
+                    continue
+            extra[str(key)] = value
+
+        metadata = {
+            'layout': 'mapping',
+            'keys': list(map(str, data.keys())),
+            'extra': extra
+        }
+        table = pyarrow.table({
+            'key': pyarrow.array(keys, type=pyarrow.string()),
+            'value': pyarrow.array(values, type=pyarrow.string())
+        })
+    else:
+        if dataclasses.is_dataclass(data) or not isinstance(data, (list, tuple, set)):
+            data = [data]
+
+        items = [normalize_value(item) for item in data]
+        if items and all(isinstance(item, dict) for item in items):
+            metadata = {'layout': 'records'}
+            table = pyarrow.Table.from_pylist([
+                {key: normalize_value(value) for key, value in item.items()}
+                for item in items
+            ])
+        else:
+            # Rows from csv files are lists
+            # that contain one single value
+            items = [
+                item[0] if isinstance(item, list) and len(item) == 1 else item
+                for item in items
+            ]
+            metadata = {'layout': 'values'}
+            table = pyarrow.table({'value': pyarrow.array(items)})
+
+    encoded_metadata = json.dumps(metadata, cls=DefaultJsonEncoder)
+    return table.replace_schema_metadata({METADATA_KEY: encoded_metadata})
+
+
+def get_table_metadata(table: 'pyarrow.Table') -> dict[str, Any]:
+    metadata = table.schema.metadata or {}
+    if METADATA_KEY not in metadata:
+        return {'layout': 'records'}
+    return json.loads(metadata[METADATA_KEY])
+
+
+def from_arrow_table(table: 'pyarrow.Table'):
+    """Converts an Arrow table created with `to_arrow_table`
+    back to the original Python data"""
+    metadata = get_table_metadata(table)
+    layout = metadata.get('layout')
+
+    if layout == 'mapping':
+        data = {key: [] for key in metadata.get('keys', [])}
+        for key, value in zip(table.column('key').to_pylist(), table.column('value').to_pylist()):
+            data.setdefault(key, []).append(value)
+
+        for key, value in metadata.get('extra', {}).items():
+            data[key] = value
+        return data
+
+    if layout == 'values':
+        return table.column('value').to_pylist()
+    return table.to_pylist()
+
+
+def write_parquet_table(path: Union[str, pathlib.Path], table: 'pyarrow.Table'):
+    """Writes the table to a Parquet file using the compression
+    and the row group size defined in the settings"""
+    _, parquet = get_pyarrow()
+
+    # The table is written to a temporary file first
+    # since it can be backed by a memory map of the
+    # file that is being replaced
+    path = pathlib.Path(path)
+    temporary_path = path.with_name(f'{path.name}.tmp')
+    parquet.write_table(
+        table,
+        temporary_path,
+        compression=settings.PARQUET_COMPRESSION,
+        row_group_size=settings.PARQUET_ROW_GROUP_SIZE
+    )
+    os.replace(temporary_path, path)
+
+
+def read_parquet_table(path: Union[str, pathlib.Path], columns: Optional[list[str]] = None, filters: Optional[list[tuple[str, str, Any]]] = None) -> 'pyarrow.Table':
+    """Reads a Parquet file using a memory map. Only the
+    given columns and the row groups that can match the
+    filters are read
+
+    >>> read_parquet_table('cache.parquet', filters=[('key', '=', 'urls_to_visit')])
+    """
+    _, parquet = get_pyarrow()
+    return parquet.read_table(
+        path,
+        columns=columns,
+        filters=filters,
+        memory_map=True
+    )
+
+
+def write_parquet_document(path: Union[str, pathlib.Path], data: Any):
+    write_parquet_table(path, to_arrow_table(data))
+
+
+def read_parquet_document(path: Union[str, pathlib.Path]):
+    return from_arrow_table(read_parquet_table(path))
+
+
+def iter_parquet_values(path: Union[str, pathlib.Path], key: str, batch_size: int = 10_000) -> Iterator[str]:
+    """Iterates over the values of a key of a mapping stored
+    in a Parquet file e.g. the urls to visit of the cache
+    without loading the whole file in memory
+
+    >>> list(iter_parquet_values('cache.parquet', 'urls_to_visit'))
+    ... ['http://example.com']
+    """
+    pyarrow, parquet = get_pyarrow()
+    from pyarrow import compute
+
+    parquet_file = parquet.ParquetFile(path, memory_map=True)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=['key', 'value']):
+        mask = compute.equal(batch.column('key'), pyarrow.scalar(key))
+        yield from batch.filter(mask).column('value').to_pylist()
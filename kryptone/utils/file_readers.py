@@ -1,13 +1,26 @@
 import csv
+import gzip
+import io
 import itertools
 import json
+import mmap
+import os
+import pathlib
+import tempfile
+from contextlib import contextmanager
 from functools import lru_cache
-from typing import Callable
+from typing import IO, Callable, Iterator, Optional, Union
 
 from kryptone.conf import settings
 from kryptone.utils.encoders import DefaultJsonEncoder
 from kryptone.utils.deprecation import deprecated
 
+GZIP_MAGIC_NUMBER = b'\x1f\x8b'
+
+ZSTD_MAGIC_NUMBER = b'\x28\xb5\x2f\xfd'
+
+COMPRESSION_EXTENSIONS = ('.gz', '.zst')
+
 
 def tokenize(func: Callable[[str], str]):
     @lru_cache(maxsize=100)
@@ -111,3 +124,176 @@ def write_text_document(filename: str, data: str, encoding: str = 'utf-8'):
     path = get_media_folder(filename)
     with open(path, mode='w', encoding=encoding) as f:
         f.write(data)
+
+
+@contextmanager
+def atomic_write(path: Union[str, pathlib.Path], mode: str = 'w', encoding: str = 'utf-8', newline: Optional[str] = None):
+    """Writes to a temporary file which replaces the file
+    once it was completely written so that a crash never
+    leaves a partially written file
+
+    >>> with atomic_write('cache.json') as f:
+    ...     json.dump(data, f)
+    """
+    path = pathlib.Path(path)
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=path.parent,
+        prefix=f'.{path.name}.',
+        suffix='.tmp'
+    )
+
+    if 'b' in mode:
+        encoding = None
+
+    try:
+        with open(descriptor, mode=mode, encoding=encoding, newline=newline) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        pathlib.Path(temporary_path).unlink(missing_ok=True)
+        raise
+
+
+def open_stream(path: Union[str, pathlib.Path]) -> IO[bytes]:
+    """Opens a file in binary mode and transparently decompresses
+    gzip or zstd files. The compression is detected using the magic
+    number of the file instead of the extension"""
+    stream = io.BufferedReader(open(path, mode='rb'))
+    header = stream.peek(4)[:4]
+
+    if header[:2] == GZIP_MAGIC_NUMBER:
+        return gzip.GzipFile(fileobj=stream)
+
+    if header == ZSTD_MAGIC_NUMBER:
+        try:
+            import zstandard
+        except ImportError:
+            stream.close()
+            raise ImportError(
+                "zstandard library is required to read zstd compressed files. "
+                "Please install it via 'pip install zstandard'"
+            )
+        decompressor = zstandard.ZstdDecompressor()
+        return decompressor.stream_reader(stream, closefd=True)
+    return stream
+
+
+def is_compressed(path: Union[str, pathlib.Path]) -> bool:
+    with open(path, mode='rb') as f:
+        header = f.read(4)
+    return header[:2] == GZIP_MAGIC_NUMBER or header == ZSTD_MAGIC_NUMBER
+
+
+def iter_text_lines(path: Union[str, pathlib.Path], encoding: str = 'utf-8') -> Iterator[str]:
+    """Streams the non empty lines of a plain text file. Uncompressed
+    files are memory mapped so that very large files are read
+    without being loaded in memory
+
+    >>> for line in iter_text_lines('urls.txt'):
+    ...     print(line)
+    """
+    if is_compressed(path):
+        with io.TextIOWrapper(open_stream(path), encoding=encoding) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+        return
+
+    with open(path, mode='rb') as f:
+        try:
+            mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return
+
+        with mapped_file:
+            for line in iter(mapped_file.readline, b''):
+                line = line.strip()
+                if line:
+                    yield line.decode(encoding)
+
+
+def iter_csv_rows(f: IO[str]) -> Iterator[str]:
+    """Streams the non empty cells of each row of a csv file"""
+    for row in csv.reader(f):
+        for cell in row:
+            cell = cell.strip()
+            if cell:
+                yield cell
+
+
+def iter_json_lines(f: IO[str]) -> Iterator[Union[dict, list, str]]:
+    """Streams the items of a JSON lines (NDJSON) file"""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_json_array(f: IO[str], chunk_size: int = 65536) -> Iterator[Union[dict, list, str]]:
+    """Incrementally parses a JSON array and yields its items
+    one by one without loading the whole document in memory
+
+    >>> with open('start_urls.json') as f:
+    ...     for item in iter_json_array(f):
+    ...         print(item)
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    is_eof = False
+    has_started = False
+
+    def read_more():
+        nonlocal buffer, position, is_eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            is_eof = True
+        # Drop the part of the buffer that
+        # was already parsed
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position = position + 1
+
+        if position >= len(buffer):
+            if is_eof:
+                if has_started:
+                    raise ValueError('Unexpected end of JSON array')
+                return
+            read_more()
+            continue
+
+        if not has_started:
+            if buffer[position] != '[':
+                raise ValueError('The JSON document should be an array')
+            has_started = True
+            position = position + 1
+            continue
+
+        if buffer[position] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if is_eof:
+                raise
+            # The item is incomplete and
+            # needs more data to be decoded
+            read_more()
+            continue
+
+        if end >= len(buffer) and not is_eof:
+            # Numbers at the very end of the buffer
+            # could have been truncated
+            read_more()
+            continue
+
+        position = end
+        yield item
@@ -1,19 +1,25 @@
+import functools
 import pathlib
 import random
-from typing import Callable
+from typing import Callable, Optional, Sequence
 
 from kryptone.conf import settings
 from kryptone.utils.file_readers import read_document
 
 
-def random_user_agent(func: Callable[[pathlib.Path], str]) -> Callable[[], str]:
-    def wrapper():
-        path = settings.GLOBAL_KRYPTONE_PATH / 'data/user_agents.txt'
-        data = func(path)
+@functools.cache
+def load_user_agents(path: Optional[pathlib.Path] = None) -> tuple[str, ...]:
+    """Reads the user agents once and keeps
+    them in memory for the next calls"""
+    path = path or settings.GLOBAL_KRYPTONE_PATH / 'data/user_agents.txt'
+    data = read_document(path)
+    return tuple(line.strip() for line in data.split('\n') if line.strip())
+
 
-        user_agents = data.split('\n')
-        return random.choice(user_agents)
+def random_user_agent(func: Callable[[], Sequence[str]]) -> Callable[[], str]:
+    def wrapper():
+        return random.choice(func())
     return wrapper
 
 
-RANDOM_USER_AGENT = random_user_agent(read_document)
+RANDOM_USER_AGENT = random_user_agent(load_user_agents)
@@ -0,0 +1,319 @@
+import json
+import pathlib
+import re
+import time
+from typing import TYPE_CHECKING, Any, Optional, Union
+from urllib.parse import urlparse
+
+import requests
+
+from kryptone import logger
+from kryptone.conf import settings
+from kryptone.utils.file_readers import atomic_write
+from kryptone.utils.randomizers import RANDOM_USER_AGENT
+from kryptone.utils.urls import URL, BaseURLTestsMixin
+
+if TYPE_CHECKING:
+    from kryptone.governor import RateGovernor
+
+
+class RobotsRules:
+    """The compiled allow and disallow rules of a robots.txt
+    file for one user agent. Literal rules are stored in a
+    trie so that a path is matched in one single pass over
+    its characters. Rules using wildcards are compiled to
+    regexes. The most specific (longest) rule that matches
+    the path wins and allow rules win ties
+
+    >>> rules = parse_robots('User-agent: *\\nDisallow: /admin', 'Kryptone')
+    ... rules.is_allowed('/admin/users')
+    ... False
+    """
+
+    def __init__(self, *, disallow_all: bool = False):
+        self.trie: dict[str, Any] = {}
+        self.wildcard_rules: list[tuple[re.Pattern, int, bool]] = []
+        self.crawl_delay: Optional[float] = None
+        self.sitemaps: list[str] = []
+        self.disallow_all = disallow_all
+        self.rules_count = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.rules_count} rule(s)>'
+
+    def add_rule(self, pattern: str, allow: bool):
+        if not pattern:
+            # An empty "Disallow:" allows everything
+            return
+
+        self.rules_count = self.rules_count + 1
+        if '*' in pattern or pattern.endswith('$'):
+            is_anchored = pattern.endswith('$')
+            if is_anchored:
+                pattern = pattern[:-1]
+
+            regex = '.*'.join(map(re.escape, pattern.split('*')))
+            if is_anchored:
+                regex = regex + '$'
+            self.wildcard_rules.append((re.compile(regex), len(pattern), allow))
+            return
+
+        node = self.trie
+        for character in pattern:
+            node = node.setdefault(character, {})
+        # When the same path is both allowed and
+        # disallowed, the allow rule is used
+        node[None] = node.get(None, False) or allow
+
+    def match(self, path: str) -> Optional[tuple[int, bool]]:
+        """Returns the length and the type of the
+        most specific rule matching the path"""
+        result = None
+
+        node = self.trie
+        for i, character in enumerate(path):
+            node = node.get(character)
+            if node is None:
+                break
+            if None in node:
+                result = (i + 1, node[None])
+
+        for regex, length, allow in self.wildcard_rules:
+            if result is not None and length < result[0]:
+                continue
+
+            if regex.match(path):
+                if result is None or length > result[0] or (length == result[0] and allow):
+                    result = (length, allow)
+        return result
+
+    def is_allowed(self, path: str) -> bool:
+        if self.disallow_all:
+            return False
+
+        if path == '/robots.txt':
+            return True
+
+        result = self.match(path or '/')
+        if result is None:
+            return True
+        return result[1]
+
+
+def parse_robots(content: str, user_agent: str) -> RobotsRules:
+    """Parses the content of a robots.txt file and returns
+    the rules of the group matching the user agent or the
+    rules of the "*" group if no group matches"""
+    user_agent = user_agent.lower()
+    groups: list[tuple[list[str], list[tuple[str, str]]]] = []
+    sitemaps = []
+
+    current_agents: list[str] = []
+    current_rules: list[tuple[str, str]] = []
+    is_reading_agents = False
+
+    for line in content.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line or ':' not in line:
+            continue
+
+        name, value = line.split(':', 1)
+        name = name.strip().lower()
+        value = value.strip()
+
+        if name == 'user-agent':
+            if not is_reading_agents:
+                current_agents = []
+                current_rules = []
+                groups.append((current_agents, current_rules))
+                is_reading_agents = True
+            current_agents.append(value.lower())
+        elif name in ('allow', 'disallow', 'crawl-delay'):
+            is_reading_agents = False
+            if groups:
+                current_rules.append((name, value))
+        elif name == 'sitemap':
+            sitemaps.append(value)
+
+    # The most specific user agent matching our
+    # user agent is used, otherwise the "*" group
+    best_agent = None
+    for agents, _ in groups:
+        for agent in agents:
+            if agent != '*' and agent in user_agent:
+                if best_agent is None or len(agent) > len(best_agent):
+                    best_agent = agent
+
+    selected_agent = best_agent or '*'
+
+    rules = RobotsRules()
+    rules.sitemaps = sitemaps
+    for agents, group_rules in groups:
+        if selected_agent not in agents:
+            continue
+
+        for name, value in group_rules:
+            if name == 'crawl-delay':
+                try:
+                    rules.crawl_delay = float(value)
+                except ValueError:
+                    continue
+            else:
+                rules.add_rule(value, allow=name == 'allow')
+    return rules
+
+
+class RobotsCache:
+    """Fetches the robots.txt file of each host once and keeps the
+    compiled rules for `ttl` seconds. The files are persisted
+    in a JSON file so that they are not fetched again on the next
+    run. The `Crawl-delay` of a host is sent to the rate governor
+
+    >>> cache = RobotsCache(user_agent='Kryptone')
+    ... cache.is_allowed('http://example.com/admin')
+    ... False
+    """
+
+    # Number of seconds during which a host with an
+    # unreachable robots.txt file is not crawled
+    error_ttl = 600
+
+    def __init__(self, *, user_agent: str = 'Kryptone', ttl: float = 86400, cache_path: Optional[Union[str, pathlib.Path]] = None, timeout: float = 10, governor: Optional['RateGovernor'] = None):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.cache_path = None if cache_path is None else pathlib.Path(cache_path)
+        self.timeout = timeout
+        self.governor = governor
+        # origin -> (expiration time, rules)
+        self.rules: dict[str, tuple[float, RobotsRules]] = {}
+        self.documents: dict[str, dict[str, Any]] = {}
+        self.load()
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self.rules)} host(s)>'
+
+    @classmethod
+    def from_settings(cls, governor: Optional['RateGovernor'] = None):
+        return cls(
+            user_agent=settings.ROBOTS_USER_AGENT,
+            ttl=settings.ROBOTS_CACHE_TTL,
+            cache_path=pathlib.Path(settings.MEDIA_FOLDER).joinpath(
+                settings.ROBOTS_CACHE_FILE_NAME
+            ),
+            governor=governor
+        )
+
+    @staticmethod
+    def get_origin(url: Union[str, URL]) -> str:
+        url_object = url.url_object if isinstance(url, URL) else urlparse(url)
+        return f'{url_object.scheme}://{url_object.netloc}'
+
+    def load(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return False
+
+        try:
+            with open(self.cache_path, mode='r', encoding='utf-8') as f:
+                documents = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+
+        now = time.time()
+        for origin, document in documents.items():
+            if now - document.get('fetched_at', 0) < self.ttl:
+                self.documents[origin] = document
+        return True
+
+    def save(self):
+        if self.cache_path is None or not self.cache_path.parent.is_dir():
+            return False
+
+        with atomic_write(self.cache_path) as f:
+            json.dump(self.documents, f)
+        return True
+
+    def fetch(self, origin: str) -> tuple[int, str]:
+        try:
+            response = requests.get(
+                f'{origin}/robots.txt',
+                headers={'User-Agent': RANDOM_USER_AGENT()},
+                timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            logger.warning(f'Could not fetch robots.txt for {origin}: {e}')
+            return 0, ''
+        return response.status_code, response.text
+
+    def compile(self, status_code: int, content: str) -> RobotsRules:
+        if 200 <= status_code < 300:
+            return parse_robots(content, self.user_agent)
+
+        if 400 <= status_code < 500:
+            # A missing robots.txt file
+            # allows all the urls
+            return RobotsRules()
+
+        # The server is unreachable or failing in
+        # which case the whole host is disallowed
+        return RobotsRules(disallow_all=True)
+
+    def get_rules(self, url: Union[str, URL]) -> RobotsRules:
+        origin = self.get_origin(url)
+        now = time.time()
+
+        cached = self.rules.get(origin)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        document = self.documents.get(origin)
+        if document is None or now - document['fetched_at'] >= self.ttl:
+            status_code, content = self.fetch(origin)
+            document = {
+                'fetched_at': now,
+                'status_code': status_code,
+                'content': content
+            }
+
+            if status_code == 0 or status_code >= 500:
+                # Errors are not persisted and
+                # are retried after a short time
+                rules = self.compile(status_code, content)
+                self.rules[origin] = (now + self.error_ttl, rules)
+                return rules
+
+            self.documents[origin] = document
+            self.save()
+
+        rules = self.compile(document['status_code'], document['content'])
+        self.rules[origin] = (document['fetched_at'] + self.ttl, rules)
+
+        if self.governor is not None and rules.crawl_delay is not None:
+            self.governor.set_crawl_delay(url, rules.crawl_delay)
+        return rules
+
+    def is_allowed(self, url: Union[str, URL]) -> bool:
+        url_object = url.url_object if isinstance(url, URL) else urlparse(url)
+        path = url_object.path or '/'
+        if url_object.query:
+            path = f'{path}?{url_object.query}'
+        return self.get_rules(url).is_allowed(path)
+
+
+class RobotsTxtTest(BaseURLTestsMixin):
+    """Url filter that excludes the urls that are
+    disallowed by the robots.txt file of their host"""
+
+    summary_message = "{count} url(s) disallowed by robots.txt e.g. {samples}"
+
+    def __init__(self, cache: RobotsCache, name: str = 'robots_txt'):
+        self.name = name
+        self.cache = cache
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.cache}>'
+
+    def __call__(self, url):
+        if not self.cache.is_allowed(url):
+            self.record_rejection(url)
+            return True
+        return False
@@ -0,0 +1,303 @@
+import dataclasses
+import datetime
+import gzip
+import io
+import pathlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Iterator, Optional, Union
+from xml.etree.ElementTree import ParseError, iterparse
+
+from kryptone import logger
+from kryptone.identities import get_identity_pool
+from kryptone.utils.file_readers import GZIP_MAGIC_NUMBER
+from kryptone.utils.urls import URL
+
+_SENTINEL = object()
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parses the W3C datetime used in the `<lastmod>`
+    tag of a sitemap. Naive dates are considered to be UTC
+
+    >>> parse_lastmod('2024-01-01')
+    ... datetime.datetime(2024, 1, 1, 0, 0, tzinfo=datetime.timezone.utc)
+    """
+    if not value:
+        return None
+
+    try:
+        date = datetime.datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return date
+
+
+@dataclasses.dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: Optional[datetime.datetime] = None
+    priority: Optional[float] = None
+    changefreq: Optional[str] = None
+
+
+def local_name(tag: str) -> str:
+    """Removes the namespace from an XML tag
+    e.g. {http://www.sitemaps.org/schemas/sitemap/0.9}url"""
+    return tag.rpartition('}')[-1]
+
+
+def iter_sitemap(source: IO[bytes]) -> Iterator[tuple[str, SitemapEntry]]:
+    """Incrementally parses a sitemap or a sitemap index
+    and yields `('url', entry)` or `('sitemap', entry)` items
+    without loading the whole document in memory"""
+    root = None
+    for event, element in iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+
+        name = local_name(element.tag)
+        if name not in ('url', 'sitemap'):
+            continue
+
+        values = {}
+        for child in element:
+            values[local_name(child.tag)] = (child.text or '').strip()
+
+        loc = values.get('loc')
+        if loc:
+            try:
+                priority = float(values['priority'])
+            except (KeyError, ValueError):
+                priority = None
+
+            entry = SitemapEntry(
+                loc=loc,
+                lastmod=parse_lastmod(values.get('lastmod')),
+                priority=priority,
+                changefreq=values.get('changefreq') or None
+            )
+            yield name, entry
+
+        # Free the memory used by the elements
+        # that were already processed
+        element.clear()
+        if root is not None:
+            root.clear()
+
+
+class SitemapLoader:
+    """Streams the urls of a sitemap. Sitemap indexes
+    are resolved by fetching the child sitemaps concurrently
+    and gzipped sitemaps are decompressed on the fly
+
+    >>> loader = SitemapLoader('https://example.com/sitemap.xml', batch_size=500)
+    ... for batch in loader:
+    ...     print(batch)
+
+    Entries with a `lastmod` older than `since` or a priority
+    below `min_priority` are skipped. Each sitemap is only fetched
+    once and sitemap indexes nested deeper than `max_depth` are ignored
+    """
+
+    def __init__(self, url: Union[str, URL, pathlib.Path], *, since: Optional[datetime.datetime] = None, min_priority: Optional[float] = None, batch_size: int = 1000, max_workers: int = 4, max_depth: int = 3, timeout: int = 30):
+        self.url = url
+        self.since = since
+        self.min_priority = min_priority
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        # The root sitemap is at depth 0 and the
+        # children of a sitemap index at depth 1
+        self.max_depth = max(1, max_depth)
+        self.timeout = timeout
+        # Sitemaps that were already fetched which
+        # prevents indexes that reference each
+        # other from being loaded endlessly
+        self.visited_sitemaps: set[str] = set()
+        self.lock = threading.Lock()
+        self.skipped_count = 0
+        self.entries_count = 0
+        self.sitemaps_count = 0
+
+        if self.since is not None and self.since.tzinfo is None:
+            self.since = self.since.replace(tzinfo=datetime.timezone.utc)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.url}>'
+
+    def __iter__(self):
+        return self.iter_batches()
+
+    def is_valid_entry(self, entry: SitemapEntry) -> bool:
+        if self.since is not None and entry.lastmod is not None:
+            if entry.lastmod < self.since:
+                return False
+
+        if self.min_priority is not None and entry.priority is not None:
+            if entry.priority < self.min_priority:
+                return False
+        return True
+
+    def mark_visited(self, url: Union[str, URL, pathlib.Path]) -> bool:
+        """Marks the sitemap as visited and returns
+        False when it was already visited"""
+        location = str(url)
+        with self.lock:
+            if location in self.visited_sitemaps:
+                return False
+            self.visited_sitemaps.add(location)
+            return True
+
+    def open(self, url: Union[str, URL, pathlib.Path]) -> tuple[IO[bytes], Any]:
+        """Opens a stream to the sitemap which can either be
+        an url or a local file. Returns the stream and the
+        object that needs to be closed afterwards"""
+        location = str(url)
+
+        if isinstance(url, pathlib.Path) or not location.startswith(('http://', 'https://')):
+            stream = open(location, mode='rb')
+            closable = stream
+        else:
+            response = get_identity_pool().fetch(
+                location,
+                stream=True,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            # Transparently decode the content when the
+            # server uses Content-Encoding: gzip
+            response.raw.decode_content = True
+            stream = response.raw
+            closable = response
+
+        # Gzipped sitemaps (.xml.gz) are detected using
+        # the magic number of the file instead of relying
+        # on the extension or the content type
+        stream = io.BufferedReader(stream)
+        if stream.peek(2)[:2] == GZIP_MAGIC_NUMBER:
+            stream = gzip.GzipFile(fileobj=stream)
+        return stream, closable
+
+    def parse(self, url: Union[str, URL, pathlib.Path]) -> Iterator[tuple[str, SitemapEntry]]:
+        stream, closable = self.open(url)
+        self.sitemaps_count = self.sitemaps_count + 1
+        try:
+            yield from iter_sitemap(stream)
+        except (ParseError, OSError) as e:
+            logger.error(f'Could not parse sitemap {url}: {e}')
+        finally:
+            closable.close()
+
+    @staticmethod
+    def _put(items: queue.Queue, stop: threading.Event, item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=1)
+            except queue.Full:
+                continue
+            else:
+                return True
+        return False
+
+    def _collect(self, url: Union[str, URL], items: queue.Queue, stop: threading.Event, depth: int = 1):
+        """Worker that parses a child sitemap and pushes
+        batches of entries to the queue"""
+        batch: list[SitemapEntry] = []
+        try:
+            for name, entry in self.parse(url):
+                if name == 'sitemap':
+                    if depth >= self.max_depth:
+                        logger.warning(
+                            f'Sitemap {entry.loc} is nested too '
+                            f'deeply (max depth: {self.max_depth})'
+                        )
+                        continue
+
+                    # Nested sitemap indexes are rare so
+                    # they are resolved in the same worker
+                    if self.mark_visited(entry.loc):
+                        self._collect(entry.loc, items, stop, depth=depth + 1)
+                    continue
+
+                batch.append(entry)
+                if len(batch) >= self.batch_size:
+                    if not self._put(items, stop, batch):
+                        return
+                    batch = []
+        except Exception as e:
+            logger.error(f'Failed to load sitemap {url}: {e}')
+
+        if batch:
+            self._put(items, stop, batch)
+
+    def filter_batch(self, batch: list[SitemapEntry]) -> list[SitemapEntry]:
+        self.entries_count = self.entries_count + len(batch)
+        valid_entries = list(filter(self.is_valid_entry, batch))
+        self.skipped_count = self.skipped_count + \
+            (len(batch) - len(valid_entries))
+        return valid_entries
+
+    def iter_batches(self) -> Iterator[list[SitemapEntry]]:
+        """Yields batches of valid sitemap entries"""
+        child_sitemaps: list[str] = []
+        batch: list[SitemapEntry] = []
+
+        self.mark_visited(self.url)
+        for name, entry in self.parse(self.url):
+            if name == 'sitemap':
+                if self.since is not None and entry.lastmod is not None:
+                    # The child sitemap was not modified
+                    # since our last visit
+                    if entry.lastmod < self.since:
+                        continue
+
+                if self.mark_visited(entry.loc):
+                    child_sitemaps.append(entry.loc)
+                continue
+
+            batch.append(entry)
+            if len(batch) >= self.batch_size:
+                yield self.filter_batch(batch)
+                batch = []
+
+        if batch:
+            yield self.filter_batch(batch)
+
+        if not child_sitemaps:
+            return
+
+        logger.info(f'Loading {len(child_sitemaps)} child sitemap(s)')
+
+        items = queue.Queue(maxsize=self.max_workers * 2)
+        stop = threading.Event()
+
+        def worker(url):
+            try:
+                self._collect(url, items, stop)
+            finally:
+                self._put(items, stop, _SENTINEL)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for url in child_sitemaps:
+                executor.submit(worker, url)
+
+            remaining = len(child_sitemaps)
+            while remaining > 0:
+                item = items.get()
+                if item is _SENTINEL:
+                    remaining = remaining - 1
+                    continue
+                yield self.filter_batch(item)
+        finally:
+            # Unblock the workers that might still be
+            # waiting to put items in the queue when
+            # the consumer stops early
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,231 @@
+import dataclasses
+import json
+import pathlib
+import struct
+import zlib
+from array import array
+from typing import Any, Iterable, Optional, Union
+
+from kryptone.utils.encoders import DefaultJsonEncoder
+from kryptone.utils.file_readers import atomic_write
+from kryptone.utils.urls import URL
+
+MAGIC_NUMBER = b'KRYS'
+
+# Incremented each time the layout of the
+# snapshot changes. Snapshots with a different
+# version are rejected
+SNAPSHOT_VERSION = 1
+
+# magic number, version, codec, flags,
+# checksum, size of the uncompressed payload
+HEADER = struct.Struct('<4sHBBIQ')
+
+CODEC_NONE = 0
+
+CODEC_ZLIB = 1
+
+CODEC_ZSTD = 2
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot cannot be
+    used to restore the spider"""
+
+
+@dataclasses.dataclass
+class CrawlSnapshot:
+    """The state of the spider that is restored from a snapshot.
+    The urls are interned: an url that is both visited and seen
+    is the same `URL` instance in both sets"""
+
+    metadata: dict[str, Any] = dataclasses.field(default_factory=dict)
+    urls_to_visit: set[URL] = dataclasses.field(default_factory=set)
+    visited_urls: set[URL] = dataclasses.field(default_factory=set)
+    seen_urls: set[URL] = dataclasses.field(default_factory=set)
+
+
+def get_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def compress(payload: bytes, level: int = 3):
+    zstandard = get_zstandard()
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=level)
+        return CODEC_ZSTD, compressor.compress(payload)
+    return CODEC_ZLIB, zlib.compress(payload, level)
+
+
+def decompress(codec: int, data: bytes, size: int):
+    if codec == CODEC_NONE:
+        return data
+
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+
+    if codec == CODEC_ZSTD:
+        zstandard = get_zstandard()
+        if zstandard is None:
+            raise SnapshotError(
+                "zstandard library is required to read this snapshot. "
+                "Please install it via 'pip install zstandard'"
+            )
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+
+    raise SnapshotError(f'Unknown compression codec: {codec}')
+
+
+def create_bitset(size: int, indexes: Iterable[int]):
+    bitset = bytearray((size + 7) // 8)
+    for index in indexes:
+        bitset[index >> 3] |= 1 << (index & 7)
+    return bitset
+
+
+def iter_bitset(bitset: bytes, size: int):
+    for byte_index, byte in enumerate(bitset):
+        if byte == 0:
+            continue
+
+        for bit in range(8):
+            if byte & (1 << bit):
+                index = (byte_index << 3) + bit
+                if index < size:
+                    yield index
+
+
+def encode_snapshot(urls_to_visit: Iterable[Union[str, URL]], visited_urls: Iterable[Union[str, URL]], seen_urls: Iterable[Union[str, URL]] = [], metadata: dict[str, Any] = {}, level: int = 3):
+    """Encodes the state of the spider. Each url is stored once
+    in a string table and the urls to visit, visited and seen
+    urls are bitsets over this table
+
+    >>> data = encode_snapshot(spider.urls_to_visit, spider.visited_urls)
+    """
+    string_table: dict[str, int] = {}
+
+    def intern(urls):
+        indexes = []
+        for url in urls:
+            url = str(url)
+            index = string_table.get(url)
+            if index is None:
+                index = len(string_table)
+                string_table[url] = index
+            indexes.append(index)
+        return indexes
+
+    to_visit_indexes = intern(urls_to_visit)
+    visited_indexes = intern(visited_urls)
+    seen_indexes = intern(seen_urls)
+    size = len(string_table)
+
+    encoded_urls = [url.encode('utf-8') for url in string_table]
+    lengths = array('I', map(len, encoded_urls))
+    encoded_metadata = json.dumps(metadata, cls=DefaultJsonEncoder).encode('utf-8')
+
+    payload = b''.join([
+        struct.pack('<II', len(encoded_metadata), size),
+        encoded_metadata,
+        lengths.tobytes(),
+        b''.join(encoded_urls),
+        create_bitset(size, to_visit_indexes),
+        create_bitset(size, visited_indexes),
+        create_bitset(size, seen_indexes)
+    ])
+
+    codec, compressed_payload = compress(payload, level=level)
+    header = HEADER.pack(
+        MAGIC_NUMBER,
+        SNAPSHOT_VERSION,
+        codec,
+        0,
+        zlib.crc32(payload),
+        len(payload)
+    )
+    return header + compressed_payload
+
+
+def decode_snapshot(data: bytes) -> CrawlSnapshot:
+    """Decodes a snapshot created with `encode_snapshot`. A
+    `SnapshotError` is raised if the snapshot was created by
+    another version or if it is corrupted"""
+    if len(data) < HEADER.size:
+        raise SnapshotError('The snapshot is truncated')
+
+    magic_number, version, codec, _, checksum, size = HEADER.unpack_from(data)
+    if magic_number != MAGIC_NUMBER:
+        raise SnapshotError('The file is not a crawl snapshot')
+
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f'The snapshot version {version} is not '
+            f'supported (expected {SNAPSHOT_VERSION})'
+        )
+
+    try:
+        payload = decompress(codec, data[HEADER.size:], size)
+    except SnapshotError:
+        raise
+    except Exception as e:
+        raise SnapshotError(f'The snapshot could not be decompressed: {e}')
+
+    if len(payload) != size or zlib.crc32(payload) != checksum:
+        raise SnapshotError('The checksum of the snapshot does not match')
+
+    metadata_size, count = struct.unpack_from('<II', payload)
+    position = 8
+    metadata = json.loads(payload[position:position + metadata_size])
+    position = position + metadata_size
+
+    lengths = array('I')
+    lengths.frombytes(payload[position:position + count * lengths.itemsize])
+    position = position + count * lengths.itemsize
+
+    urls: list[URL] = []
+    for length in lengths:
+        urls.append(URL(payload[position:position + length].decode('utf-8')))
+        position = position + length
+
+    bitset_size = (count + 7) // 8
+    bitsets = []
+    for _ in range(3):
+        bitsets.append(payload[position:position + bitset_size])
+        position = position + bitset_size
+
+    return CrawlSnapshot(
+        metadata=metadata,
+        urls_to_visit={urls[i] for i in iter_bitset(bitsets[0], count)},
+        visited_urls={urls[i] for i in iter_bitset(bitsets[1], count)},
+        seen_urls={urls[i] for i in iter_bitset(bitsets[2], count)}
+    )
+
+
+def write_snapshot(path: Union[str, pathlib.Path], urls_to_visit: Iterable[Union[str, URL]], visited_urls: Iterable[Union[str, URL]], seen_urls: Iterable[Union[str, URL]] = [], metadata: dict[str, Any] = {}):
+    data = encode_snapshot(
+        urls_to_visit,
+        visited_urls,
+        seen_urls=seen_urls,
+        metadata=metadata
+    )
+    with atomic_write(path, mode='wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def read_snapshot(path: Union[str, pathlib.Path], spider: Optional[str] = None) -> CrawlSnapshot:
+    """Reads a snapshot from a file. When a spider name is
+    given, snapshots created by another spider are rejected"""
+    with open(path, mode='rb') as f:
+        snapshot = decode_snapshot(f.read())
+
+    if spider is not None and snapshot.metadata.get('spider') != spider:
+        raise SnapshotError(
+            f"The snapshot was created by '{snapshot.metadata.get('spider')}' "
+            f"and cannot be used by '{spider}'"
+        )
+    return snapshot
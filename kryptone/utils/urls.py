@@ -1,32 +1,47 @@
-import csv
 import datetime
+import hashlib
+import inspect
+import io
 import itertools
-import json
+import math
 import pathlib
 import re
 from collections import OrderedDict, defaultdict
 from functools import cached_property, lru_cache
 from string import Template
-from typing import Callable, Optional, Union
+from typing import TYPE_CHECKING, Callable, Optional, Union
 from urllib.parse import (ParseResult, parse_qs, unquote, unquote_plus,
                           urlencode, urljoin, urlparse, urlunparse)
 
-import pandas
 import pytz
-import requests
 from asgiref.sync import sync_to_async
 
 from kryptone import constants, logger
 from kryptone.conf import settings
 from kryptone.exceptions import NoStartUrlsFile
 from kryptone.utils.date_functions import get_current_date
-from kryptone.utils.file_readers import read_document
+from kryptone.utils.file_readers import (COMPRESSION_EXTENSIONS, iter_csv_rows,
+                                         iter_json_array, iter_json_lines,
+                                         iter_text_lines, open_stream,
+                                         read_document)
 from kryptone.utils.iterators import drop_while
-from kryptone.utils.randomizers import RANDOM_USER_AGENT
+
+if TYPE_CHECKING:
+    import pandas
 
 _StringOrURL = Union[str, 'URL']
 
 
+def is_image_extension(extension: str) -> bool:
+    """Checks whether the extension is the one of an image
+    without having to import and initialize PIL
+
+    >>> is_image_extension('.JPG')
+    ... True
+    """
+    return extension.lower().removeprefix('.') in constants.IMAGE_EXTENSIONS
+
+
 @lru_cache(maxsize=100)
 def load_image_extensions() -> list[str]:
     try:
@@ -243,7 +258,7 @@ class URL:
         if self.is_empty or self.as_path is None:
             return False
 
-        return self.as_path.suffix in load_image_extensions()
+        return is_image_extension(self.as_path.suffix)
 
     @property
     def is_file(self):
@@ -373,9 +388,9 @@ class URL:
         return url.url_object.netloc == self.url_object.netloc
 
     def get_status(self):
-        headers = {'User-Agent': RANDOM_USER_AGENT()}
-        response = requests.get(self.raw_url, headers=headers)
-        return response.ok, response.status_code
+        from kryptone.status import get_status_checker
+        status = get_status_checker().check(self.raw_url)
+        return not status.is_broken, status.status_code
 
     def compare(self, url_to_compare: _StringOrURL) -> bool:
         """Checks that the given url has the same path
@@ -496,10 +511,40 @@ class BaseURLTestsMixin:
     blacklist = set()
     blacklist_distribution = defaultdict(list)
     error_message = "{url} was blacklisted by filter '{filter_name}'"
+    summary_message = "{count} url(s) blacklisted by filter '{filter_name}' e.g. {samples}"
+    rejected_count = 0
+    max_samples = 3
 
     def __call__(self, url):
         return NotImplemented
 
+    def record_rejection(self, url):
+        # Instead of logging one line per url, the rejected
+        # urls are counted and a few of them are kept so that
+        # one single line is logged per page in `report`
+        if self.rejected_count == 0:
+            self.rejected_samples = []
+
+        self.rejected_count = self.rejected_count + 1
+        if len(self.rejected_samples) < self.max_samples:
+            self.rejected_samples.append(url)
+
+    def report(self):
+        """Logs a summary of the urls that were rejected
+        since the last report and returns their count"""
+        count = self.rejected_count
+        if count > 0:
+            logger.warning(
+                lambda: self.summary_message.format(
+                    count=count,
+                    filter_name=self.name,
+                    samples=', '.join(map(str, self.rejected_samples))
+                )
+            )
+        self.rejected_count = 0
+        self.rejected_samples = []
+        return count
+
     def convert_url(self, url):
         if isinstance(url, URL):
             return url
@@ -541,12 +586,7 @@ class URLIgnoreTest(BaseURLTestsMixin):
                 exclusion_truth_array.append(False)
 
         if any(exclusion_truth_array):
-            logger.warning(
-                self.error_message.format(
-                    url=url,
-                    filter_name=self.name
-                )
-            )
+            self.record_rejection(url)
             return True
         return False
 
@@ -571,26 +611,51 @@ class URLIgnoreRegexTest(BaseURLTestsMixin):
     def __call__(self, url: str | URL):
         result = self.regex.search(str(url))
         if result:
-            logger.warning(
-                self.error_message.format(
-                    url=url,
-                    filter_name=self.name
-                )
-            )
+            self.record_rejection(url)
             return True
         return False
 
 
 class BaseURLGenerator:
+    """Base class for the url generators. Generators
+    yield their urls lazily and, when possible, compute
+    their length without iterating over the urls
+
+    Generators can be chained together using the `+` operator
+
+    >>> URLPaginationGenerator('http://example.com/a', k=2) + URLPaginationGenerator('http://example.com/b', k=2)
+    ... <URLChainGenerator: 4>
+    """
+
+    def __repr__(self):
+        try:
+            return f'<{self.__class__.__name__}: {len(self)}>'
+        except TypeError:
+            return f'<{self.__class__.__name__}>'
+
     def __len__(self):
         return NotImplemented
 
+    def __bool__(self):
+        # Generators which cannot compute their
+        # length (e.g. files) are considered as
+        # having urls to yield
+        try:
+            return len(self) > 0
+        except TypeError:
+            return True
+
     def __iter__(self):
         return self.resolve_generator()
 
     def __aiter__(self):
         return sync_to_async(self.resolve_generator)()
 
+    def __add__(self, obj):
+        if not isinstance(obj, BaseURLGenerator):
+            return NotImplemented
+        return URLChainGenerator(self, obj)
+
     def resolve_generator(self):
         return NotImplemented
 
@@ -626,7 +691,15 @@ class URLQueryGenerator(BaseURLGenerator):
         self.param = param
 
     def __len__(self):
-        return len(self.resolve_generator())
+        if self.parameter_type != 'number':
+            return 0
+        return len(self.values)
+
+    @property
+    def values(self):
+        if self.initial_value < 0 or self.end_value < 0:
+            raise ValueError('End value cannot be below initial value')
+        return range(self.initial_value, self.end_value, self.step)
 
     @staticmethod
     def check_initial_query(query):
@@ -643,19 +716,11 @@ class URLQueryGenerator(BaseURLGenerator):
 
     def resolve_generator(self):
         if self.parameter_type == 'number':
-            calculated_range = 0
-            if self.initial_value < 0 or self.end_value < 0:
-                raise ValueError('End value cannot be below initial value')
-
-            calculated_range = self.end_value - self.initial_value
-            for i in range(calculated_range):
-                if (i % self.step) == 0:
-                    value = self.initial_value + i
-
-                    full_query = self.query | {self.param: value}
-                    query = urlencode(full_query)
-
-                    yield URL(str(self.url_instance) + f'?{query}')
+            base_url = str(self.url_instance)
+            for value in self.values:
+                full_query = self.query | {self.param: value}
+                query = urlencode(full_query)
+                yield URL(base_url + f'?{query}')
 
         if self.parameter_type == 'letter':
             pass
@@ -681,27 +746,20 @@ class URLPathGenerator(BaseURLGenerator):
         self.k = k
         self.start = start
 
-    def __repr__(self):
-        return f'<{self.__class__.__name__}: {self.__len__()}>'
-
     def __len__(self):
-        return len(list(self.resolve_generator()))
+        return max(0, self.k)
 
     def resolve_generator(self):
-        new_params = []
-        base_params = [self.params for _ in range(self.k)]
-        for i, param in enumerate(base_params, start=self.start):
-            new_param = {}
-            for key, value in param.items():
-                if value == 'number' or value == 'k':
-                    new_param[key.removeprefix('$')] = i
-            new_params.append(new_param)
-
-        for i in range(self.k):
+        keys = [
+            key.removeprefix('$') for key, value in self.params.items()
+            if value == 'number' or value == 'k'
+        ]
+
+        for i in range(self.start, self.start + len(self)):
             try:
-                yield self.base_template_url.substitute(new_params[i])
+                yield self.base_template_url.substitute(dict.fromkeys(keys, i))
             except KeyError:
-                yield self.base_template_url
+                yield self.base_template_url.template
 
 
 class URLPaginationGenerator(BaseURLGenerator):
@@ -718,42 +776,98 @@ class URLPaginationGenerator(BaseURLGenerator):
     """
 
     def __init__(self, url: _StringOrURL, param_name: str = 'page', k: int = 10):
-        self.urls = []
-        self.final_urls = []
-
         if isinstance(url, str):
             url = URL(url).remove_fragment()
 
         if isinstance(k, float):
             k = int(k)
 
-        if param_name in url.query:
-            pass
-
         self.url = url
         self.param_name = param_name
         self.k = k
 
-    def __repr__(self):
-        return f'<{self.__class__.__name__}: {len(self.final_urls)}>'
-
     def __len__(self):
-        return len(self.final_urls)
+        return max(0, self.k)
 
     def resolve_generator(self):
         url = str(self.url)
 
-        for _ in range(self.k):
-            self.urls.append(url)
-
-        counter = 1
-        for url in self.urls:
+        for counter in range(1, len(self) + 1):
             final_query = urlencode(
                 {self.param_name: str(counter)},
                 encoding='utf-8'
             )
             yield url + f'?{final_query}'
-            counter = counter + 1
+
+
+class URLChainGenerator(BaseURLGenerator):
+    """Yields the urls of multiple generators or
+    lists of urls one after the other
+
+    >>> URLChainGenerator(URLPaginationGenerator('http://example.com', k=2), ['http://example.com/a'])
+    ... ['http://example.com?page=1', 'http://example.com?page=2', 'http://example.com/a']
+    """
+
+    def __init__(self, *generators):
+        self.generators = list(generators)
+
+    def __len__(self):
+        return sum(len(generator) for generator in self.generators)
+
+    def __add__(self, obj):
+        if not isinstance(obj, BaseURLGenerator):
+            return NotImplemented
+        return URLChainGenerator(*self.generators, obj)
+
+    def resolve_generator(self):
+        for generator in self.generators:
+            yield from generator
+
+
+class URLProductGenerator(BaseURLGenerator):
+    """Generates the cartesian product of multiple sets
+    of values substituted in an URL template. The length is
+    the product of the length of each set of values
+
+    >>> URLProductGenerator('http://example.com/$category?page=$page', category=['shoes', 'bags'], page=range(1, 3))
+    ... ['http://example.com/shoes?page=1', 'http://example.com/shoes?page=2', 'http://example.com/bags?page=1', ...]
+    """
+
+    def __init__(self, template: str, **params):
+        self.base_template_url = Template(template)
+        self.params = params
+
+    def __len__(self):
+        return math.prod(len(values) for values in self.params.values())
+
+    def resolve_generator(self):
+        keys = list(self.params.keys())
+        for values in itertools.product(*self.params.values()):
+            yield self.base_template_url.substitute(dict(zip(keys, values)))
+
+
+def iter_start_urls(start_urls):
+    """Lazily iterates over the start urls which can
+    either be a generator or a list mixing urls
+    and generators
+
+    >>> list(iter_start_urls(['http://example.com', URLPaginationGenerator('http://example.com', k=1)]))
+    ... ['http://example.com', 'http://example.com?page=1']
+    """
+    if start_urls is None:
+        return
+
+    if isinstance(start_urls, (str, URL)):
+        yield start_urls
+        return
+
+    for item in start_urls:
+        if isinstance(item, (str, URL)):
+            yield item
+            continue
+
+        if isinstance(item, BaseURLGenerator) or inspect.isgenerator(item):
+            yield from item
 
 
 class MultipleURLManager:
@@ -776,7 +890,7 @@ class MultipleURLManager:
         # This attribute is updated every time
         # "get" is called on the class
         self.current_iteration = 0
-        self.dataframe: Optional[pandas.DataFrame] = None
+        self.dataframe: Optional['pandas.DataFrame'] = None
 
     def __repr__(self):
         name = self.__class__.__name__
@@ -908,6 +1022,11 @@ class MultipleURLManager:
                     continue
                 urls_kept.add(url)
 
+            for instance in self.custom_url_filters:
+                report_rejections = getattr(instance, 'report', None)
+                if report_rejections is not None:
+                    report_rejections()
+
             logger.info(
                 f"Filters completed. {len(urls_removed)} "
                 "url(s) removed"
@@ -1055,6 +1174,8 @@ class MultipleURLManager:
             self.start_url = start_url
             self.add_urls(start_urls)
 
+            import pandas
+
             self.dataframe = pandas.DataFrame(
                 {
                     'urls': list(self.urls_to_visit)
@@ -1083,28 +1204,118 @@ class LoadStartUrls(BaseURLGenerator):
     ...     class Meta:
     ...         start_urls = LoadStartUrls()
 
+    The files are streamed which means that very large files can be used.
+    The filename can also contain the extension of the file in order to
+    load JSON arrays (.json), JSON lines (.jsonl, .ndjson), csv files (.csv)
+    or plain text files with one url per line (.txt). Files compressed
+    with gzip (.gz) or zstd (.zst) are decompressed on the fly
+
+    >>> LoadStartUrls(filename='products.jsonl.gz')
+
+    Duplicate urls in the file are only yielded once
+
     The class can also laod urls from the internet by running a request
     to an api endpoint
     """
 
-    def __init__(self, *, filename=None, is_json=False):
+    file_formats = {
+        '.json': 'json',
+        '.jsonl': 'jsonl',
+        '.ndjson': 'jsonl',
+        '.csv': 'csv',
+        '.txt': 'txt'
+    }
+
+    def __init__(self, *, filename=None, is_json=False, deduplicate=True):
         self.is_json = is_json
-        extension = 'json' if self.is_json else 'csv'
-        self.filename = f"{filename or 'start_urls'}.{extension}"
+        self.deduplicate = deduplicate
+        self.duplicates_count = 0
+
+        filename = filename or 'start_urls'
+        path = pathlib.Path(filename)
+
+        suffixes = [suffix for suffix in path.suffixes if suffix not in COMPRESSION_EXTENSIONS]
+        if suffixes and suffixes[-1] in self.file_formats:
+            self.file_format = self.file_formats[suffixes[-1]]
+            self.filename = filename
+        else:
+            extension = 'json' if self.is_json else 'csv'
+            self.file_format = extension
+            self.filename = f"{filename}.{extension}"
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.filename}>'
+
+    @property
+    def path(self):
+        path = pathlib.Path(self.filename)
+        if path.is_absolute() or settings.PROJECT_PATH is None:
+            return path
+        return settings.PROJECT_PATH / self.filename
+
+    @staticmethod
+    def get_url(item):
+        if isinstance(item, dict):
+            return item.get('url')
+
+        if isinstance(item, str):
+            return item
+        return None
+
+    def iter_urls(self):
+        path = self.path
+
+        if self.file_format == 'txt':
+            yield from iter_text_lines(path)
+            return
+
+        stream = open_stream(path)
+        if not hasattr(stream, 'peek'):
+            stream = io.BufferedReader(stream)
+
+        with io.TextIOWrapper(stream, encoding='utf-8', newline='') as f:
+            if self.file_format == 'csv':
+                yield from iter_csv_rows(f)
+                return
+
+            # JSON lines are often saved with a .json
+            # extension so check the first character
+            # to know whether the file is an array
+            is_array = stream.peek(1024).lstrip().startswith(b'[')
+            if self.file_format == 'jsonl' or not is_array:
+                items = iter_json_lines(f)
+            else:
+                items = iter_json_array(f)
+
+            for item in items:
+                url = self.get_url(item)
+                if url:
+                    yield url
 
     def resolve_generator(self):
+        self.duplicates_count = 0
+        # Keep a 16 bytes digest of the urls instead of the
+        # urls themselves in order to limit the memory used
+        # when deduplicating very large files. Unlike hash(),
+        # the digest cannot collide for two different urls
+        # in practice
+        seen = set()
+
         try:
-            path = settings.PROJECT_PATH / self.filename
-            with open(path, mode='r', encoding='utf-8') as f:
-                if self.is_json:
-                    data = json.load(f)
-                    for item in data:
-                        if isinstance(item, dict):
-                            yield item['url']
-
-                        if isinstance(item, str):
-                            yield item
-                else:
-                    yield from list(itertools.chain(*csv.reader(f)))
+            for url in self.iter_urls():
+                if self.deduplicate:
+                    key = hashlib.blake2b(str(url).encode('utf-8'), digest_size=16).digest()
+                    if key in seen:
+                        self.duplicates_count = self.duplicates_count + 1
+                        continue
+                    seen.add(key)
+                yield url
         except FileNotFoundError:
             raise NoStartUrlsFile()
+
+        if self.duplicates_count > 0:
+            logger.info(
+                f'Skipped {self.duplicates_count} duplicate '
+                f'url(s) in {self.filename}'
+            )
+
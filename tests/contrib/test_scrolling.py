@@ -0,0 +1,64 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from selenium.common.exceptions import TimeoutException
+
+from kryptone.contrib.scrolling import SCROLL_ENGINE_SCRIPT, ScrollMixin
+
+
+class Spider(ScrollMixin):
+    def __init__(self):
+        self.driver = MagicMock()
+
+
+class TestScrollMixin(TestCase):
+    def test_single_round_trip(self):
+        spider = Spider()
+        spider.driver.execute_async_script.return_value = {
+            'reason': 'target_count',
+            'position': 2200,
+            'height': 6000,
+            'links_count': 30,
+            'new_links_count': 20,
+            'links_added': [0, 0, 20],
+            'items_count': 60,
+            'elapsed': 1.2
+        }
+
+        result = spider.scroll_window(item_selector='.product', target_count=50)
+        spider.driver.execute_async_script.assert_called_once()
+        spider.driver.execute_script.assert_not_called()
+
+        self.assertEqual(result.reason, 'target_count')
+        self.assertEqual(result.steps, 3)
+
+        script, options = spider.driver.execute_async_script.call_args.args
+        self.assertEqual(script, SCROLL_ENGINE_SCRIPT)
+        self.assertEqual(options['targetCount'], 50)
+        self.assertEqual(options['stepTimeout'], 5000)
+
+    def test_script_timeout(self):
+        spider = Spider()
+        spider.driver.execute_async_script.side_effect = TimeoutException()
+        spider.driver.timeouts.script = 30
+
+        result = spider.scroll_window(max_time=10)
+        self.assertEqual(result.reason, 'error')
+
+        # The previous timeout is restored
+        timeouts = [item.args[0] for item in spider.driver.set_script_timeout.call_args_list]
+        self.assertListEqual(timeouts, [20, 30])
+
+    def test_scroll_page_section(self):
+        spider = Spider()
+        spider.driver.execute_async_script.return_value = {'reason': 'not_found'}
+
+        result = spider.scroll_page_section(css_selector='.results')
+        self.assertEqual(result.reason, 'not_found')
+
+        _, options = spider.driver.execute_async_script.call_args.args
+        self.assertEqual(options['selector'], '.results')
+        self.assertIsNone(options['increment'])
+
+        with self.assertRaises(ValueError):
+            spider.scroll_page_section()
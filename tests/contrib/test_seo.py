@@ -1,9 +1,11 @@
 import pathlib
 import string
+import tempfile
 from unittest import TestCase
 from unittest.mock import patch
 from nltk.corpus import stopwords
-from kryptone.contrib.seo import TextMixin, TFIDFProcessor
+from kryptone.contrib.seo import SEOMixin, TextMixin, TFIDFProcessor
+from kryptone.utils.columnar import read_parquet_document
 
 
 class TestTextMixin(TestCase):
@@ -78,3 +80,20 @@ class TestTFIDFProcessor(TestCase):
         result = self.instance.preprocess_text_with_tfidf(keep_top_n=10)
         print(result)
         self.assertIsInstance(result, list)
+
+
+class TestSEOMixin(TestCase):
+    def test_export_page_audits(self):
+        instance = SEOMixin()
+        instance.page_audits = {
+            'http://example.com': {'url': 'http://example.com', 'status_code': 200},
+            'http://example.com/a': {'url': 'http://example.com/a', 'status_code': 404}
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory).joinpath('page_audits.parquet')
+            with patch('kryptone.contrib.seo.get_media_folder', return_value=path):
+                instance.export_page_audits()
+
+            audits = read_parquet_document(path)
+            self.assertListEqual(audits, list(instance.page_audits.values()))
@@ -0,0 +1,31 @@
+import unittest
+
+from kryptone.management.commands.importtime import (measure_import_time,
+                                                     parse_importtime)
+
+OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       1620 | kryptone
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    def test_parse_importtime(self):
+        result = parse_importtime(OUTPUT)
+        self.assertListEqual(
+            result,
+            [('_io', 120, 120), ('kryptone', 1500, 1620)]
+        )
+
+    def test_no_heavy_modules_at_startup(self):
+        # Calling a command should not import optional
+        # backends or data science libraries
+        times, heavy_modules = measure_import_time(
+            'kryptone.management',
+            'kryptone.base',
+            'kryptone.data_storages',
+            'kryptone.contrib.seo',
+            'kryptone.core.servers'
+        )
+        self.assertGreater(len(times), 0)
+        self.assertListEqual(heavy_modules, [])
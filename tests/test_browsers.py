@@ -0,0 +1,313 @@
+import json
+import os
+import pathlib
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from kryptone.base import BaseCrawler
+from kryptone.conf import settings
+from kryptone.browsers import (BrowserLifecycle, BrowserPool, BrowserState,
+                               DriverCache, SessionStore, _browser_pools,
+                               browser_identities, get_browser_pool,
+                               get_process_memory, is_cookie_of,
+                               restore_browser_state)
+from kryptone.identities import IdentityPool, ProxyPool
+
+
+class TestDriverCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name)
+        self.cache_path = self.path.joinpath('drivers.json')
+
+        self.driver_path = self.path.joinpath('chromedriver')
+        self.driver_path.touch()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_driver_is_cached(self):
+        cache = DriverCache(cache_path=self.cache_path)
+        with patch.object(DriverCache, 'install', return_value=str(self.driver_path)) as install:
+            self.assertEqual(cache.get_driver_path('Chrome'), str(self.driver_path))
+            self.assertEqual(cache.get_driver_path('Chrome'), str(self.driver_path))
+            self.assertEqual(install.call_count, 1)
+
+            # Another process uses the file
+            cache = DriverCache(cache_path=self.cache_path)
+            cache.get_driver_path('Chrome')
+            self.assertEqual(install.call_count, 1)
+
+    def test_offline(self):
+        with open(self.cache_path, mode='w', encoding='utf-8') as f:
+            entry = {'path': str(self.driver_path), 'installed_at': time.time() - 10}
+            json.dump({'Chrome:latest': entry}, f)
+
+        cache = DriverCache(cache_path=self.cache_path, ttl=1)
+        with patch.object(DriverCache, 'install', side_effect=ConnectionError):
+            # The entry is expired but is used since
+            # the driver cannot be installed
+            self.assertEqual(cache.get_driver_path('Chrome'), str(self.driver_path))
+
+    def test_pinned_version(self):
+        with open(self.cache_path, mode='w', encoding='utf-8') as f:
+            entry = {'path': str(self.driver_path), 'installed_at': 0}
+            json.dump({'Chrome:131.0': entry}, f)
+
+        cache = DriverCache(cache_path=self.cache_path, ttl=1, driver_version='131.0')
+        with patch.object(DriverCache, 'install') as install:
+            self.assertEqual(cache.get_driver_path('Chrome'), str(self.driver_path))
+            install.assert_not_called()
+
+
+@patch('kryptone.browsers.create_browser', side_effect=lambda *args, **kwargs: MagicMock())
+class TestBrowserPool(unittest.TestCase):
+    def test_lease_and_release(self, create_browser):
+        pool = BrowserPool(browser_name='Chrome', size=2)
+        pool.warm()
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(create_browser.call_count, 2)
+
+        driver = pool.lease()
+        self.assertTrue(pool.release(driver))
+        driver.delete_all_cookies.assert_called_once()
+
+        # The released browser is reused
+        self.assertIs(pool.lease(), driver)
+        self.assertEqual(create_browser.call_count, 2)
+
+    def test_unhealthy_browser_is_replaced(self, create_browser):
+        pool = BrowserPool(browser_name='Chrome', size=1)
+        driver = pool.lease()
+        pool.release(driver)
+
+        driver.execute_script.side_effect = Exception('Browser closed')
+        new_driver = pool.lease()
+        self.assertIsNot(new_driver, driver)
+        self.assertEqual(len(pool), 1)
+
+    def test_launch_attempts(self, create_browser):
+        def create_unresponsive_browser(*args, **kwargs):
+            driver = MagicMock()
+            driver.execute_script.side_effect = Exception('Browser closed')
+            return driver
+
+        create_browser.side_effect = create_unresponsive_browser
+        pool = BrowserPool(browser_name='Chrome', size=1, max_launch_attempts=3)
+        with self.assertRaises(RuntimeError):
+            pool.lease(timeout=0.01)
+        self.assertEqual(create_browser.call_count, 3)
+        self.assertEqual(pool.pending_count, 0)
+
+    def test_all_proxies_banned(self, create_browser):
+        identity_pool = IdentityPool(
+            user_agents=['agent'],
+            proxy_pool=ProxyPool(['proxy-1:80'], max_errors=1)
+        )
+        identity = identity_pool.get()
+        identity_pool.record_response(identity, error=True)
+
+        pool = BrowserPool(browser_name='Chrome', size=1)
+        with patch('kryptone.browsers.get_identity_pool', return_value=identity_pool):
+            driver = pool.lease(timeout=0.01)
+            browser_identities[driver] = identity
+            pool.release(driver)
+
+            # No other proxy can be used so the
+            # browser is kept instead of being replaced
+            self.assertIs(pool.lease(timeout=0.01), driver)
+        self.assertEqual(create_browser.call_count, 1)
+
+    def test_max_uses(self, create_browser):
+        pool = BrowserPool(browser_name='Chrome', size=1, max_uses=1)
+        driver = pool.lease()
+        self.assertFalse(pool.release(driver))
+        driver.quit.assert_called_once()
+        self.assertEqual(len(pool), 0)
+
+    def test_full_pool(self, create_browser):
+        pool = BrowserPool(browser_name='Chrome', size=1)
+        pool.lease()
+        with self.assertRaises(TimeoutError):
+            pool.lease(timeout=0.01)
+
+    def test_spider_releases_browser(self, create_browser):
+        pool = BrowserPool(browser_name='Chrome', size=1)
+        spider = SimpleNamespace(driver=pool.lease(timeout=1))
+        spider.close_driver = lambda driver, destroy: pool.release(driver)
+
+        BaseCrawler.release_driver(spider)
+        BaseCrawler.release_driver(spider)
+        self.assertIsNone(spider.driver)
+        # The browser was only released once
+        self.assertEqual(pool.idle_browsers.qsize(), 1)
+        pool.lease(timeout=0.01)
+
+    def test_close(self, create_browser):
+        pool = BrowserPool(browser_name='Chrome', size=2)
+        pool.warm()
+        pool.close()
+        self.assertEqual(len(pool), 0)
+
+        with self.assertRaises(RuntimeError):
+            pool.lease()
+
+    def test_pool_is_warmed(self, create_browser):
+        settings['BROWSER_POOL_SIZE'] = 2
+        self.addCleanup(settings.__setitem__, 'BROWSER_POOL_SIZE', 0)
+        self.addCleanup(_browser_pools.clear)
+
+        pool = get_browser_pool('Chrome')
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.idle_browsers.qsize(), 2)
+        # The pool is only created and warmed once
+        self.assertIs(get_browser_pool('Chrome'), pool)
+        self.assertEqual(create_browser.call_count, 2)
+
+
+class TestBrowserLifecycle(unittest.TestCase):
+    def create_driver(self):
+        driver = MagicMock()
+        driver.current_window_handle = 'tab-1'
+        driver.execute_cdp_cmd.return_value = {
+            'cookies': [{'name': 'consent', 'value': '1', 'domain': 'example.com', 'session': True, 'expires': -1, 'size': 8}]
+        }
+        driver.execute_script.return_value = ['http://example.com', [['consent', 'accepted']]]
+        return driver
+
+    def test_process_memory(self):
+        memory = get_process_memory(os.getpid())
+        if os.path.isdir('/proc'):
+            self.assertGreater(memory, 0)
+        self.assertIsNone(get_process_memory(-1))
+
+    def test_recycle_after_max_pages(self):
+        lifecycle = BrowserLifecycle(max_pages=3, max_memory=None, check_interval=2)
+        driver = self.create_driver()
+
+        for _ in range(2):
+            lifecycle.record_page(driver)
+        self.assertFalse(lifecycle.should_recycle())
+        # The state is captured every two pages
+        self.assertEqual(lifecycle.state.origin, 'http://example.com')
+
+        lifecycle.record_page(driver)
+        self.assertTrue(lifecycle.should_recycle())
+
+        new_driver = self.create_driver()
+        close_driver = MagicMock()
+        result = lifecycle.recycle(driver, lambda: new_driver, close_driver)
+
+        self.assertIs(result, new_driver)
+        close_driver.assert_called_once_with(driver)
+        self.assertEqual(lifecycle.pages_count, 0)
+        self.assertEqual(lifecycle.recycled_count, 1)
+
+        # The session cookies are restored
+        # without their expiration date
+        new_driver.execute_cdp_cmd.assert_any_call(
+            'Network.setCookies',
+            {'cookies': [{'name': 'consent', 'value': '1', 'domain': 'example.com'}]}
+        )
+
+    def test_recycle_after_max_memory(self):
+        lifecycle = BrowserLifecycle(max_pages=None, max_memory=1)
+        lifecycle.memory = 2 * 1024 * 1024
+        self.assertTrue(lifecycle.should_recycle())
+
+    def test_restart(self):
+        lifecycle = BrowserLifecycle()
+        driver = self.create_driver()
+        driver.execute_script.side_effect = Exception('Browser crashed')
+        self.assertFalse(lifecycle.is_alive(driver))
+
+        lifecycle.state = BrowserState(origin='http://example.com', local_storage=[['key', 'value']])
+        new_driver = MagicMock()
+        lifecycle.restart(driver, lambda: new_driver, MagicMock(side_effect=Exception))
+        self.assertEqual(lifecycle.restarted_count, 1)
+
+        method, params = new_driver.execute_cdp_cmd.call_args.args
+        self.assertEqual(method, 'Page.addScriptToEvaluateOnNewDocument')
+        self.assertIn('"http://example.com"', params['source'])
+
+    def test_recycle_tab(self):
+        lifecycle = BrowserLifecycle(max_tab_pages=2)
+        driver = self.create_driver()
+        lifecycle.record_page(driver)
+        lifecycle.record_page(driver)
+        self.assertTrue(lifecycle.should_recycle_tab('tab-1'))
+
+        lifecycle.recycle_tab(driver, 'tab-1')
+        driver.close.assert_called_once()
+        self.assertFalse(lifecycle.should_recycle_tab('tab-1'))
+
+    def test_restore_without_state(self):
+        driver = MagicMock()
+        restore_browser_state(driver, BrowserState())
+        driver.execute_cdp_cmd.assert_not_called()
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name).joinpath('sessions.json')
+
+        self.driver = MagicMock()
+        self.driver.execute_cdp_cmd.return_value = {
+            'cookies': [
+                {'name': 'consent', 'value': '1', 'domain': '.example.com', 'expires': time.time() + 3600},
+                {'name': 'old', 'value': '1', 'domain': 'example.com', 'expires': time.time() - 10},
+                {'name': 'tracker', 'value': '1', 'domain': 'tracker.com', 'session': True}
+            ]
+        }
+        self.driver.execute_script.return_value = ['https://www.example.com', [['consent', 'accepted']]]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_is_cookie_of(self):
+        self.assertTrue(is_cookie_of('.example.com', 'www.example.com'))
+        self.assertTrue(is_cookie_of('shop.example.com', 'example.com'))
+        self.assertFalse(is_cookie_of('tracker.com', 'example.com'))
+
+    def test_snapshot_and_restore(self):
+        store = SessionStore(self.path)
+        store.snapshot(self.driver, 'example.com')
+        self.assertTrue(self.path.exists())
+
+        # Another spider reads the file
+        store = SessionStore(self.path)
+        self.assertIn('example.com', store)
+
+        cookies = [cookie['name'] for cookie in store.get('example.com')['cookies']]
+        self.assertListEqual(cookies, ['consent'])
+
+        new_driver = MagicMock()
+        self.assertTrue(store.restore(new_driver, 'example.com'))
+        methods = [item.args[0] for item in new_driver.execute_cdp_cmd.call_args_list]
+        self.assertListEqual(methods, ['Network.setCookies', 'Page.addScriptToEvaluateOnNewDocument'])
+
+    def test_expired_state(self):
+        store = SessionStore(self.path, ttl=0)
+        store.snapshot(self.driver, 'example.com')
+        self.assertNotIn('example.com', store)
+        self.assertFalse(store.restore(MagicMock(), 'example.com'))
+
+    def test_concurrent_saves(self):
+        first_store = SessionStore(self.path)
+        second_store = SessionStore(self.path)
+
+        first_store.snapshot(self.driver, 'example.com')
+        self.driver.execute_script.return_value = ['https://other.com', []]
+        second_store.snapshot(self.driver, 'other.com')
+
+        store = SessionStore(self.path)
+        self.assertIn('example.com', store)
+        self.assertIn('other.com', store)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import csv
 import pathlib
+import tempfile
 from unittest import IsolatedAsyncioTestCase, mock
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
 from urllib.parse import urljoin
@@ -10,7 +11,8 @@ from selenium.webdriver import Edge
 from kryptone.base import SiteCrawler
 from kryptone.conf import settings
 from kryptone.data_storages import (BaseStorage, File, FileStorage,
-                                    GoogleSheetStorage, RedisStorage)
+                                    GoogleSheetStorage, ParquetStorage,
+                                    RedisStorage, SQLiteStorage)
 from kryptone.utils.urls import URL
 
 
@@ -73,6 +75,191 @@ class TestFileStorage(IsolatedAsyncioTestCase):
         await self.instance.save('performance.json', data)
 
 
+class TestFileStorageIndex(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name)
+
+        self.path.joinpath('images').mkdir()
+        self.path.joinpath('images', 'nested.json').write_text('{}')
+        self.path.joinpath('image.jpg').write_bytes(b'')
+        self.path.joinpath('performance.json').write_text('{"duration": 0}')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_index(self):
+        instance = FileStorage(storage_path=self.path)
+        self.assertListEqual(list(instance.storage.keys()), ['performance.json'])
+
+        await instance.save_or_create('seen_urls.csv', ['http://example.com'], adapt_list=True)
+        self.assertIn('seen_urls.csv', instance.storage)
+        self.assertListEqual(
+            await instance.get('seen_urls.csv'),
+            [['http://example.com']]
+        )
+
+        self.assertTrue(await instance.delete('seen_urls.csv'))
+        self.assertFalse(self.path.joinpath('seen_urls.csv').exists())
+        self.assertFalse(await instance.has('seen_urls.csv'))
+
+    async def test_persisted_index(self):
+        instance = FileStorage(storage_path=self.path, persist_index=True)
+        await instance.save_or_create('cache.json', {'urls_to_visit': []})
+        self.assertTrue(instance.index_path.exists())
+
+        other = FileStorage(storage_path=self.path, persist_index=True)
+        self.assertListEqual(
+            list(other.storage.keys()),
+            ['performance.json', 'cache.json']
+        )
+
+    async def test_atomic_save(self):
+        instance = FileStorage(storage_path=self.path)
+
+        with self.assertRaises(TypeError):
+            await instance.save('performance.json', {'duration': object()})
+
+        data = await instance.get('performance.json')
+        self.assertDictEqual(data, {'duration': 0})
+        self.assertListEqual(list(self.path.glob('*.tmp')), [])
+
+
+class TestParquetStorage(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.instance = ParquetStorage(storage_path=self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_save_and_get(self):
+        cache = {
+            'spider': 'ExampleSpider',
+            'urls_to_visit': ['http://example.com'],
+            'visited_urls': []
+        }
+        await self.instance.save_or_create('cache.json', cache)
+        self.assertTrue(await self.instance.has('cache.json'))
+        self.assertIn('cache.parquet', self.instance.storage)
+
+        file = await self.instance.get_file('cache.json')
+        self.assertTrue(file.is_parquet)
+
+        data = await self.instance.get('cache.json')
+        self.assertDictEqual(data, cache)
+
+        cache['visited_urls'] = ['http://example.com/1']
+        await self.instance.save_or_create('cache.json', cache)
+        data = await self.instance.get('cache.json')
+        self.assertListEqual(data['visited_urls'], ['http://example.com/1'])
+
+    async def test_seen_urls(self):
+        urls = ['http://example.com', 'http://example.com/1']
+        await self.instance.save_or_create('seen_urls.csv', urls, adapt_list=True)
+        self.assertListEqual(await self.instance.get('seen_urls.csv'), urls)
+
+    async def test_modified_time(self):
+        self.assertIsNone(await self.instance.get_modified_time('cache.json'))
+        await self.instance.save_or_create('cache.json', {'urls_to_visit': []})
+
+        file = await self.instance.get_file('cache.json')
+        self.assertEqual(
+            await self.instance.get_modified_time('cache.json'),
+            file.path.stat().st_mtime
+        )
+
+
+class TestSQLiteStorage(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.instance = SQLiteStorage(storage_path=self.directory.name)
+        self.cache = {
+            'spider': 'ExampleSpider',
+            'urls_to_visit': [
+                'http://example.com/1',
+                'http://example.com/products/1',
+                'http://example.com/2'
+            ],
+            'visited_urls': ['http://example.com']
+        }
+
+    def tearDown(self):
+        self.instance.close()
+        self.directory.cleanup()
+
+    async def test_connection(self):
+        self.assertTrue(self.instance.is_connected)
+        result = await self.instance.run(
+            lambda: self.instance.storage_connection.execute('pragma journal_mode').fetchone()
+        )
+        self.assertEqual(result[0], 'wal')
+
+    async def test_cache(self):
+        self.assertFalse(await self.instance.has('cache.json'))
+        await self.instance.save_or_create('cache.json', self.cache)
+        self.assertTrue(await self.instance.has('cache.json'))
+
+        data = await self.instance.get('cache.json')
+        self.assertDictEqual(data, self.cache)
+
+        self.cache['urls_to_visit'] = ['http://example.com/2', 'http://example.com/3']
+        await self.instance.save('cache.json', self.cache)
+        data = await self.instance.get('cache.json')
+        self.assertListEqual(data['urls_to_visit'], self.cache['urls_to_visit'])
+
+    async def test_filter_and_reorder(self):
+        await self.instance.save('cache.json', self.cache)
+
+        await self.instance.reorder_urls_to_visit(r'\/products\/')
+        urls = await self.instance.get_urls_to_visit()
+        self.assertEqual(urls[0], 'http://example.com/products/1')
+
+        count = await self.instance.filter_urls_to_visit('/products/')
+        self.assertEqual(count, 1)
+
+        data = await self.instance.get('cache.json')
+        self.assertNotIn('http://example.com/products/1', data['urls_to_visit'])
+        self.assertIn('http://example.com/products/1', data['visited_urls'])
+
+    async def test_modified_time(self):
+        self.assertIsNone(await self.instance.get_modified_time('cache.json'))
+        await self.instance.save('cache.json', self.cache)
+        saved_time = await self.instance.get_modified_time('cache.json')
+        self.assertIsNotNone(saved_time)
+
+        # Commands that change the urls to
+        # visit also update the time
+        await self.instance.filter_urls_to_visit('/products/')
+        self.assertGreaterEqual(await self.instance.get_modified_time('cache.json'), saved_time)
+        self.assertIsNone(await self.instance.get_modified_time('products'))
+
+    async def test_other_keys(self):
+        await self.instance.save('seen_urls.csv', [['http://example.com']])
+        self.assertListEqual(
+            await self.instance.get('seen_urls.csv'),
+            ['http://example.com']
+        )
+
+        distribution = {'http://example.com': ['http://example.com/1']}
+        await self.instance.save('url_distribution.json', distribution)
+        self.assertDictEqual(
+            await self.instance.get('url_distribution.json'),
+            distribution
+        )
+
+        await self.instance.save('products.json', [{'name': 'Kendall'}])
+        await self.instance.add_items('products.json', [{'name': 'Jenner'}])
+        products = await self.instance.get('products.json')
+        self.assertEqual(len(products), 2)
+
+        await self.instance.save('performance.json', {'duration': 1})
+        self.assertDictEqual(
+            await self.instance.get('performance.json'),
+            {'duration': 1}
+        )
+
+
 class TestRealtimeRedisStorage(IsolatedAsyncioTestCase):
     @classmethod
     def setUpClass(cls):
@@ -0,0 +1,75 @@
+import unittest
+
+from kryptone.governor import RateGovernor
+
+
+class TestRateGovernor(unittest.TestCase):
+    def setUp(self):
+        self.governor = RateGovernor(
+            initial_delay=4,
+            min_delay=1,
+            max_delay=10,
+            max_concurrency=3,
+            latency_threshold=5,
+            successes_before_increase=2
+        )
+        self.url = 'http://example.com/1'
+
+    def request(self, url=None, **kwargs):
+        url = url or self.url
+        self.governor.record_request(url)
+        return self.governor.record_response(url, **kwargs)
+
+    def test_additive_decrease(self):
+        state = self.request(latency=0.5)
+        self.assertEqual(state.delay, 3.5)
+
+        for _ in range(10):
+            self.request(latency=0.5)
+        self.assertEqual(state.delay, 1)
+        self.assertEqual(state.concurrency, 3)
+        self.assertEqual(state.in_flight, 0)
+
+    def test_multiplicative_increase(self):
+        state = self.request(latency=0.5, status_code=429)
+        self.assertEqual(state.delay, 8)
+        self.assertEqual(state.throttled_count, 1)
+
+        state = self.request(latency=0.5, error=True)
+        self.assertEqual(state.delay, 10)
+        self.assertEqual(state.errors_count, 1)
+        self.assertEqual(state.error_rate, 0.5)
+
+    def test_slow_host(self):
+        state = self.request(latency=20)
+        self.assertEqual(state.delay, 8)
+
+    def test_hosts_are_independent(self):
+        self.request(latency=0.5, status_code=503)
+        self.request(url='http://other.com', latency=0.5)
+
+        self.assertEqual(self.governor.get_delay(self.url), 8)
+        self.assertEqual(self.governor.get_delay('http://other.com/page'), 3.5)
+        self.assertIn('other.com', self.governor.statistics())
+
+    def test_wait_time(self):
+        self.assertEqual(self.governor.get_wait_time(self.url), 0)
+        self.request(latency=0.5, retry_after=9)
+        self.assertGreater(self.governor.get_wait_time(self.url), 8)
+
+    def test_concurrency(self):
+        self.assertEqual(self.governor.get_concurrency(self.url), 1)
+        self.request(latency=0.5)
+        self.request(latency=0.5)
+        self.assertEqual(self.governor.get_concurrency(self.url), 2)
+
+        self.request(latency=0.5, status_code=503)
+        self.assertEqual(self.governor.get_concurrency(self.url), 1)
+
+    def test_initial_concurrency(self):
+        governor = RateGovernor(initial_concurrency=8, max_concurrency=3)
+        self.assertEqual(governor.get_concurrency(self.url), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from kryptone.base import BaseCrawler
+from kryptone.browsers import browser_identities, create_browser_options
+from kryptone.governor import RateGovernor
+from kryptone.identities import Identity, IdentityPool, ProxyPool
+from kryptone.utils.randomizers import RANDOM_USER_AGENT, load_user_agents
+
+
+class TestUserAgents(unittest.TestCase):
+    def test_loaded_once(self):
+        self.assertIs(load_user_agents(), load_user_agents())
+        self.assertNotIn('', load_user_agents())
+        self.assertIn(RANDOM_USER_AGENT(), load_user_agents())
+
+
+class TestProxyPool(unittest.TestCase):
+    def test_ban_after_errors(self):
+        pool = ProxyPool(['proxy-1:80', 'proxy-2:80'], max_errors=2)
+        pool.record_response('proxy-1:80', error=True)
+        self.assertTrue(pool.is_usable('proxy-1:80'))
+
+        pool.record_response('proxy-1:80', error=True)
+        self.assertFalse(pool.is_usable('proxy-1:80'))
+
+        for _ in range(10):
+            self.assertEqual(pool.choose().address, 'proxy-2:80')
+
+    def test_ban_status_code(self):
+        pool = ProxyPool(['proxy-1:80'], max_ban_responses=2)
+        pool.record_response('proxy-1:80', latency=0.5, status_code=429)
+        # A single blocked page does not ban the proxy
+        self.assertTrue(pool.is_usable('proxy-1:80'))
+
+        pool.record_response('proxy-1:80', latency=0.5, status_code=429)
+        self.assertFalse(pool.is_usable('proxy-1:80'))
+        self.assertFalse(pool.has_usable())
+
+        # The crawl continues with the
+        # proxy whose ban ends first
+        self.assertEqual(pool.choose().address, 'proxy-1:80')
+        self.assertEqual(pool.statistics()['proxy-1:80']['bans_count'], 1)
+
+    def test_score(self):
+        pool = ProxyPool(['proxy-1:80', {'address': 'proxy-2:80', 'weight': 2}])
+        pool.record_response('proxy-1:80', latency=4)
+        pool.record_response('proxy-2:80', latency=0.1)
+
+        first, second = pool.proxies.values()
+        self.assertGreater(second.score, first.score)
+
+    def test_empty_pool(self):
+        self.assertIsNone(ProxyPool().choose())
+
+
+class TestIdentityPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = IdentityPool(
+            user_agents=['agent-1', 'agent-2'],
+            proxy_pool=ProxyPool(['proxy-1:80', 'proxy-2:80'], max_errors=1)
+        )
+
+    def test_sticky_identity(self):
+        identity = self.pool.get('example.com')
+        self.assertIs(self.pool.get('example.com'), identity)
+
+        # A new identity is assigned once
+        # the proxy is banned
+        self.pool.record_response(identity, error=True)
+        new_identity = self.pool.get('example.com')
+        self.assertIsNot(new_identity, identity)
+        self.assertNotEqual(new_identity.proxy, identity.proxy)
+
+    def test_proxies(self):
+        identity = Identity(user_agent='agent-1', proxy='proxy-1:80')
+        self.assertDictEqual(
+            identity.proxies,
+            {'http': 'http://proxy-1:80', 'https': 'http://proxy-1:80'}
+        )
+        self.assertIsNone(Identity(user_agent='agent-1').proxies)
+
+    @patch('kryptone.identities.requests.request')
+    def test_fetch(self, request):
+        request.return_value = MagicMock(status_code=200)
+        self.pool.fetch('http://example.com/page', timeout=5)
+
+        identity = self.pool.get('example.com')
+        _, kwargs = request.call_args
+        self.assertEqual(kwargs['headers']['User-Agent'], identity.user_agent)
+        self.assertEqual(kwargs['proxies'], identity.proxies)
+        self.assertEqual(kwargs['timeout'], 5)
+
+        statistics = self.pool.statistics()['proxies'][identity.proxy]
+        self.assertEqual(statistics['requests_count'], 1)
+
+    @patch('kryptone.identities.requests.request', side_effect=requests.exceptions.ProxyError)
+    def test_fetch_error(self, request):
+        identity = self.pool.get('example.com')
+        with self.assertRaises(requests.exceptions.ProxyError):
+            self.pool.fetch('http://example.com')
+        self.assertFalse(self.pool.is_usable(identity))
+
+    def test_browser_options(self):
+        identity = Identity(user_agent='agent-1', proxy='proxy-1:80')
+        options = create_browser_options('Chrome', identity=identity)
+        self.assertIn('--user-agent=agent-1', options.arguments)
+        self.assertIn('--proxy-server=http://proxy-1:80', options.arguments)
+
+    def test_browser_ban_status(self):
+        driver = MagicMock()
+        identity = self.pool.get('example.com')
+        browser_identities[driver] = identity
+
+        spider = SimpleNamespace(
+            driver=driver,
+            rate_governor=RateGovernor(),
+            identity_pool=self.pool
+        )
+        for _ in range(3):
+            BaseCrawler.record_successful_request(
+                spider,
+                'http://example.com',
+                time.monotonic(),
+                status_code=403
+            )
+        self.assertFalse(self.pool.is_usable(identity))
+
+    def test_can_replace(self):
+        identity = self.pool.get('example.com')
+        self.assertFalse(self.pool.can_replace(identity))
+
+        self.pool.record_response(identity, error=True)
+        self.assertTrue(self.pool.can_replace(identity))
+
+        # Once every proxy is banned the
+        # identity is no longer replaced
+        other = self.pool.get('example.com')
+        self.pool.record_response(other, error=True)
+        self.assertFalse(self.pool.can_replace(identity))
+
+
+if __name__ == '__main__':
+    unittest.main()
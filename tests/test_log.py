@@ -1,6 +1,10 @@
+import json
+import pathlib
+import tempfile
 from unittest import TestCase
+from unittest.mock import Mock, patch
 
-from kryptone import logger
+from kryptone import Logger, logger, remove_ansi
 from kryptone.utils.text import LogStyle, color_text
 
 
@@ -26,3 +30,51 @@ class TestLogging(TestCase):
     
     def test_color_text_method(self):
         logger.info(color_text('red', 'My text'))
+
+
+class TestLoggerConfiguration(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = pathlib.Path(self.directory.name) / 'access.log'
+        self.logger = Logger.create(name='KRYPTONE_TEST')
+
+    def tearDown(self):
+        self.logger.configure(filename=self.filename, use_queue=False)
+        for handler in list(self.logger.instance.handlers):
+            self.logger.instance.removeHandler(handler)
+            handler.close()
+        self.directory.cleanup()
+
+    def test_queue_and_json_format(self):
+        self.logger.configure(
+            filename=self.filename,
+            use_queue=True,
+            json_format=True
+        )
+        self.logger.info(color_text('red', 'My text'))
+        self.logger.stop_listener()
+
+        with open(self.filename, encoding='utf-8') as f:
+            data = json.loads(f.readline())
+        self.assertEqual(data['message'], 'My text')
+        self.assertEqual(data['level'], 'INFO')
+
+    @patch('kryptone.atexit.register')
+    def test_listener_registered_once(self, register):
+        self.logger.configure(filename=self.filename, use_queue=True)
+        self.logger.configure(filename=self.filename, use_queue=True, json_format=True)
+        self.logger.stop_listener()
+        register.assert_called_once_with(self.logger.stop_listener)
+
+    def test_lazy_messages(self):
+        self.logger.configure(filename=self.filename, level='INFO')
+
+        message = Mock(return_value='Debug')
+        self.logger.debug(message)
+        message.assert_not_called()
+
+        self.logger.info(message)
+        message.assert_called_once()
+
+    def test_remove_ansi(self):
+        self.assertEqual(remove_ansi(color_text('red', 'My text')), 'My text')
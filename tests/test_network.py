@@ -0,0 +1,106 @@
+import base64
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from kryptone.browsers import create_browser_options
+from kryptone.network import NetworkCapture, iter_network_events
+
+
+def create_entry(method, **params):
+    message = {'message': {'method': method, 'params': params}}
+    return {'message': json.dumps(message), 'level': 'INFO'}
+
+
+def create_response_entries(request_id, url, mime_type='application/json', resource_type='XHR', size=100):
+    return [
+        create_entry(
+            'Network.responseReceived',
+            requestId=request_id,
+            type=resource_type,
+            response={'url': url, 'status': 200, 'mimeType': mime_type}
+        ),
+        create_entry(
+            'Network.loadingFinished',
+            requestId=request_id,
+            encodedDataLength=size
+        )
+    ]
+
+
+class TestNetworkCapture(unittest.TestCase):
+    def setUp(self):
+        self.driver = MagicMock()
+        self.driver.execute_cdp_cmd.return_value = {
+            'body': '{"products": [1, 2]}',
+            'base64Encoded': False
+        }
+
+    def test_iter_network_events(self):
+        entries = [
+            create_entry('Network.requestWillBeSent', requestId='1'),
+            create_entry('Page.loadEventFired'),
+            {'message': 'invalid'}
+        ]
+        methods = [method for method, _ in iter_network_events(entries)]
+        self.assertListEqual(methods, ['Network.requestWillBeSent'])
+
+    def test_capture(self):
+        capture = NetworkCapture(patterns=[r'/api/products'])
+        entries = [
+            *create_response_entries('1', 'http://example.com/api/products'),
+            *create_response_entries('2', 'http://example.com/api/users'),
+            *create_response_entries('3', 'http://example.com/api/products.js', mime_type='application/javascript'),
+            *create_response_entries('4', 'http://example.com/api/products', resource_type='Document')
+        ]
+
+        captured = capture.process(self.driver, entries, page_url='http://example.com')
+        self.assertEqual(len(captured), 1)
+        self.driver.execute_cdp_cmd.assert_called_once_with(
+            'Network.getResponseBody',
+            {'requestId': '1'}
+        )
+        self.assertListEqual(list(capture.iter_json()), [{'products': [1, 2]}])
+        self.assertEqual(len(capture.filter(page_url='http://example.com')), 1)
+        self.assertEqual(len(capture.filter(page_url='http://example.com/other')), 0)
+
+    def test_base64_body(self):
+        self.driver.execute_cdp_cmd.return_value = {
+            'body': base64.b64encode(b'{"id": 1}').decode(),
+            'base64Encoded': True
+        }
+        capture = NetworkCapture()
+        capture.process(self.driver, create_response_entries('1', 'http://example.com/api'))
+        self.assertDictEqual(capture.responses[0].data, {'id': 1})
+
+    def test_bounded_buffer(self):
+        capture = NetworkCapture(max_responses=2, max_body_size=1000)
+        entries = []
+        for i in range(4):
+            entries.extend(create_response_entries(str(i), f'http://example.com/api/{i}'))
+        entries.extend(create_response_entries('5', 'http://example.com/api/5', size=5000))
+
+        capture.process(self.driver, entries)
+        self.assertEqual(len(capture), 2)
+        self.assertEqual(capture.captured_count, 4)
+
+        capture.clear()
+        self.assertEqual(len(capture), 0)
+
+    def test_vendor_json_content_type(self):
+        capture = NetworkCapture()
+        self.assertTrue(capture.match('http://example.com', 'application/ld+json', 'Fetch'))
+        self.assertFalse(capture.match('http://example.com', 'text/html', 'Fetch'))
+
+
+class TestPerformanceLogs(unittest.TestCase):
+    def test_logs_are_optional(self):
+        options = create_browser_options('Chrome', performance_logs=False)
+        self.assertNotIn('goog:loggingPrefs', options.to_capabilities())
+
+        options = create_browser_options('Chrome')
+        self.assertIn('goog:loggingPrefs', options.to_capabilities())
+
+
+if __name__ == '__main__':
+    unittest.main()
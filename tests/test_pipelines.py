@@ -0,0 +1,177 @@
+import csv
+import dataclasses
+import json
+import pathlib
+import sqlite3
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from kryptone.base import BaseCrawler
+from kryptone.pipelines import (CSVSink, DeduplicationStage, ItemPipeline,
+                                JSONLinesSink, MemorySink, ModelCleaner,
+                                SQLiteSink, ValidationStage)
+
+
+@dataclasses.dataclass
+class Product:
+    name: str = None
+    url: str = None
+    tags: list = dataclasses.field(default_factory=list)
+
+    def clean_name(self, value):
+        if value is None:
+            return value
+        return value.strip()
+
+
+class TestModelCleaner(unittest.TestCase):
+    def test_cleaning(self):
+        cleaner = ModelCleaner(Product)
+        instance = cleaner({'name': ' Kendall '})
+        self.assertEqual(instance.name, 'Kendall')
+
+    def test_invalid_model(self):
+        with self.assertRaises(ValueError):
+            ModelCleaner(None)
+
+        with self.assertRaises(ValueError):
+            ModelCleaner(dict)
+
+    def test_invalid_keys(self):
+        cleaner = ModelCleaner(Product)
+        with self.assertRaises(TypeError):
+            cleaner({'price': 1})
+
+
+class TestItemPipeline(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_stages(self):
+        pipeline = ItemPipeline(
+            stages=[
+                ValidationStage(['url']),
+                DeduplicationStage(fields=['url'])
+            ],
+            batch_size=10
+        )
+        pipeline.bind(Product)
+
+        items = pipeline.process([
+            {'name': 'A', 'url': 'http://example.com/1'},
+            {'name': 'B', 'url': 'http://example.com/1'},
+            {'name': 'C'}
+        ])
+        self.assertEqual(len(items), 1)
+        self.assertEqual(pipeline.dropped_count, 2)
+
+    def test_required_fields(self):
+        pipeline = ItemPipeline()
+        pipeline.bind(Product)
+        items = pipeline.process({'name': 'A'}, required_fields=['url'])
+        self.assertListEqual(items, [])
+
+    def test_deduplication_is_bounded(self):
+        stage = DeduplicationStage(fields=['url'], max_size=2)
+        for i in range(5):
+            stage(Product(url=str(i)))
+        self.assertEqual(len(stage.fingerprints), 2)
+
+    def test_stable_fingerprint(self):
+        stage = DeduplicationStage()
+        fingerprint = stage.get_fingerprint(Product(name='A', tags=['b', 'a']))
+        self.assertEqual(fingerprint, stage.get_fingerprint(Product(name='A', tags=['b', 'a'])))
+        self.assertNotEqual(fingerprint, stage.get_fingerprint(Product(name='A')))
+        self.assertEqual(len(fingerprint), 16)
+
+    def test_spider_closes_pipeline_on_errors(self):
+        spider = SimpleNamespace(
+            close_pipeline=Mock(side_effect=KeyboardInterrupt),
+            close_screenshot_service=Mock(),
+            release_driver=Mock()
+        )
+        with self.assertRaises(KeyboardInterrupt):
+            BaseCrawler.finish_crawl(spider)
+        spider.close_screenshot_service.assert_called_once()
+        spider.release_driver.assert_called_once()
+
+    def test_batches(self):
+        sink = MemorySink()
+        batches = []
+
+        pipeline = ItemPipeline(
+            sinks=[sink],
+            batch_size=2,
+            flush_interval=None
+        )
+        pipeline.bind(Product)
+        pipeline.connect(batches.append)
+
+        pipeline.process({'name': 'A'})
+        self.assertEqual(len(sink), 0)
+
+        pipeline.process({'name': 'B'})
+        self.assertEqual(len(sink), 2)
+
+        pipeline.process({'name': 'C'})
+        pipeline.close()
+        self.assertEqual(len(sink), 3)
+        self.assertListEqual([len(batch) for batch in batches], [2, 1])
+
+    def test_disconnect(self):
+        batches = []
+        pipeline = ItemPipeline(batch_size=1)
+        pipeline.bind(Product)
+        pipeline.connect(batches.append)
+        pipeline.connect(batches.append)
+        self.assertEqual(len(pipeline.callbacks), 1)
+
+        pipeline.disconnect(batches.append)
+        pipeline.process({'name': 'A'})
+        self.assertListEqual(batches, [])
+
+    def test_file_sinks(self):
+        jsonl_path = self.path.joinpath('items.jsonl')
+        csv_path = self.path.joinpath('items.csv')
+        sqlite_path = self.path.joinpath('items.sqlite')
+
+        pipeline = ItemPipeline(
+            sinks=[
+                JSONLinesSink(jsonl_path),
+                CSVSink(csv_path),
+                SQLiteSink(sqlite_path)
+            ],
+            batch_size=2
+        )
+        pipeline.bind(Product)
+        pipeline.process([
+            {'name': 'A', 'tags': ['a']},
+            {'name': 'B'},
+            {'name': 'C'}
+        ])
+        pipeline.close()
+
+        with open(jsonl_path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+            self.assertEqual(len(lines), 3)
+            self.assertListEqual(lines[0]['tags'], ['a'])
+
+        with open(csv_path, encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(rows[0]['tags'], '["a"]')
+
+        connection = sqlite3.connect(sqlite_path)
+        count = connection.execute('select count(*) from items').fetchone()
+        connection.close()
+        self.assertEqual(count[0], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
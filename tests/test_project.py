@@ -5,9 +5,9 @@ from unittest.mock import MagicMixin, MagicMock, Mock, patch
 from kryptone.registry import registry
 
 
-@patch('kryptone.base.Service')
-@patch('kryptone.base.Chrome')
-@patch('kryptone.base.ChromeDriverManager')
+@patch('kryptone.browsers.ChromeService')
+@patch('kryptone.browsers.Chrome')
+@patch('kryptone.browsers.DriverCache.install')
 class TestProject(TestCase):
     def test_structure(self, mock_driver_manager, mock_chrome, mock_service):
         pass
@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import MagicMock
+
+from kryptone.readiness import (DocumentReady, DOMQuiescence, NetworkIdle,
+                                ReadinessPolicy, SelectorPresent, wait_for)
+from kryptone.routing import Router, route
+
+
+class TestConditions(unittest.TestCase):
+    def test_document_ready(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = 'interactive'
+        self.assertTrue(DocumentReady('interactive')(driver))
+        self.assertFalse(DocumentReady('complete')(driver))
+
+        with self.assertRaises(ValueError):
+            DocumentReady('loading')
+
+    def test_selector_present(self):
+        driver = MagicMock()
+        driver.find_elements.return_value = []
+        self.assertFalse(SelectorPresent('.product')(driver))
+
+        element = MagicMock()
+        element.is_displayed.return_value = False
+        driver.find_elements.return_value = [element]
+        self.assertTrue(SelectorPresent('.product')(driver))
+        self.assertFalse(SelectorPresent('.product', visible=True)(driver))
+
+    def test_network_idle(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = [1, 2000]
+        self.assertFalse(NetworkIdle(idle_time=0.5)(driver))
+
+        driver.execute_script.return_value = [0, 200]
+        self.assertFalse(NetworkIdle(idle_time=0.5)(driver))
+
+        driver.execute_script.return_value = [0, 600]
+        self.assertTrue(NetworkIdle(idle_time=0.5)(driver))
+
+    def test_network_tracker_is_registered_once(self):
+        driver = MagicMock()
+        driver.session_id = '1'
+        driver.current_window_handle = 'tab'
+
+        condition = NetworkIdle()
+        condition.setup(driver)
+        condition.setup(driver)
+        driver.execute_cdp_cmd.assert_called_once()
+
+    def test_dom_quiescence(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = 100
+        self.assertFalse(DOMQuiescence(quiet_time=0.5)(driver))
+
+
+class TestWaitFor(unittest.TestCase):
+    def test_returns_when_ready(self):
+        driver = MagicMock()
+        driver.execute_script.side_effect = [0, 100, 600]
+
+        result = wait_for(driver, [DOMQuiescence()], timeout=5, poll_frequency=0.01)
+        self.assertTrue(result.is_ready)
+        self.assertLess(result.waited, 1)
+        self.assertEqual(driver.execute_script.call_count, 3)
+
+    def test_timeout(self):
+        driver = MagicMock()
+        driver.find_elements.return_value = []
+
+        result = wait_for(driver, [SelectorPresent('.product')], timeout=0.05, poll_frequency=0.01)
+        self.assertFalse(result.is_ready)
+        self.assertListEqual(result.pending_conditions, ['selector_present'])
+
+    def test_policy_statistics(self):
+        driver = MagicMock()
+        driver.find_elements.return_value = [MagicMock()]
+
+        policy = ReadinessPolicy(timeout=1)
+        policy.wait(driver)
+        policy.wait(driver)
+
+        statistics = policy.statistics()
+        self.assertEqual(statistics['pages_count'], 2)
+        self.assertIn('average_wait_time', statistics)
+
+    def test_timeouts_are_counted(self):
+        driver = MagicMock()
+        driver.find_elements.return_value = []
+
+        policy = ReadinessPolicy(conditions=[SelectorPresent('.price')], timeout=0.05, poll_frequency=0.01)
+        result = policy.wait(driver)
+        self.assertFalse(result.is_ready)
+        self.assertEqual(policy.statistics()['timeouts_count'], 1)
+
+    def test_route_readiness(self):
+        policy = ReadinessPolicy(conditions=[SelectorPresent('.price')])
+        router = Router([route('product', path='/product', readiness=policy)])
+        self.assertIs(router.match('http://example.com/product').route.readiness, policy)
+
+
+if __name__ == '__main__':
+    unittest.main()
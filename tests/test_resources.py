@@ -0,0 +1,121 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from kryptone.resources import ResourcePolicy, set_blocked_urls
+from kryptone.routing import Router, route
+
+
+def create_entry(method, **params):
+    message = {'message': {'method': method, 'params': params}}
+    return {'message': json.dumps(message), 'level': 'INFO'}
+
+
+class TestResourcePolicy(unittest.TestCase):
+    def test_blocked_patterns(self):
+        policy = ResourcePolicy(
+            resource_types=['font'],
+            domains=['cdn.example.com'],
+            block_trackers=True,
+            allowed_domains=['hotjar.com']
+        )
+        patterns = policy.get_blocked_patterns()
+        self.assertIn('*.woff2', patterns)
+        self.assertIn('*://cdn.example.com/*', patterns)
+        self.assertIn('*://*.google-analytics.com/*', patterns)
+        self.assertNotIn('*://*.hotjar.com/*', patterns)
+
+    def test_invalid_resource_type(self):
+        with self.assertRaises(ValueError):
+            ResourcePolicy(resource_types=['videos'])
+
+    def test_apply(self):
+        driver = MagicMock()
+        policy = ResourcePolicy(resource_types=['media'])
+        self.assertTrue(policy.apply(driver))
+        driver.execute_cdp_cmd.assert_called_with(
+            'Network.setBlockedURLs',
+            {'urls': policy.get_blocked_patterns()}
+        )
+
+        # Browsers that do not support CDP
+        self.assertFalse(set_blocked_urls(object(), []))
+
+    def test_collect(self):
+        policy = ResourcePolicy(max_size=1000)
+        entries = [
+            create_entry('Network.requestWillBeSent', requestId='1', request={'url': 'http://example.com'}),
+            create_entry('Network.requestWillBeSent', requestId='2', request={'url': 'http://example.com/video.mp4'}),
+            create_entry('Network.requestWillBeSent', requestId='3', request={'url': 'http://tracker.com/t.js'}),
+            create_entry('Network.loadingFinished', requestId='1', encodedDataLength=5000),
+            create_entry('Network.loadingFinished', requestId='2', encodedDataLength=20000),
+            create_entry('Network.loadingFailed', requestId='3', blockedReason='inspector'),
+            {'message': 'invalid'}
+        ]
+
+        statistics = policy.collect(entries, page_url='http://example.com')
+        self.assertEqual(statistics.requests_count, 3)
+        self.assertEqual(statistics.blocked_count, 1)
+        self.assertEqual(statistics.bytes_loaded, 25000)
+        # The document of the page is never blocked
+        self.assertListEqual(statistics.oversized_urls, ['http://example.com/video.mp4'])
+        self.assertIn('http://example.com/video.mp4*', policy.get_blocked_patterns())
+
+        entries = [
+            create_entry('Network.requestWillBeSent', requestId='4', request={'url': 'http://example.com/video.mp4?t=1'}),
+            create_entry('Network.loadingFailed', requestId='4', blockedReason='inspector')
+        ]
+        statistics = policy.collect(entries, page_url='http://example.com/2')
+        self.assertEqual(statistics.bytes_saved, 20000)
+        self.assertEqual(policy.statistics()['blocked_count'], 2)
+
+    def test_bytes_saved_estimate(self):
+        policy = ResourcePolicy(resource_types=['font'])
+        entries = [
+            create_entry('Network.requestWillBeSent', requestId='1', type='Font', request={'url': 'http://example.com/a.woff'}),
+            create_entry('Network.requestWillBeSent', requestId='2', type='Font', request={'url': 'http://example.com/b.woff'}),
+            create_entry('Network.loadingFinished', requestId='1', encodedDataLength=1000),
+            create_entry('Network.loadingFinished', requestId='2', encodedDataLength=3000)
+        ]
+        policy.collect(entries, page_url='http://example.com')
+
+        # Blocked resources are estimated from their previous
+        # size or from the resources of the same type
+        entries = [
+            create_entry('Network.requestWillBeSent', requestId='3', type='Font', request={'url': 'http://example.com/a.woff'}),
+            create_entry('Network.requestWillBeSent', requestId='4', type='Font', request={'url': 'http://example.com/c.woff'}),
+            create_entry('Network.requestWillBeSent', requestId='5', type='Media', request={'url': 'http://example.com/d.mp4'}),
+            create_entry('Network.loadingFailed', requestId='3', type='Font', blockedReason='inspector'),
+            create_entry('Network.loadingFailed', requestId='4', type='Font', blockedReason='inspector'),
+            create_entry('Network.loadingFailed', requestId='5', type='Media', blockedReason='inspector')
+        ]
+        statistics = policy.collect(entries, page_url='http://example.com/2')
+        self.assertEqual(statistics.blocked_count, 3)
+        self.assertEqual(statistics.bytes_saved, 3000)
+
+    def test_oversized_limit(self):
+        policy = ResourcePolicy(max_size=10, max_oversized=2)
+        for i in range(3):
+            entries = [
+                create_entry('Network.requestWillBeSent', requestId=str(i), request={'url': f'http://example.com/{i}.mp4?session={i}'}),
+                create_entry('Network.loadingFinished', requestId=str(i), encodedDataLength=100)
+            ]
+            policy.collect(entries, page_url='http://example.com')
+
+        self.assertListEqual(
+            list(policy.oversized_resources),
+            ['http://example.com/1.mp4*', 'http://example.com/2.mp4*']
+        )
+
+    def test_route_policy(self):
+        policy = ResourcePolicy(resource_types=['image'])
+        router = Router([
+            route('products', path='/products', resource_policy=policy),
+            route('home', path='/')
+        ])
+        self.assertIs(router.match('http://example.com/products').route.resource_policy, policy)
+        self.assertIsNone(router.match('http://example.com/').route.resource_policy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -51,3 +51,53 @@ class TestRouting(unittest.TestCase):
 
     def test_structure(self):
         self.spider.start()
+
+
+class TestRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = Router([
+            route('product', regex=r'\/products\/(?P<slug>[a-z\-]+)$', name='product'),
+            route('products', regex=r'\/products', name='products'),
+            route('home', path='/', name='home')
+        ])
+
+    def test_instances_do_not_share_routes(self):
+        other_router = Router([route('home', path='/')])
+        self.assertEqual(len(other_router.routes), 1)
+        self.assertEqual(len(self.router.routes), 3)
+
+    def test_classify(self):
+        urls = [
+            ('http://example.com/products/red-shoes', 'product'),
+            ('http://example.com/products', 'products'),
+            ('http://example.com/', 'home'),
+            ('http://example.com/about', None)
+        ]
+        for url, expected in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.router.classify(url), expected)
+
+    def test_resolve_passes_params(self):
+        spider = MagicMock()
+        result = self.router.resolve(
+            'http://example.com/products/red-shoes', spider)
+
+        self.assertEqual(result.name, 'product')
+        spider.product.assert_called_once()
+        self.assertEqual(
+            spider.product.call_args.kwargs['slug'],
+            'red-shoes'
+        )
+
+    def test_resolution_is_cached(self):
+        self.router.classify('http://example.com/products')
+        self.router.classify('http://example.com/products?page=2')
+        self.assertEqual(self.router.match_path.cache_info().hits, 1)
+
+    def test_conflicting_group_names(self):
+        router = Router([
+            route('first', regex=r'\/a\/(?P<id>\d+)'),
+            route('second', regex=r'\/b\/(?P<id>\d+)')
+        ])
+        self.assertIsNone(router.combined_regex)
+        self.assertEqual(router.classify('http://example.com/b/1'), 'route_1')
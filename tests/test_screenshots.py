@@ -0,0 +1,98 @@
+import base64
+import io
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from kryptone.screenshots import ScreenshotService, capture_png
+
+
+def create_png(color='red', size=(200, 100)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color=color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class TestScreenshotService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name).joinpath('screenshots')
+
+        self.driver = MagicMock()
+        self.driver.get_screenshot_as_png.return_value = create_png()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_compression_and_deduplication(self):
+        service = ScreenshotService(self.path, image_format='jpeg')
+        self.assertTrue(service.capture(self.driver, name='h1', page_url='http://example.com/1'))
+        self.assertTrue(service.capture(self.driver, name='h1', page_url='http://example.com/2'))
+        service.close()
+
+        files = list(self.path.iterdir())
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].name.startswith('h1_'))
+        self.assertEqual(files[0].suffix, '.jpg')
+
+        statistics = service.statistics()
+        self.assertEqual(statistics['saved_count'], 1)
+        self.assertEqual(statistics['duplicates_count'], 1)
+        self.assertIs(
+            service.pages['http://example.com/1'],
+            service.pages['http://example.com/2']
+        )
+
+    def test_webp(self):
+        service = ScreenshotService(self.path)
+        service.capture(self.driver)
+        service.flush()
+
+        screenshot, = service.screenshots.values()
+        self.assertEqual(screenshot.path.suffix, '.webp')
+        self.assertEqual(Image.open(screenshot.path).format, 'WEBP')
+        service.close()
+
+    def test_disk_usage_limit(self):
+        service = ScreenshotService(self.path, image_format='png', max_disk_usage=0.0001)
+        self.driver.get_screenshot_as_png.side_effect = [create_png('red'), create_png('blue')]
+        service.capture(self.driver)
+        service.capture(self.driver)
+        service.close()
+
+        self.assertEqual(len(service), 0)
+        self.assertEqual(service.statistics()['skipped_count'], 2)
+
+    def test_full_queue(self):
+        service = ScreenshotService(self.path, max_queue_size=1)
+        # The worker is not started so
+        # that the queue stays full
+        service.start = MagicMock()
+        self.assertTrue(service.capture(self.driver))
+        self.assertFalse(service.capture(self.driver))
+        self.assertEqual(service.statistics()['dropped_count'], 1)
+
+    def test_full_page(self):
+        data = create_png()
+        self.driver.execute_cdp_cmd.side_effect = [
+            {'cssContentSize': {'width': 200, 'height': 3000}},
+            {'data': base64.b64encode(data).decode()}
+        ]
+        self.assertEqual(capture_png(self.driver, full_page=True), data)
+
+        method, params = self.driver.execute_cdp_cmd.call_args.args
+        self.assertEqual(method, 'Page.captureScreenshot')
+        self.assertTrue(params['captureBeyondViewport'])
+        self.assertEqual(params['clip']['height'], 3000)
+        self.driver.get_screenshot_as_png.assert_not_called()
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            ScreenshotService(self.path, image_format='gif')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from kryptone.signals import NO_RECEIVERS, Signal
+
+
+def sync_receiver(sender, **kwargs):
+    return 'sync'
+
+
+async def async_receiver(sender, **kwargs):
+    return 'async'
+
+
+def failing_receiver(sender, **kwargs):
+    raise ValueError('Receiver failed')
+
+
+class TestSignal(unittest.TestCase):
+    def setUp(self):
+        self.signal = Signal()
+
+    def test_send(self):
+        self.signal.connect(sync_receiver)
+        responses = self.signal.send(self)
+        self.assertListEqual(responses, [(sync_receiver, 'sync')])
+
+    def test_receivers_are_cached(self):
+        self.signal.connect(sync_receiver, sender=self)
+        self.signal.send(self)
+        self.assertIn(self, self.signal.sender_receivers_cache)
+
+        # Senders without receivers are also cached
+        self.signal.send(object)
+        self.assertIs(
+            self.signal.sender_receivers_cache[object],
+            NO_RECEIVERS
+        )
+
+        self.signal.disconnect(sync_receiver, sender=self)
+        self.assertEqual(len(self.signal.sender_receivers_cache), 0)
+        self.assertListEqual(self.signal.send(self), [])
+
+    def test_cache_does_not_keep_senders(self):
+        class Sender:
+            pass
+
+        sender = Sender()
+        self.signal.connect(sync_receiver)
+        self.signal.send(sender)
+        self.assertEqual(len(self.signal.sender_receivers_cache), 1)
+
+        del sender
+        self.assertEqual(len(self.signal.sender_receivers_cache), 0)
+
+        # Senders that cannot be weakly
+        # referenced are not cached
+        self.assertListEqual(self.signal.send('sender'), [(sync_receiver, 'sync')])
+        self.assertListEqual(self.signal.send(None), [(sync_receiver, 'sync')])
+        self.assertEqual(len(self.signal.sender_receivers_cache), 0)
+
+    def test_dead_receivers(self):
+        def temporary_receiver(**kwargs):
+            return True
+
+        self.signal.connect(temporary_receiver)
+        self.assertEqual(len(self.signal.send(self)), 1)
+
+        del temporary_receiver
+        self.assertListEqual(self.signal.send(self), [])
+
+    def test_async_receivers(self):
+        self.signal.connect(sync_receiver)
+        self.signal.connect(async_receiver)
+
+        responses = dict(self.signal.send(self))
+        self.assertEqual(responses[async_receiver], 'async')
+        self.assertEqual(responses[sync_receiver], 'sync')
+
+    def test_send_to_all(self):
+        self.signal.connect(failing_receiver)
+        responses = self.signal.send_to_all(self)
+        self.assertIsInstance(responses[0][1], ValueError)
+
+    def test_send_in_thread(self):
+        self.signal.connect(sync_receiver)
+        future = self.signal.send_in_thread(self)
+        self.assertListEqual(future.result(), [(sync_receiver, 'sync')])
+
+
+class TestAsyncSignal(unittest.IsolatedAsyncioTestCase):
+    async def test_asend(self):
+        signal = Signal()
+        signal.connect(sync_receiver)
+        signal.connect(async_receiver)
+
+        responses = dict(await signal.asend(self))
+        self.assertEqual(responses[async_receiver], 'async')
+        self.assertEqual(responses[sync_receiver], 'sync')
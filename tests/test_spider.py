@@ -274,7 +274,10 @@ class SpiderMixin:
             browser_name=None,
             headless=False,
             load_images=True,
-            load_js=True
+            load_js=True,
+            # No resource policy or network capture
+            # uses the performance logs
+            performance_logs=False
         )
 
         cls.mocked_edge = mocked_edge
@@ -387,6 +390,13 @@ class TestSpider(SpiderMixin, unittest.TestCase):
         self.spider.model = TestModel
         self.spider.save_object({'name': 'Kendall Jenner'})
         self.assertTrue(len(self.spider.DATA_CONTAINER) > 0)
+        # Without sinks, the container is the
+        # only copy of the items
+        self.assertIsNone(self.spider.DATA_CONTAINER.maxlen)
+
+        pipeline = self.spider.pipeline
+        self.spider.close_pipeline()
+        self.assertNotIn(self.spider.run_after_data_save, pipeline.callbacks)
 
     def test_async_post_navigation_actions(self):
         spider = self.spider
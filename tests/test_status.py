@@ -0,0 +1,118 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from kryptone.base import BaseCrawler
+from kryptone.identities import IdentityPool, ProxyPool
+from kryptone.status import StatusChecker, get_document_status
+
+
+def create_document_entry(url, status, resource_type='Document'):
+    params = {'type': resource_type, 'response': {'url': url, 'status': status}}
+    message = {'message': {'method': 'Network.responseReceived', 'params': params}}
+    return {'message': json.dumps(message)}
+
+
+def create_response(status_code, url='http://example.com'):
+    response = MagicMock(status_code=status_code, url=url)
+    return response
+
+
+class TestStatusChecker(unittest.TestCase):
+    def setUp(self):
+        self.checker = StatusChecker(
+            max_workers=4,
+            identity_pool=IdentityPool(user_agents=['agent'])
+        )
+
+    def test_document_status(self):
+        entries = [
+            create_document_entry('http://example.com/iframe', 200),
+            create_document_entry('http://example.com/page', 404),
+            create_document_entry('http://example.com/api', 500, resource_type='XHR')
+        ]
+        self.assertEqual(get_document_status(entries, 'http://example.com/page#top'), 404)
+        self.assertEqual(get_document_status(entries), 200)
+        self.assertIsNone(get_document_status([]))
+
+    def test_page_status_without_request(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = 200
+
+        with patch.object(self.checker.session, 'request') as request:
+            status = self.checker.get_page_status(driver, 'http://example.com')
+            request.assert_not_called()
+        self.assertEqual(status.method, 'browser')
+
+        # Recorded from the performance logs
+        self.checker.record('http://example.com/a', 404)
+        status = self.checker.get_page_status(driver, 'http://example.com/a')
+        self.assertTrue(status.is_broken)
+
+    def test_head_first(self):
+        with patch.object(self.checker.session, 'request', side_effect=[create_response(405), create_response(200)]) as request:
+            status = self.checker.check('http://example.com')
+
+        methods = [item.args[0] for item in request.call_args_list]
+        self.assertListEqual(methods, ['HEAD', 'GET'])
+        self.assertEqual(status.status_code, 200)
+        self.assertEqual(request.call_args.kwargs['timeout'], 10)
+
+    def test_proxies_are_not_banned(self):
+        identity_pool = IdentityPool(
+            user_agents=['agent'],
+            proxy_pool=ProxyPool(['proxy-1:80'], max_ban_responses=1)
+        )
+        checker = StatusChecker(identity_pool=identity_pool)
+        with patch.object(checker.session, 'request', return_value=create_response(429)):
+            checker.check('http://other.com')
+        self.assertTrue(identity_pool.proxy_pool.is_usable('proxy-1:80'))
+
+    def test_connection_error(self):
+        with patch.object(self.checker.session, 'request', side_effect=requests.exceptions.ConnectTimeout):
+            status = self.checker.check('http://example.com')
+        self.assertEqual(status.status_code, 0)
+        self.assertEqual(status.error, 'ConnectTimeout')
+
+    def test_broken_links(self):
+        def request(method, url, **kwargs):
+            return create_response(404 if url.endswith('/missing') else 200, url)
+
+        url_distribution = {
+            'http://example.com': ['http://example.com/a', 'http://example.com/missing'],
+            'http://example.com/a': ['http://example.com/missing', 'http://example.com']
+        }
+        with patch.object(self.checker.session, 'request', side_effect=request) as mock_request:
+            report = self.checker.broken_links(url_distribution)
+            # Each url is only requested once
+            self.assertEqual(mock_request.call_count, 3)
+
+        self.assertListEqual(list(report), list(url_distribution))
+        self.assertEqual(report['http://example.com'][0].url, 'http://example.com/missing')
+
+    def test_spider_page_status(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = 429
+        spider = SimpleNamespace(driver=driver, status_checker=self.checker)
+
+        # From the performance logs
+        entries = [create_document_entry('http://example.com/a', 503)]
+        status_code = BaseCrawler.get_page_status_code(spider, 'http://example.com/a', entries)
+        self.assertEqual(status_code, 503)
+        driver.execute_script.assert_not_called()
+
+        # From the Navigation Timing API when
+        # the performance logs are disabled
+        status_code = BaseCrawler.get_page_status_code(spider, 'http://example.com/b')
+        self.assertEqual(status_code, 429)
+        self.assertEqual(self.checker.statuses['http://example.com/b'].status_code, 429)
+
+        driver.execute_script.return_value = None
+        self.assertIsNone(BaseCrawler.get_page_status_code(spider, 'http://example.com/c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
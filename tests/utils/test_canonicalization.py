@@ -0,0 +1,112 @@
+import unittest
+from types import SimpleNamespace
+
+from kryptone.base import BaseCrawler, CrawlerOptions
+from kryptone.utils.canonicalization import (URLCanonicalizer,
+                                             normalize_percent_encoding)
+
+
+class TestURLCanonicalizer(unittest.TestCase):
+    def setUp(self):
+        self.instance = URLCanonicalizer()
+
+    def test_equivalent_urls(self):
+        urls = [
+            'http://example.com/a?a=1&b=2',
+            'http://example.com/a?b=2&a=1',
+            'HTTP://Example.COM:80/a?a=1&b=2',
+            'http://example.com/a?a=1&b=2&utm_source=newsletter',
+            'http://example.com/a?a=1&b=2#reviews',
+            'http://example.com/a;jsessionid=ABC123?a=1&b=2'
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.instance(url),
+                    'http://example.com/a?a=1&b=2'
+                )
+
+    def test_relative_path(self):
+        result = self.instance('/products/', base='https://example.com')
+        self.assertEqual(result, 'https://example.com/products/')
+
+    def test_remove_trailing_slash(self):
+        instance = URLCanonicalizer(remove_trailing_slash=True)
+        self.assertEqual(
+            instance('http://example.com/a/?a=1'),
+            'http://example.com/a?a=1'
+        )
+        self.assertEqual(instance('http://example.com/'), 'http://example.com/')
+
+    def test_non_http_urls(self):
+        for url in ['mailto:contact@example.com', 'javascript:void(0)', '']:
+            with self.subTest(url=url):
+                self.assertEqual(self.instance(url), url)
+
+    def test_allowed_and_ignored_params(self):
+        instance = URLCanonicalizer(
+            allowed_params=['page', 'color'],
+            ignored_params=['color']
+        )
+        result = instance('http://example.com/?sort=asc&page=2&color=red')
+        self.assertEqual(result, 'http://example.com/?page=2')
+
+    def test_ignore_queries(self):
+        instance = URLCanonicalizer(ignore_queries=True)
+        result = instance('http://example.com/shoes?page=2')
+        self.assertEqual(result, 'http://example.com/shoes')
+
+    def test_copy(self):
+        self.instance('http://example.com/a')
+        instance = self.instance.copy(ignore_queries=True)
+        self.assertTrue(instance.ignore_queries)
+        self.assertFalse(self.instance.ignore_queries)
+        self.assertDictEqual(instance.cache, {})
+        self.assertEqual(len(self.instance.cache), 1)
+
+    def test_spider_does_not_modify_canonicalizer(self):
+        options = CrawlerOptions(None, 'ExampleSpider')
+        options.canonicalizer = self.instance
+        options.ignore_queries = True
+        options.prepare()
+
+        spider = SimpleNamespace(_meta=options)
+        canonicalizer = BaseCrawler.canonicalizer.func(spider)
+        self.assertFalse(self.instance.ignore_queries)
+        self.assertIsNot(canonicalizer, self.instance)
+        self.assertTrue(canonicalizer.ignore_queries)
+
+    def test_spiders_do_not_share_canonicalizer(self):
+        options = CrawlerOptions(None, 'ExampleSpider')
+        options.prepare()
+
+        spider = SimpleNamespace(_meta=options)
+        first = BaseCrawler.canonicalizer.func(spider)
+        first.register_alias('http://example.com/a', 'http://example.com/b')
+
+        second = BaseCrawler.canonicalizer.func(spider)
+        self.assertIsNot(first, second)
+        self.assertDictEqual(second.aliases, {})
+        self.assertEqual(second('http://example.com/a'), 'http://example.com/a')
+
+    def test_percent_encoding(self):
+        self.assertEqual(
+            normalize_percent_encoding('/%7euser/a%2fb'),
+            '/~user/a%2Fb'
+        )
+
+    def test_memo_cache(self):
+        self.instance('http://example.com/a')
+        self.instance('http://example.com/a')
+        self.assertEqual(self.instance.hits, 1)
+        self.assertEqual(self.instance.misses, 1)
+
+    def test_register_alias(self):
+        self.instance.register_alias(
+            'http://example.com/shoes-red',
+            'http://example.com/shoes?color=red'
+        )
+        self.assertEqual(
+            self.instance('http://example.com/shoes-red'),
+            'http://example.com/shoes?color=red'
+        )
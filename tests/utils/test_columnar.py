@@ -0,0 +1,87 @@
+import dataclasses
+import pathlib
+import tempfile
+import unittest
+
+from kryptone.utils.columnar import (from_arrow_table, iter_parquet_values,
+                                     read_parquet_document, read_parquet_table,
+                                     to_arrow_table, write_parquet_document)
+from kryptone.utils.urls import URL
+
+CACHE = {
+    'spider': 'ExampleSpider',
+    'spider_uuid': '739f3877-f67f-41ec-a940-3c1fbf2e3e53',
+    'timestamp': '2024-45-29 14:45:23',
+    'urls_to_visit': [
+        URL('http://example.com/1'),
+        URL('http://example.com/2')
+    ],
+    'visited_urls': []
+}
+
+
+@dataclasses.dataclass
+class Product:
+    name: str
+    price: float
+    images: list = dataclasses.field(default_factory=list)
+
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_mapping(self):
+        table = to_arrow_table(CACHE)
+        self.assertListEqual(table.column_names, ['key', 'value'])
+        self.assertEqual(table.num_rows, 2)
+
+        data = from_arrow_table(table)
+        self.assertEqual(data['spider'], 'ExampleSpider')
+        self.assertListEqual(data['visited_urls'], [])
+        self.assertListEqual(
+            data['urls_to_visit'],
+            ['http://example.com/1', 'http://example.com/2']
+        )
+
+    def test_records(self):
+        products = [
+            Product('Kendall', 10.5, ['http://example.com/1.jpg']),
+            Product('Jenner', 12)
+        ]
+        table = to_arrow_table(products)
+        self.assertListEqual(table.column_names, ['name', 'price', 'images'])
+
+        data = from_arrow_table(table)
+        self.assertEqual(data[0]['name'], 'Kendall')
+        self.assertListEqual(data[1]['images'], [])
+
+    def test_values(self):
+        data = from_arrow_table(to_arrow_table([['http://example.com']]))
+        self.assertListEqual(data, ['http://example.com'])
+
+    def test_parquet_document(self):
+        path = self.path.joinpath('cache.parquet')
+        write_parquet_document(path, CACHE)
+        self.assertFalse(path.with_name('cache.parquet.tmp').exists())
+
+        data = read_parquet_document(path)
+        self.assertEqual(data['spider_uuid'], CACHE['spider_uuid'])
+
+        urls = list(iter_parquet_values(path, 'urls_to_visit'))
+        self.assertEqual(len(urls), 2)
+
+        table = read_parquet_table(
+            path,
+            columns=['value'],
+            filters=[('key', '=', 'urls_to_visit')]
+        )
+        self.assertEqual(table.num_rows, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from kryptone.governor import RateGovernor
+from kryptone.utils.robots import RobotsCache, RobotsTxtTest, parse_robots
+from kryptone.utils.urls import URL
+
+ROBOTS_TXT = """
+# Comments are ignored
+User-agent: *
+Disallow: /admin
+Allow: /admin/public
+Disallow: /*.pdf$
+Disallow: /search?
+Crawl-delay: 5
+
+User-agent: Kryptone
+User-agent: OtherBot
+Disallow: /private
+Allow: /private/shared
+Disallow:
+
+Sitemap: http://example.com/sitemap.xml
+"""
+
+
+def create_response(status_code=200, text=ROBOTS_TXT):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    return response
+
+
+class TestParseRobots(unittest.TestCase):
+    def test_default_group(self):
+        rules = parse_robots(ROBOTS_TXT, 'SomeBot')
+        self.assertEqual(rules.crawl_delay, 5)
+        self.assertListEqual(rules.sitemaps, ['http://example.com/sitemap.xml'])
+
+        self.assertFalse(rules.is_allowed('/admin'))
+        self.assertFalse(rules.is_allowed('/admin/users'))
+        self.assertTrue(rules.is_allowed('/admin/public/page'))
+        self.assertTrue(rules.is_allowed('/private'))
+        self.assertTrue(rules.is_allowed('/robots.txt'))
+
+    def test_wildcards(self):
+        rules = parse_robots(ROBOTS_TXT, 'SomeBot')
+        self.assertFalse(rules.is_allowed('/files/document.pdf'))
+        self.assertTrue(rules.is_allowed('/files/document.pdf.html'))
+        self.assertFalse(rules.is_allowed('/search?q=shoes'))
+        self.assertTrue(rules.is_allowed('/search'))
+
+    def test_user_agent_group(self):
+        rules = parse_robots(ROBOTS_TXT, 'Kryptone')
+        self.assertIsNone(rules.crawl_delay)
+        self.assertFalse(rules.is_allowed('/private/page'))
+        self.assertTrue(rules.is_allowed('/private/shared/page'))
+        self.assertTrue(rules.is_allowed('/admin'))
+
+    def test_tie_is_allowed(self):
+        rules = parse_robots('User-agent: *\nDisallow: /page\nAllow: /page', 'Kryptone')
+        self.assertTrue(rules.is_allowed('/page'))
+
+    def test_empty_file(self):
+        rules = parse_robots('', 'Kryptone')
+        self.assertTrue(rules.is_allowed('/admin'))
+
+
+class TestRobotsCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name).joinpath('robots.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @patch('kryptone.utils.robots.requests.get')
+    def test_rules_are_cached(self, get):
+        get.return_value = create_response()
+
+        cache = RobotsCache(user_agent='SomeBot', cache_path=self.path)
+        self.assertFalse(cache.is_allowed('http://example.com/admin'))
+        self.assertTrue(cache.is_allowed(URL('http://example.com/products')))
+        self.assertEqual(get.call_count, 1)
+        self.assertTrue(self.path.exists())
+
+        # The file is loaded from the disk
+        # on the next run of the spider
+        cache = RobotsCache(user_agent='SomeBot', cache_path=self.path)
+        self.assertFalse(cache.is_allowed('http://example.com/admin'))
+        self.assertEqual(get.call_count, 1)
+
+    @patch('kryptone.utils.robots.requests.get')
+    def test_status_codes(self, get):
+        cache = RobotsCache(user_agent='Kryptone')
+
+        get.return_value = create_response(status_code=404, text='')
+        self.assertTrue(cache.is_allowed('http://example.com/admin'))
+
+        get.return_value = create_response(status_code=503, text='')
+        self.assertFalse(cache.is_allowed('http://example.org/products'))
+        self.assertNotIn('http://example.org', cache.documents)
+
+    @patch('kryptone.utils.robots.requests.get')
+    def test_crawl_delay(self, get):
+        get.return_value = create_response()
+
+        governor = RateGovernor(initial_delay=2, min_delay=1, max_delay=3)
+        cache = RobotsCache(user_agent='SomeBot', governor=governor)
+        cache.is_allowed('http://example.com/products')
+
+        state = governor.get_state('http://example.com/products')
+        self.assertEqual(state.crawl_delay, 5)
+        self.assertEqual(state.delay, 5)
+
+        # Healthy responses cannot decrease
+        # the delay below the crawl delay
+        governor.record_request('http://example.com/products')
+        governor.record_response('http://example.com/products', latency=0.1)
+        self.assertEqual(state.delay, 5)
+
+    @patch('kryptone.utils.robots.requests.get')
+    def test_url_filter(self, get):
+        get.return_value = create_response()
+
+        instance = RobotsTxtTest(RobotsCache(user_agent='SomeBot'))
+        self.assertTrue(instance(URL('http://example.com/admin')))
+        self.assertFalse(instance(URL('http://example.com/products')))
+
+
+if __name__ == '__main__':
+    unittest.main()
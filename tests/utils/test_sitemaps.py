@@ -0,0 +1,128 @@
+import datetime
+import gzip
+import pathlib
+import tempfile
+import unittest
+
+from kryptone.utils.sitemaps import SitemapLoader, parse_lastmod
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url>
+        <loc>https://example.com/product-1</loc>
+        <lastmod>2024-01-01</lastmod>
+        <priority>0.8</priority>
+    </url>
+    <url>
+        <loc>https://example.com/product-2</loc>
+        <lastmod>2020-01-01T10:00:00+00:00</lastmod>
+        <priority>0.2</priority>
+    </url>
+    <url>
+        <loc>https://example.com/product-3</loc>
+    </url>
+</urlset>
+"""
+
+SITEMAP_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <sitemap><loc>{first}</loc></sitemap>
+    <sitemap><loc>{second}</loc></sitemap>
+</sitemapindex>
+"""
+
+
+class TestSitemapLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        path = pathlib.Path(cls.directory.name)
+
+        cls.sitemap_path = path / 'sitemap.xml'
+        cls.sitemap_path.write_text(SITEMAP, encoding='utf-8')
+
+        cls.gzip_path = path / 'sitemap.xml.gz'
+        with gzip.open(cls.gzip_path, mode='wb') as f:
+            f.write(SITEMAP.replace('product', 'item').encode('utf-8'))
+
+        cls.index_path = path / 'sitemap_index.xml'
+        cls.index_path.write_text(
+            SITEMAP_INDEX.format(
+                first=cls.sitemap_path,
+                second=cls.gzip_path
+            ),
+            encoding='utf-8'
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_sitemap(self):
+        loader = SitemapLoader(self.sitemap_path, batch_size=2)
+        batches = list(loader)
+        self.assertEqual(len(batches), 2)
+
+        entries = [entry for batch in batches for entry in batch]
+        self.assertEqual(entries[0].loc, 'https://example.com/product-1')
+        self.assertEqual(entries[0].priority, 0.8)
+        self.assertIsNotNone(entries[0].lastmod)
+
+    def test_sitemap_index_and_gzip(self):
+        loader = SitemapLoader(self.index_path, max_workers=2)
+        urls = [entry.loc for batch in loader for entry in batch]
+        self.assertEqual(len(urls), 6)
+        self.assertIn('https://example.com/item-3', urls)
+
+    def test_nested_sitemap_indexes(self):
+        path = pathlib.Path(self.directory.name)
+        # Indexes that reference each other
+        first = path / 'first_index.xml'
+        second = path / 'second_index.xml'
+        first.write_text(
+            SITEMAP_INDEX.format(first=second, second=self.sitemap_path),
+            encoding='utf-8'
+        )
+        second.write_text(
+            SITEMAP_INDEX.format(first=first, second=self.gzip_path),
+            encoding='utf-8'
+        )
+
+        loader = SitemapLoader(first, max_workers=2)
+        urls = [entry.loc for batch in loader for entry in batch]
+        self.assertEqual(len(urls), 6)
+        self.assertEqual(loader.sitemaps_count, 4)
+
+    def test_max_depth(self):
+        path = pathlib.Path(self.directory.name)
+        nested = path / 'nested_index.xml'
+        nested.write_text(
+            SITEMAP_INDEX.format(first=self.index_path, second=self.sitemap_path),
+            encoding='utf-8'
+        )
+
+        loader = SitemapLoader(nested, max_depth=1)
+        urls = [entry.loc for batch in loader for entry in batch]
+        # The children of the nested index are not loaded
+        self.assertEqual(len(urls), 3)
+        self.assertEqual(loader.sitemaps_count, 3)
+
+    def test_skip_older_entries(self):
+        since = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+        loader = SitemapLoader(self.sitemap_path, since=since)
+        urls = [entry.loc for batch in loader for entry in batch]
+        self.assertNotIn('https://example.com/product-2', urls)
+        self.assertEqual(loader.skipped_count, 1)
+
+    def test_min_priority(self):
+        loader = SitemapLoader(self.sitemap_path, min_priority=0.5)
+        urls = [entry.loc for batch in loader for entry in batch]
+        self.assertListEqual(
+            urls,
+            ['https://example.com/product-1', 'https://example.com/product-3']
+        )
+
+    def test_parse_lastmod(self):
+        self.assertIsNone(parse_lastmod('not a date'))
+        result = parse_lastmod('2024-01-01')
+        self.assertEqual(result.tzinfo, datetime.timezone.utc)
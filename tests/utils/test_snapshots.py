@@ -0,0 +1,114 @@
+import pathlib
+import struct
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+
+from kryptone.base import BaseCrawler
+from kryptone.data_storages import SQLiteStorage
+from kryptone.utils.snapshots import (CODEC_ZLIB, HEADER, SnapshotError,
+                                      decode_snapshot, encode_snapshot,
+                                      read_snapshot, write_snapshot)
+from kryptone.utils.urls import URL
+
+URLS_TO_VISIT = ['http://example.com/1', 'http://example.com/2']
+
+VISITED_URLS = ['http://example.com']
+
+
+class TestSnapshots(unittest.TestCase):
+    def test_round_trip(self):
+        data = encode_snapshot(
+            URLS_TO_VISIT,
+            VISITED_URLS,
+            seen_urls=URLS_TO_VISIT + VISITED_URLS,
+            metadata={'spider': 'ExampleSpider'}
+        )
+        snapshot = decode_snapshot(data)
+
+        self.assertEqual(snapshot.metadata['spider'], 'ExampleSpider')
+        self.assertSetEqual(
+            snapshot.urls_to_visit,
+            {URL(url) for url in URLS_TO_VISIT}
+        )
+        self.assertSetEqual(snapshot.visited_urls, {URL('http://example.com')})
+        self.assertEqual(len(snapshot.seen_urls), 3)
+
+    def test_interned_urls(self):
+        snapshot = decode_snapshot(
+            encode_snapshot(URLS_TO_VISIT, [], seen_urls=URLS_TO_VISIT)
+        )
+        seen_urls = {url: url for url in snapshot.seen_urls}
+        for url in snapshot.urls_to_visit:
+            self.assertIs(seen_urls[url], url)
+
+    def test_zlib_fallback(self):
+        with patch('kryptone.utils.snapshots.get_zstandard', return_value=None):
+            data = encode_snapshot(URLS_TO_VISIT, VISITED_URLS)
+            self.assertEqual(HEADER.unpack_from(data)[2], CODEC_ZLIB)
+            snapshot = decode_snapshot(data)
+        self.assertEqual(len(snapshot.urls_to_visit), 2)
+
+    def test_rejected_snapshots(self):
+        data = encode_snapshot(URLS_TO_VISIT, VISITED_URLS)
+
+        with self.assertRaises(SnapshotError):
+            decode_snapshot(b'KRYS')
+
+        with self.assertRaises(SnapshotError):
+            decode_snapshot(b'XXXX' + data[4:])
+
+        # Different version
+        with self.assertRaises(SnapshotError):
+            decode_snapshot(data[:4] + struct.pack('<H', 999) + data[6:])
+
+        # Different checksum
+        checksum_position = HEADER.size - 12
+        with self.assertRaises(SnapshotError):
+            decode_snapshot(
+                data[:checksum_position] +
+                b'\x00\x00\x00\x00' +
+                data[checksum_position + 4:]
+            )
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory).joinpath('crawl.snapshot')
+            write_snapshot(
+                path,
+                URLS_TO_VISIT,
+                VISITED_URLS,
+                metadata={'spider': 'ExampleSpider'}
+            )
+
+            snapshot = read_snapshot(path, spider='ExampleSpider')
+            self.assertEqual(len(snapshot.urls_to_visit), 2)
+
+            with self.assertRaises(SnapshotError):
+                read_snapshot(path, spider='OtherSpider')
+
+
+
+class TestSpiderSnapshot(unittest.TestCase):
+    def test_snapshot_older_than_storage(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = SQLiteStorage(storage_path=directory)
+            path = pathlib.Path(directory).joinpath('crawl.snapshot')
+            spider = SimpleNamespace(storage=storage, snapshot_path=path)
+
+            write_snapshot(path, URLS_TO_VISIT, VISITED_URLS, metadata={'spider': 'SimpleNamespace'})
+            self.assertIsNotNone(BaseCrawler.load_snapshot(spider))
+
+            # The urls to visit were modified
+            # after the snapshot was written
+            cache = {'urls_to_visit': URLS_TO_VISIT, 'visited_urls': VISITED_URLS}
+            async_to_sync(storage.save)('cache.json', cache)
+            self.assertIsNone(BaseCrawler.load_snapshot(spider))
+            storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,17 @@
+import gzip
+import io
+import json
+import pathlib
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 
-from kryptone.utils.urls import (URL, MultipleURLManager,
+from kryptone.utils.file_readers import iter_json_array
+from kryptone.utils.urls import (URL, LoadStartUrls, MultipleURLManager,
+                                 URLChainGenerator,
                                  URLPaginationGenerator, URLPathGenerator,
-                                 URLQueryGenerator)
+                                 URLProductGenerator, URLQueryGenerator,
+                                 iter_start_urls)
 
 START_URLS = [
     'http://example.com',
@@ -16,6 +24,13 @@ class TestURLPaginationGenerator(unittest.TestCase):
         instance = URLPaginationGenerator('http://example.com', k=1)
         self.assertListEqual(list(instance), ['http://example.com?page=1'])
 
+    def test_length(self):
+        # The length is computed without
+        # generating the urls
+        instance = URLPaginationGenerator('http://example.com', k=10**9)
+        self.assertEqual(len(instance), 10**9)
+        self.assertEqual(next(iter(instance)), 'http://example.com?page=1')
+
 
 class TestURLPathGenerator(unittest.TestCase):
     def test_generator(self):
@@ -27,6 +42,15 @@ class TestURLPathGenerator(unittest.TestCase):
         )
         self.assertListEqual(list(instance), ['http://example.com/1'])
 
+    def test_length(self):
+        instance = URLPathGenerator(
+            'http://example.com/$id',
+            params={'id': 'number'},
+            k=5
+        )
+        self.assertEqual(len(instance), 5)
+        self.assertEqual(len(list(instance)), 5)
+
 
 class TestURLQueryGenerator(unittest.TestCase):
     def test_generator(self):
@@ -42,6 +66,113 @@ class TestURLQueryGenerator(unittest.TestCase):
             with self.subTest(item=item):
                 self.assertIsInstance(item, URL)
 
+    def test_length(self):
+        instance = URLQueryGenerator(
+            'http://example.com/',
+            param='year',
+            initial_value=2000,
+            end_value=2010,
+            step=2
+        )
+        self.assertEqual(len(instance), 5)
+        self.assertEqual(len(list(instance)), 5)
+
+
+class TestGeneratorComposition(unittest.TestCase):
+    def test_chain(self):
+        instance = URLPaginationGenerator(
+            'http://example.com/a', k=2) + URLPaginationGenerator('http://example.com/b', k=3)
+        self.assertIsInstance(instance, URLChainGenerator)
+        self.assertEqual(len(instance), 5)
+        self.assertEqual(list(instance)[-1], 'http://example.com/b?page=3')
+
+    def test_product(self):
+        instance = URLProductGenerator(
+            'http://example.com/$category?page=$page',
+            category=['shoes', 'bags'],
+            page=range(1, 10**6)
+        )
+        self.assertEqual(len(instance), 2 * (10**6 - 1))
+        self.assertEqual(
+            next(iter(instance)),
+            'http://example.com/shoes?page=1'
+        )
+
+    def test_iter_start_urls(self):
+        start_urls = [
+            'http://example.com',
+            URLPaginationGenerator('http://example.com', k=2)
+        ]
+        self.assertListEqual(
+            list(iter_start_urls(start_urls)),
+            [
+                'http://example.com',
+                'http://example.com?page=1',
+                'http://example.com?page=2'
+            ]
+        )
+
+
+class TestLoadStartUrls(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = pathlib.Path(cls.directory.name)
+        cls.urls = [
+            'http://example.com/1',
+            'http://example.com/2',
+            'http://example.com/1'
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def load(self, filename):
+        instance = LoadStartUrls(filename=str(self.path / filename))
+        return list(instance)
+
+    def test_json_array(self):
+        data = [{'url': self.urls[0]}, self.urls[1], self.urls[2]]
+        (self.path / 'urls.json').write_text(json.dumps(data))
+        self.assertListEqual(self.load('urls.json'), self.urls[:2])
+
+    def test_json_lines(self):
+        lines = '\n'.join(json.dumps({'url': url}) for url in self.urls)
+        (self.path / 'urls.jsonl').write_text(lines)
+        self.assertListEqual(self.load('urls.jsonl'), self.urls[:2])
+
+    def test_csv(self):
+        (self.path / 'urls.csv').write_text('\n'.join(self.urls))
+        self.assertListEqual(self.load('urls.csv'), self.urls[:2])
+
+        instance = LoadStartUrls(filename=str(self.path / 'urls'))
+        self.assertListEqual(list(instance), self.urls[:2])
+
+    def test_text(self):
+        (self.path / 'urls.txt').write_text('\n'.join(self.urls) + '\n\n')
+        self.assertListEqual(self.load('urls.txt'), self.urls[:2])
+
+    def test_gzip(self):
+        with gzip.open(self.path / 'urls.txt.gz', mode='wt') as f:
+            f.write('\n'.join(self.urls))
+        self.assertListEqual(self.load('urls.txt.gz'), self.urls[:2])
+
+    def test_deduplication_without_hash(self):
+        (self.path / 'urls.txt').write_text('\n'.join(self.urls))
+        instance = LoadStartUrls(filename=str(self.path / 'urls.txt'))
+
+        # Urls with the same hash() are not duplicates
+        with patch('builtins.hash', return_value=0):
+            self.assertListEqual(list(instance), self.urls[:2])
+        self.assertEqual(instance.duplicates_count, 1)
+
+    def test_incremental_json_array(self):
+        data = [{'url': f'http://example.com/{i}'} for i in range(100)]
+        f = io.StringIO(json.dumps(data))
+        items = list(iter_json_array(f, chunk_size=7))
+        self.assertListEqual(items, data)
+
 
 # class TestURLQueryGenerator(unittest.TestCase):
 #     def test_logic(self):
@@ -97,6 +97,8 @@ class TestUrl(unittest.TestCase):
     def test_is_image(self):
         url = 'https://static.bershka.net/4/photos2/2024/V/0/1/p/8936/256/800//01/ab1c523937698d85bb1dfe3953bbd6f7-8936256800_2_3_0.jpg'
         self.assertTrue(URL(url).is_image)
+        self.assertTrue(URL('http://example.com/image.PNG').is_image)
+        self.assertFalse(URL('http://example.com/document.pdf').is_image)
 
     def test_has_fragment(self):
         self.assertFalse(self.instance.has_fragment)
@@ -286,3 +288,22 @@ class TestURLIgnoreTest(unittest.TestCase):
             url_count,
             'All matching URLs should have been tested'
         )
+
+
+class TestURLTestsReport(unittest.TestCase):
+    def test_report_aggregates_rejections(self):
+        instance = URLIgnoreTest('test-name', paths=['/femmes/vetements'])
+        urls = [
+            'http://example.com/femmes/vetements/robes',
+            'http://example.com/femmes/vetements/jupes',
+            'http://example.com/hommes'
+        ]
+        for url in urls:
+            instance(url)
+
+        with self.assertLogs('KRYPTONE', level='WARNING') as logs:
+            self.assertEqual(instance.report(), 2)
+        self.assertEqual(len(logs.output), 1)
+
+        # The counter is reset after each report
+        self.assertEqual(instance.report(), 0)